@@ -0,0 +1,45 @@
+import sys
+from pathlib import Path
+from typing import IO, Optional
+
+from verb_table import split_options
+
+# =========================
+# Scripted answers for headless runs
+# =========================
+# One answer per line, consumed in prompt order exactly like typed input.
+# Special lines:
+#   @correct   -> the first accepted variant of the field being asked
+#   @skip      -> an empty answer
+CORRECT_TOKEN = "@correct"
+SKIP_TOKEN = "@skip"
+
+
+class AnswerScript:
+    def __init__(self, stream: IO[str]) -> None:
+        self._stream = stream
+        self.consumed = 0
+
+    @classmethod
+    def open(cls, path: str) -> "AnswerScript":
+        if path == "-":
+            return cls(sys.stdin)
+        return cls(Path(path).open("r", encoding="utf-8"))
+
+    def next_answer(self, expected: str) -> Optional[str]:
+        """Next scripted answer for a field whose correct value is `expected`; None at end of script."""
+        line = self._stream.readline()
+        if not line:
+            return None
+        self.consumed += 1
+        answer = line.rstrip("\r\n")
+        token = answer.strip()
+        if token == CORRECT_TOKEN:
+            return split_options(expected)[0]
+        if token == SKIP_TOKEN:
+            return ""
+        return answer
+
+    def close(self) -> None:
+        if self._stream is not sys.stdin:
+            self._stream.close()
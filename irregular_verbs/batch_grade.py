@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Batch grading of exported answer sheets.
+
+    python batch_grade.py answers.csv --out graded.csv --totals learners.csv
+
+Input rows are: learner, German prompt, infinitive, simple past, past
+participle (an optional header row is skipped). Every answer is graded like
+an interactive session would grade it: "/" variants, case and whitespace are
+folded, and spaces are dropped unless the correct form contains one. As in
+the drill, any verb whose German meanings cover the prompt is accepted
+("ride" for "fahren", see drill_modes.py): the row is graded against the verb
+whose infinitive was given, otherwise against the one that scores best.
+
+The input is read as a stream and graded in chunks on a process pool with a
+bounded number of chunks in flight; graded rows are written in input order as
+they come back, so memory stays flat for any file size. Per-learner totals
+are written at the end.
+"""
+
+import argparse
+import csv
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from drill_modes import covering_card, drill_index
+from verb_table import Card, VerbTable, builtin_table, normalize
+
+INPUT_COLUMNS = ("learner", "german", "infinitive", "past", "participle")
+OUTPUT_COLUMNS = INPUT_COLUMNS + ("ok_infinitive", "ok_past", "ok_participle", "correct", "expected", "error")
+TOTAL_COLUMNS = ("learner", "rows", "fields", "correct", "accuracy_percent", "all_correct_rows", "unknown_prompts")
+CHUNK_ROWS = 5000
+
+# Set in each worker by _init_worker().
+_table: Optional[VerbTable] = None
+
+
+def _init_worker(deck: Optional[str]) -> None:
+    global _table
+    if deck:
+        from decks import load_deck_arg
+
+        _table = load_deck_arg(deck)
+    else:
+        _table = builtin_table()
+    drill_index(_table)
+
+
+def grade_answer(card: Card, field: int, answer: str) -> bool:
+    # Same rules as the interactive trainer: read_line_no_spaces() drops spaces unless the field allows them.
+    if not card.allow_space[field]:
+        answer = answer.replace(" ", "")
+    return normalize(answer) in card.accepted[field]
+
+
+def grade_row(row: Sequence[str]) -> List[str]:
+    """One output row for one input row (see OUTPUT_COLUMNS)."""
+    if len(row) != len(INPUT_COLUMNS):
+        padded = (list(row) + [""] * len(INPUT_COLUMNS))[: len(INPUT_COLUMNS)]
+        return padded + ["", "", "", "0", "", f"expected {len(INPUT_COLUMNS)} columns, got {len(row)}"]
+    learner, german, *answers = row
+    candidates = drill_index(_table).covering(german)
+    if not candidates:
+        return list(row) + ["", "", "", "0", "", "unknown prompt"]
+    named = covering_card(_table, german, answers[0])
+    cards = [named] if named is not None else [_table.cards[i] for i in sorted(candidates)]
+    best: Optional[Tuple[int, List[bool], Card]] = None
+    for card in cards:
+        oks = [grade_answer(card, field, answers[field]) for field in range(3)]
+        if best is None or sum(oks) > best[0]:
+            best = (sum(oks), oks, card)
+    score, oks, card = best
+    return list(row) + [str(int(ok)) for ok in oks] + [str(score), card.display, ""]
+
+
+def grade_chunk(rows: List[List[str]]) -> List[List[str]]:
+    return [grade_row(row) for row in rows]
+
+
+# =========================
+# Streaming pipeline
+# =========================
+def read_chunks(stream, chunk_rows: int = CHUNK_ROWS) -> Iterator[List[List[str]]]:
+    chunk: List[List[str]] = []
+    for i, row in enumerate(csv.reader(stream)):
+        if not row or not "".join(row).strip():
+            continue
+        if i == 0 and tuple(f.strip().lower() for f in row) == INPUT_COLUMNS:
+            continue
+        chunk.append(row)
+        if len(chunk) >= chunk_rows:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def graded_chunks(chunks: Iterator[List[List[str]]], deck: Optional[str], workers: int) -> Iterator[List[List[str]]]:
+    """Graded chunks in input order; at most 2 * workers chunks are read ahead."""
+    if workers <= 1:
+        _init_worker(deck)
+        for chunk in chunks:
+            yield grade_chunk(chunk)
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(deck,)) as pool:
+        in_flight: deque = deque()
+        for chunk in chunks:
+            in_flight.append(pool.submit(grade_chunk, chunk))
+            if len(in_flight) >= 2 * workers:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+def new_learner_totals() -> Dict[str, int]:
+    return {"rows": 0, "fields": 0, "correct": 0, "all_correct_rows": 0, "unknown_prompts": 0}
+
+
+def add_row_totals(totals: Dict[str, Dict[str, int]], graded: List[str]) -> None:
+    t = totals.get(graded[0])
+    if t is None:
+        t = totals[graded[0]] = new_learner_totals()
+    correct = int(graded[8])
+    t["rows"] += 1
+    t["fields"] += 3
+    t["correct"] += correct
+    t["all_correct_rows"] += correct == 3
+    t["unknown_prompts"] += graded[10] == "unknown prompt"
+
+
+def write_totals(out, totals: Dict[str, Dict[str, int]]) -> None:
+    writer = csv.writer(out)
+    writer.writerow(TOTAL_COLUMNS)
+    for learner in sorted(totals):
+        t = totals[learner]
+        accuracy = round(t["correct"] / t["fields"] * 100.0, 2) if t["fields"] else 0.0
+        writer.writerow(
+            [learner, t["rows"], t["fields"], t["correct"], accuracy, t["all_correct_rows"], t["unknown_prompts"]]
+        )
+
+
+def grade_stream(src, out, deck: Optional[str] = None, workers: int = 1, chunk_rows: int = CHUNK_ROWS) -> Dict[str, Dict[str, int]]:
+    """Grades `src` (CSV text stream) into `out` and returns per-learner totals."""
+    writer = csv.writer(out)
+    writer.writerow(OUTPUT_COLUMNS)
+    totals: Dict[str, Dict[str, int]] = {}
+    for graded in graded_chunks(read_chunks(src, chunk_rows), deck, workers):
+        writer.writerows(graded)
+        for row in graded:
+            add_row_totals(totals, row)
+    return totals
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Grade CSV answer sheets (learner, German, infinitive, past, participle)")
+    parser.add_argument("input", help="CSV file ('-' for stdin)")
+    parser.add_argument("--out", help="Graded rows as CSV (default: stdout)")
+    parser.add_argument("--totals", help="Per-learner totals as CSV (default: stderr summary only)")
+    parser.add_argument("--deck", help="Deck file or installed deck name (default: built-in verbs)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes (1 = in-process)")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    args = parser.parse_args(argv)
+
+    src = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8-sig", newline="")
+    out = sys.stdout if not args.out else open(args.out, "w", encoding="utf-8", newline="")
+    try:
+        totals = grade_stream(src, out, args.deck, args.workers, args.chunk_rows)
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if out is not sys.stdout:
+            out.close()
+
+    if args.totals:
+        with open(args.totals, "w", encoding="utf-8", newline="") as f:
+            write_totals(f, totals)
+    rows = sum(t["rows"] for t in totals.values())
+    correct = sum(t["correct"] for t in totals.values())
+    accuracy = correct / (rows * 3) * 100.0 if rows else 0.0
+    print(f"Graded {rows} rows for {len(totals)} learners, {accuracy:.1f}% of answers correct", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmarks for the grading, sampling and persistence hot paths.
+
+    python benchmarks.py                         # quick grid
+    python benchmarks.py --full                  # 10..1,000,000 sessions, 100..100,000 verbs
+    python benchmarks.py --save-baseline base.json
+    python benchmarks.py --compare base.json     # exit code 1 on regressions
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+import drill_modes
+import history
+import irregular_verbs
+import key_input
+import metrics
+import near_miss
+import progress_store
+import scheduler
+import teacher
+from verb_stats import VerbStats
+from verb_table import VerbTable, compile_table, grade_card
+
+QUICK_SESSIONS = [10, 1_000, 100_000]
+QUICK_VERBS = [100, 10_000]
+FULL_SESSIONS = [10, 1_000, 100_000, 1_000_000]
+FULL_VERBS = [100, 10_000, 100_000]
+
+
+# =========================
+# Measurement
+# =========================
+def percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, int(round(q / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[idx]
+
+
+def measure(fn: Callable[[], object], batch: int = 1, min_time_s: float = 0.2, max_samples: int = 2000) -> Dict:
+    """
+    Calls fn in batches of `batch` until min_time_s has passed; latency is
+    the per-call time of each batch, so sub-microsecond operations are not
+    dominated by timer overhead.
+    """
+    samples: List[float] = []
+    ops = 0
+    started = time.perf_counter_ns()
+    deadline = started + int(min_time_s * 1e9)
+    while len(samples) < max_samples:
+        t0 = time.perf_counter_ns()
+        for _ in range(batch):
+            fn()
+        t1 = time.perf_counter_ns()
+        samples.append((t1 - t0) / batch / 1000.0)
+        ops += batch
+        if t1 >= deadline:
+            break
+    elapsed_s = (time.perf_counter_ns() - started) / 1e9
+    samples.sort()
+    return {
+        "ops_per_s": ops / elapsed_s if elapsed_s else 0.0,
+        "p50_us": percentile(samples, 50),
+        "p90_us": percentile(samples, 90),
+        "p99_us": percentile(samples, 99),
+        "samples": len(samples),
+    }
+
+
+# =========================
+# Synthetic data
+# =========================
+def synthetic_verbs(n: int) -> List[Tuple[str, str, str, str]]:
+    verbs = []
+    for i in range(n):
+        base = f"verb{i}"
+        verbs.append((base, f"{base}ed/{base}t", f"{base}en", f"deutsch {i}; bedeutung {i % 97}"))
+    return verbs
+
+
+def synthetic_progress(n_sessions: int, table: VerbTable, rng: random.Random) -> Dict:
+    progress = {"meta": {}, "sessions": [], "verbs": {}}
+    # One session a minute, in order, like a real history.
+    start = datetime(2024, 1, 1)
+    for i in range(n_sessions):
+        correct = rng.randint(30, 60)
+        t = rng.uniform(60.0, 600.0)
+        progress["sessions"].append(
+            {
+                "timestamp": (start + timedelta(minutes=i)).isoformat(timespec="seconds"),
+                "base_sample_size": 20,
+                "total_questions": 60,
+                "total_correct": correct,
+                "accuracy_percent": round(correct / 60 * 100, 2),
+                "total_time_s": t,
+                "total_time_mmss": irregular_verbs.format_mmss(t),
+            }
+        )
+    for card in table.cards:
+        asked = rng.randint(1, 40)
+        progress["verbs"][card.key] = {
+            "german": card.german,
+            "infinitive": card.inf,
+            "times_asked": asked,
+            "total_fields": asked * 3,
+            "total_correct_fields": rng.randint(0, asked * 3),
+            "total_time_s": asked * rng.uniform(3.0, 30.0),
+            "last_seen": "2024-01-01T00:00:00",
+        }
+    return progress_store.ensure_progress_shape(progress)
+
+
+# =========================
+# Benchmarks
+# =========================
+def bench_grading(results: Dict) -> None:
+    results["irregular_verbs.normalize"] = measure(lambda: irregular_verbs.normalize("  Burned "), batch=1000)
+    card = irregular_verbs.TABLE.card_for_inf("burn")
+    acc = card.accepted[1]
+    results["card.accepted lookup"] = measure(lambda: irregular_verbs.normalize("burned") in acc, batch=1000)
+    # One prompt as the trainers grade it: grade_card() in irregular_verbs.ask_one_steps(),
+    # check_field() per field in teacher.py (case-sensitive unless CASE_INSENSITIVE).
+    answers = ("burn", "burned", "burnt")
+    results["grade_card(3 fields)"] = measure(lambda: grade_card(card, answers), batch=1000)
+    results["teacher.check_field(3 fields)"] = measure(
+        lambda: [teacher.check_field(card, f, a) for f, a in enumerate(answers)], batch=1000
+    )
+    table = irregular_verbs.TABLE
+    results["near_miss.classify(typo)"] = measure(lambda: near_miss.classify(table, card, 1, "burend"), batch=100)
+    results["near_miss.classify(other verb)"] = measure(lambda: near_miss.classify(table, card, 1, "brought"), batch=100)
+    form_prompt = drill_modes.make_prompt(table, card, "form", random.Random(1))
+    results["drill_modes.grade(form)"] = measure(lambda: drill_modes.grade(table, form_prompt, ["burn", "burned"]), batch=1000)
+    drive = table.card_for_inf("drive")
+    results["drill_modes.answered_card"] = measure(lambda: drill_modes.answered_card(table, drive, "ride"), batch=1000)
+    english_prompt = drill_modes.make_prompt(table, card, "english")
+    results["drill_modes.grade(english)"] = measure(lambda: drill_modes.grade(table, english_prompt, ["brennen"]), batch=1000)
+
+
+def bench_metrics(results: Dict) -> None:
+    # Cost of instrumentation itself: an empty span with metrics off (the default) and on.
+    def empty_span() -> None:
+        with metrics.span("bench"):
+            pass
+
+    noop = metrics.timed("bench")(lambda: None)
+    was_enabled = metrics.ENABLED
+    try:
+        metrics.ENABLED = False
+        results["metrics.span(disabled)"] = measure(empty_span, batch=1000)
+        results["metrics.timed(disabled)"] = measure(noop, batch=1000)
+        metrics.ENABLED = True
+        results["metrics.span(enabled)"] = measure(empty_span, batch=1000)
+        results["metrics.timed(enabled)"] = measure(noop, batch=1000)
+    finally:
+        metrics.ENABLED = was_enabled
+        metrics.reset()
+    ring = key_input.KeyRing()
+    results["key_input.KeyRing.record"] = measure(lambda: ring.record(key_input.KEY), batch=1000)
+
+
+def bench_sampling(results: Dict, verb_sizes: List[int], rng: random.Random) -> None:
+    for n in verb_sizes:
+        table = compile_table(synthetic_verbs(n))
+        wrong_counts = {row[0]: rng.randint(0, 5) for row in table.rows[: n // 3]}
+        sampler = teacher.build_sampler(table, wrong_counts)
+        results[f"teacher.choose_verb[verbs={n}]"] = measure(lambda: teacher.choose_verb(table.cards, sampler), batch=100)
+        idx = [0]
+
+        def update() -> None:
+            idx[0] = (idx[0] + 7919) % n
+            sampler.update(idx[0], teacher.verb_weight(idx[0] % 5))
+
+        results[f"sampler.update[verbs={n}]"] = measure(update, batch=100)
+        results[f"random.sample(20)[verbs={n}]"] = measure(lambda: random.sample(table.cards, 20), batch=100)
+        # Spaced repetition: two thirds of the deck answered, due times spread around "now".
+        verbs = VerbStats()
+        for inf, _, _, german in table.rows[: 2 * n // 3]:
+            sched = {"reps": 1, "interval_days": 1.0, "ease": 2.5, "due": f"2024-01-{rng.randint(1, 28):02d}T00:00:00"}
+            verbs.record(f"{german}||{inf}", 3, 1.0, "2024-01-01T00:00:00", sched)
+        queue = scheduler.due_queue({"verbs": verbs}, table)
+        results[f"scheduler.select(20)[verbs={n}]"] = measure(lambda: queue.select(20, "2024-01-15T00:00:00"), batch=10)
+        results[f"compile_table[verbs={n}]"] = measure(
+            lambda: compile_table(synthetic_verbs(n)), batch=1, min_time_s=0.1, max_samples=20
+        )
+
+
+def bench_state(results: Dict, verb_sizes: List[int], workdir: Path, rng: random.Random) -> None:
+    old_path = teacher.STATE_PATH
+    teacher.STATE_PATH = str(workdir / "state.json")
+    try:
+        for n in verb_sizes:
+            wrong_counts = {f"verb{i}": rng.randint(1, 9) for i in range(n)}
+            results[f"teacher.save_state[verbs={n}]"] = measure(
+                lambda: teacher.save_state(wrong_counts), min_time_s=0.2, max_samples=200
+            )
+            results[f"teacher.load_state[verbs={n}]"] = measure(teacher.load_state, min_time_s=0.2, max_samples=200)
+            # What a wrong answer costs on the prompt path now that writes happen behind it.
+            writer = teacher.StateWriter(wrong_counts)
+            try:
+                results[f"teacher.StateWriter.set[verbs={n}]"] = measure(
+                    lambda: writer.set("verb0", rng.randint(1, 9)), batch=100
+                )
+            finally:
+                writer.close()
+    finally:
+        teacher.STATE_PATH = old_path
+
+
+def bench_progress(results: Dict, session_sizes: List[int], verb_sizes: List[int], workdir: Path, rng: random.Random) -> None:
+    for verbs_n in verb_sizes:
+        table = compile_table(synthetic_verbs(verbs_n))
+        for n in session_sizes:
+            label = f"sessions={n},verbs={verbs_n}"
+            progress = synthetic_progress(n, table, rng)
+            progress_path = workdir / f"progress_{n}_{verbs_n}.json"
+            progress_store.write_snapshot(progress_path, progress)
+            # Slow cases get fewer samples so the whole grid stays runnable.
+            max_samples = 200 if n <= 10_000 else 5
+
+            results[f"load_progress[{label}]"] = measure(
+                lambda: progress_store.load_progress(progress_path), min_time_s=0.2, max_samples=max_samples
+            )
+
+            def save_one_session() -> None:
+                for card in rng.sample(table.cards, 20):
+                    irregular_verbs.update_per_verb(progress, card, 2, 5.0)
+                progress_store.record_session(progress, dict(progress["sessions"][-1]))
+                progress_store.save_progress(progress_path, progress)
+
+            results[f"save_progress[{label}]"] = measure(save_one_session, min_time_s=0.2, max_samples=200)
+            progress_store.wait_for_compaction(progress_path)
+
+            def summary() -> None:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    irregular_verbs.print_progress_summary(progress)
+
+            results[f"print_progress_summary[{label}]"] = measure(summary, batch=10)
+            results[f"tough_verbs[{label}]"] = measure(lambda: progress_store.tough_verbs(progress, 10), batch=10)
+
+            # Everything folded into the column files: a range query is a binary search plus the rows in range.
+            progress_store.compact(progress_path)
+            since, until = history.parse_period("2024-01-01T05")
+            results[f"history.query(1 hour)[{label}]"] = measure(
+                lambda: history.query(progress_path, since, until), min_time_s=0.2, max_samples=max_samples
+            )
+
+
+# =========================
+# Baselines
+# =========================
+def compare(results: Dict, baseline: Dict, threshold: float) -> List[str]:
+    regressions = []
+    for name, cur in results.items():
+        base = baseline.get("results", {}).get(name)
+        if not base or not base["ops_per_s"]:
+            continue
+        ratio = cur["ops_per_s"] / base["ops_per_s"]
+        marker = ""
+        if ratio < 1.0 - threshold:
+            marker = "  <-- REGRESSION"
+            regressions.append(name)
+        print(f"{name:<60} {ratio:6.2f}x vs baseline{marker}")
+    return regressions
+
+
+def print_results(results: Dict) -> None:
+    print(f"{'benchmark':<60} {'ops/s':>14} {'p50 µs':>10} {'p90 µs':>10} {'p99 µs':>10}")
+    for name, r in results.items():
+        print(f"{name:<60} {r['ops_per_s']:>14.1f} {r['p50_us']:>10.2f} {r['p90_us']:>10.2f} {r['p99_us']:>10.2f}")
+
+
+def parse_sizes(s: str) -> List[int]:
+    return [int(x) for x in s.split(",") if x]
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Irregular verbs trainer benchmarks")
+    parser.add_argument("--full", action="store_true", help="Run the full 10..1M sessions / 100..100k verbs grid")
+    parser.add_argument("--sessions", type=parse_sizes, help="Comma-separated history sizes")
+    parser.add_argument("--verbs", type=parse_sizes, help="Comma-separated deck sizes")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--save-baseline", type=Path, help="Write results as a JSON baseline")
+    parser.add_argument("--compare", type=Path, help="Compare against a JSON baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed throughput drop (default 0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    session_sizes = args.sessions or (FULL_SESSIONS if args.full else QUICK_SESSIONS)
+    verb_sizes = args.verbs or (FULL_VERBS if args.full else QUICK_VERBS)
+    rng = random.Random(args.seed)
+    random.seed(args.seed)
+
+    results: Dict[str, Dict] = {}
+    with tempfile.TemporaryDirectory(prefix="iv_bench_") as tmp:
+        workdir = Path(tmp)
+        bench_grading(results)
+        bench_metrics(results)
+        bench_sampling(results, verb_sizes, rng)
+        bench_state(results, verb_sizes, workdir, rng)
+        bench_progress(results, session_sizes, verb_sizes, workdir, rng)
+
+    print_results(results)
+
+    if args.save_baseline:
+        doc = {
+            "meta": {
+                "created": datetime.now().isoformat(timespec="seconds"),
+                "python": sys.version.split()[0],
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+            },
+            "results": results,
+        }
+        args.save_baseline.write_text(json.dumps(doc, indent=2), encoding="utf-8")
+        print(f"\nBaseline written to {args.save_baseline}")
+
+    if args.compare:
+        print()
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cohort analytics over many learners' progress files (requires NumPy).
+
+    python cohort_report.py ~/irregular_verbs_server/learners
+    python cohort_report.py a/progress.json b/progress.json --json report.json
+
+Directories are searched recursively for progress.json / progress.sqlite, and
+for progress.journal (a journal store that has not been compacted yet has no
+progress.json).
+Files are loaded in parallel (process pool) into sparse (learner, verb)
+cells: learner and verb index arrays plus an array of shape (cells, 4) holding
+times asked, fields, correct fields and time, one row per verb a learner has
+been asked. Memory follows the answered pairs, not learners x verbs; every
+statistic is computed on these arrays. Learners' files are only read (SQLite
+stores are opened read-only).
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - reported by main()
+    np = None
+
+from progress_store import SQLITE_SUFFIXES, ensure_progress_shape, is_sqlite_path, load_progress
+
+PROGRESS_NAMES = ("progress.json", "progress.journal") + tuple(f"progress{suffix}" for suffix in SQLITE_SUFFIXES)
+CHUNK_SIZE = 64
+# Columns of the per-cell values.
+ASKED, FIELDS, CORRECT, TIME_S = range(4)
+# Verbs seen by fewer learners are left out of the difficulty ranking.
+MIN_LEARNERS = 5
+
+
+def find_progress_files(paths: List[Path]) -> List[Path]:
+    found: List[Path] = []
+    for p in paths:
+        if p.is_dir():
+            for name in PROGRESS_NAMES:
+                found.extend(sorted(p.rglob(name)))
+        else:
+            found.append(p)
+    # A journal stands for its progress.json store (which may not exist yet); each store once.
+    files: Dict[Path, None] = {}
+    for f in found:
+        files[f.with_suffix(".json") if f.suffix == ".journal" else f] = None
+    return list(files)
+
+
+def learner_name(path: Path) -> str:
+    # <data>/learners/<name>/progress.json (trainer server) or <name>.json
+    return path.parent.name if path.stem == "progress" else path.stem
+
+
+# =========================
+# Loading (worker processes)
+# =========================
+def load_learner(path: Path) -> Dict:
+    if is_sqlite_path(path):
+        import progress_sqlite
+
+        return progress_sqlite.load_progress(path, read_only=True)
+    return ensure_progress_shape(load_progress(path))
+
+
+def load_chunk(
+    paths: List[Path],
+) -> Tuple[List[str], List[str], "np.ndarray", "np.ndarray", "np.ndarray", "np.ndarray", List[str]]:
+    """
+    Loads a chunk of progress files. Returns (learner names, verb keys of
+    this chunk, cell learner rows, cell verb columns, cell values (cells, 4),
+    per-learner totals (learners, 4) and errors); the parent merges the
+    chunk vocabularies.
+    """
+    names: List[str] = []
+    keys: Dict[str, int] = {}
+    rows: List[int] = []
+    cols: List[int] = []
+    values: List[Tuple[float, float, float, float]] = []
+    totals: List[Tuple[float, float, float, float]] = []
+    errors: List[str] = []
+    for path in paths:
+        try:
+            progress = load_learner(path)
+        except Exception as e:
+            errors.append(f"{path}: {e}")
+            continue
+        row = len(names)
+        names.append(learner_name(path))
+        for key, pv in progress["verbs"].items():
+            rows.append(row)
+            cols.append(keys.setdefault(key, len(keys)))
+            values.append((pv["times_asked"], pv["total_fields"], pv["total_correct_fields"], pv["total_time_s"]))
+        t = progress["totals"]
+        totals.append((t["sessions"], t["fields"], t["correct"], t["time_s"]))
+    return (
+        names,
+        list(keys),
+        np.array(rows, dtype=np.int32),
+        np.array(cols, dtype=np.int32),
+        np.array(values, dtype=np.float64).reshape(-1, 4),
+        np.array(totals, dtype=np.float64).reshape(-1, 4),
+        errors,
+    )
+
+
+class Cohort:
+    """
+    All learners' stats as sparse cells: values[i, column] is learner rows[i]
+    on verb cols[i] (only verbs the learner was asked), totals[learner, column]
+    uses the same columns, with the number of sessions in place of times asked.
+    """
+
+    def __init__(
+        self,
+        learners: List[str],
+        keys: List[str],
+        rows: "np.ndarray",
+        cols: "np.ndarray",
+        values: "np.ndarray",
+        totals: "np.ndarray",
+    ) -> None:
+        self.learners = learners
+        self.keys = keys
+        self.rows = rows
+        self.cols = cols
+        self.values = values
+        self.totals = totals
+
+
+def load_cohort(files: List[Path], workers: Optional[int] = None, chunk_size: int = CHUNK_SIZE) -> Tuple[Cohort, List[str]]:
+    chunks = [files[i : i + chunk_size] for i in range(0, len(files), chunk_size)]
+    results = []
+    if workers == 1 or len(chunks) <= 1:
+        results = [load_chunk(c) for c in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(load_chunk, chunks))
+
+    key_index: Dict[str, int] = {}
+    learners: List[str] = []
+    errors: List[str] = []
+    rows, cols, values, totals = [], [], [], []
+    for names, keys, chunk_rows, chunk_cols, chunk_values, chunk_totals, chunk_errors in results:
+        global_cols = np.array([key_index.setdefault(k, len(key_index)) for k in keys], dtype=np.int32)
+        rows.append(chunk_rows + len(learners))
+        cols.append(global_cols[chunk_cols])
+        values.append(chunk_values)
+        totals.append(chunk_totals)
+        learners.extend(names)
+        errors.extend(chunk_errors)
+    cohort = Cohort(
+        learners,
+        list(key_index),
+        np.concatenate(rows) if rows else np.zeros(0, dtype=np.int32),
+        np.concatenate(cols) if cols else np.zeros(0, dtype=np.int32),
+        np.concatenate(values) if values else np.zeros((0, 4)),
+        np.concatenate(totals) if totals else np.zeros((0, 4)),
+    )
+    return cohort, errors
+
+
+# =========================
+# Statistics (vectorized)
+# =========================
+def _ratio(num: "np.ndarray", den: "np.ndarray") -> "np.ndarray":
+    out = np.full(np.broadcast(num, den).shape, np.nan)
+    np.divide(num, den, out=out, where=den > 0)
+    return out
+
+
+def _group_percentiles(groups: "np.ndarray", values: "np.ndarray", n_groups: int, qs: List[float]) -> "np.ndarray":
+    """Percentiles of `values` per group (linear interpolation, as np.percentile); NaN for empty groups."""
+    order = np.lexsort((values, groups))
+    ordered = values[order]
+    counts = np.bincount(groups, minlength=n_groups)
+    starts = np.cumsum(counts) - counts
+    has = counts > 0
+    out = np.full((len(qs), n_groups), np.nan)
+    for j, q in enumerate(qs):
+        pos = starts[has] + (counts[has] - 1) * (q / 100.0)
+        lo = np.floor(pos).astype(np.intp)
+        hi = np.ceil(pos).astype(np.intp)
+        out[j, has] = ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+    return out
+
+
+def verb_stats(cohort: Cohort) -> Dict[str, "np.ndarray"]:
+    n = len(cohort.keys)
+    v = cohort.values
+    seen = v[:, ASKED] > 0
+    cols = cohort.cols[seen]
+    v = v[seen]
+
+    def per_verb(weights: "np.ndarray") -> "np.ndarray":
+        return np.bincount(cols, weights=weights, minlength=n)
+
+    # Per cell (learner and verb); NaN where the learner has no fields for it.
+    learner_acc = _ratio(v[:, CORRECT], v[:, FIELDS]) * 100.0
+    has_acc = ~np.isnan(learner_acc)
+    time_per_prompt = v[:, TIME_S] / v[:, ASKED]
+    p50, p90 = _group_percentiles(cols, time_per_prompt, n, [50, 90])
+    return {
+        "learners": np.bincount(cols, minlength=n),
+        "asked": per_verb(v[:, ASKED]),
+        "accuracy": _ratio(per_verb(v[:, CORRECT]), per_verb(v[:, FIELDS])) * 100.0,
+        "mean_learner_accuracy": _ratio(
+            np.bincount(cols[has_acc], weights=learner_acc[has_acc], minlength=n),
+            np.bincount(cols[has_acc], minlength=n),
+        ),
+        "time_p50": p50,
+        "time_p90": p90,
+    }
+
+
+def difficulty_order(stats: Dict[str, "np.ndarray"], min_learners: int = MIN_LEARNERS) -> "np.ndarray":
+    """Verb indexes, hardest first: lowest mean learner accuracy, then slowest median time."""
+    eligible = np.flatnonzero(stats["learners"] >= min_learners)
+    order = np.lexsort((-stats["time_p50"][eligible], stats["mean_learner_accuracy"][eligible]))
+    return eligible[order]
+
+
+def learner_stats(cohort: Cohort) -> Dict[str, "np.ndarray"]:
+    t = cohort.totals
+    accuracy = _ratio(t[:, CORRECT], t[:, FIELDS]) * 100.0
+    time_per_prompt = _ratio(t[:, TIME_S], t[:, FIELDS] / 3.0)
+    # Percentile rank by accuracy (0 = lowest, 100 = highest); learners without sessions get NaN.
+    rank = np.full(len(accuracy), np.nan)
+    valid = np.flatnonzero(~np.isnan(accuracy))
+    if len(valid) == 1:
+        rank[valid] = 100.0
+    elif len(valid) > 1:
+        order = valid[np.argsort(accuracy[valid], kind="stable")]
+        rank[order] = np.arange(len(valid)) / (len(valid) - 1) * 100.0
+    return {"sessions": t[:, ASKED], "accuracy": accuracy, "time_per_prompt": time_per_prompt, "percentile": rank}
+
+
+# =========================
+# Report
+# =========================
+def build_report(cohort: Cohort, top: int = 15, min_learners: int = MIN_LEARNERS) -> Dict:
+    vs = verb_stats(cohort)
+    ls = learner_stats(cohort)
+    order = difficulty_order(vs, min_learners)
+
+    def verb_row(i: int) -> Dict:
+        german, _, inf = cohort.keys[i].partition("||")
+        return {
+            "german": german,
+            "infinitive": inf,
+            "learners": int(vs["learners"][i]),
+            "asked": int(vs["asked"][i]),
+            "accuracy_percent": round(float(vs["accuracy"][i]), 2),
+            "mean_learner_accuracy_percent": round(float(vs["mean_learner_accuracy"][i]), 2),
+            "time_per_prompt_p50_s": round(float(vs["time_p50"][i]), 2),
+            "time_per_prompt_p90_s": round(float(vs["time_p90"][i]), 2),
+        }
+
+    acc = ls["accuracy"][~np.isnan(ls["accuracy"])]
+    quantiles = [10, 25, 50, 75, 90]
+    learners = sorted(
+        (
+            {
+                "learner": name,
+                "sessions": int(ls["sessions"][i]),
+                "accuracy_percent": round(float(ls["accuracy"][i]), 2),
+                "time_per_prompt_s": round(float(ls["time_per_prompt"][i]), 2),
+                "percentile": round(float(ls["percentile"][i]), 1),
+            }
+            for i, name in enumerate(cohort.learners)
+            if not np.isnan(ls["accuracy"][i])
+        ),
+        key=lambda r: r["percentile"],
+    )
+    return {
+        "learners": len(cohort.learners),
+        "verbs": len(cohort.keys),
+        "learner_accuracy_percentiles": (
+            {f"p{q}": round(float(x), 2) for q, x in zip(quantiles, np.percentile(acc, quantiles))} if len(acc) else {}
+        ),
+        "hardest": [verb_row(i) for i in order[:top]],
+        "easiest": [verb_row(i) for i in order[::-1][:top]],
+        "all_verbs": [verb_row(i) for i in order],
+        "per_learner": learners,
+    }
+
+
+def print_report(report: Dict, top: int) -> None:
+    print(f"Learners: {report['learners']} | Verbs: {report['verbs']}")
+    if report["learner_accuracy_percentiles"]:
+        dist = "  ".join(f"{k}={v:.1f}%" for k, v in report["learner_accuracy_percentiles"].items())
+        print(f"Learner accuracy: {dist}")
+    for title, rows in (("Hardest verbs", report["hardest"]), ("Easiest verbs", report["easiest"])):
+        print(f"\n{title} (mean learner accuracy, time per prompt p50/p90):")
+        for r in rows[:top]:
+            print(
+                f"  {r['mean_learner_accuracy_percent']:6.1f}%  {r['time_per_prompt_p50_s']:5.1f}s/"
+                f"{r['time_per_prompt_p90_s']:5.1f}s  {r['learners']:>6} learners  "
+                f"{r['german']} -> {r['infinitive']}"
+            )
+    rows = report["per_learner"]
+    if rows:
+        print("\nLowest learners (percentile, accuracy, sessions):")
+        for r in rows[:top]:
+            print(f"  {r['percentile']:5.1f}  {r['accuracy_percent']:6.1f}%  {r['sessions']:>5}  {r['learner']}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Cohort analytics over many progress files")
+    parser.add_argument("paths", nargs="+", type=Path, help="progress files or directories to search")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes (1 = load in-process)")
+    parser.add_argument("--top", type=int, default=15, help="Rows per ranking")
+    parser.add_argument("--min-learners", type=int, default=MIN_LEARNERS, help="Minimum learners per ranked verb")
+    parser.add_argument("--json", type=Path, help="Also write the full report as JSON")
+    args = parser.parse_args(argv)
+
+    if np is None:
+        print("Error: cohort_report.py requires NumPy (pip install numpy)", file=sys.stderr)
+        return 2
+
+    files = find_progress_files(args.paths)
+    if not files:
+        print("Error: no progress files found", file=sys.stderr)
+        return 1
+    cohort, errors = load_cohort(files, args.workers)
+    for e in errors:
+        print(f"Warning: skipped {e}", file=sys.stderr)
+
+    report = build_report(cohort, args.top, args.min_learners)
+    print_report(report, args.top)
+    if args.json:
+        args.json.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"\nReport written to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+External verb decks (CSV or JSON) for both trainers.
+
+    python decks.py list                 # installed decks (not parsed)
+    python decks.py check my_deck.csv    # validate a deck file
+
+A deck row is (infinitive, simple past, past participle, german), variants
+separated by "/" as in the built-in deck, deck_files/default.csv:
+
+    infinitive,past,participle,german
+    burn,burnt/burned,burnt/burned,(ver)brennen
+
+JSON decks are a list of 4-element lists or of objects with those four keys.
+Parsed rows are cached under ~/.cache/irregular_verbs/decks/, keyed by the
+SHA-256 of the file content, so an unchanged deck is read back with a single
+marshal.loads() instead of being parsed and validated again.
+"""
+
+import argparse
+import contextlib
+import csv
+import hashlib
+import io
+import json
+import marshal
+import os
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from verb_table import VerbTable, split_options
+
+Row = Tuple[str, str, str, str]
+
+DECK_COLUMNS = ("infinitive", "past", "participle", "german")
+DECK_SUFFIXES = (".csv", ".json")
+# Bump when the cached row format or the validation rules change.
+CACHE_VERSION = 1
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "irregular_verbs" / "decks"
+DECK_DIRS = (Path(__file__).resolve().parent / "deck_files", Path.home() / ".irregular_verbs" / "decks")
+# The built-in verbs of both trainers (verb_table.builtin_table()).
+BUILTIN_DECK = DECK_DIRS[0] / "default.csv"
+
+
+class DeckError(ValueError):
+    pass
+
+
+# =========================
+# Parsing / validation
+# =========================
+def parse_csv(text: str, source: str) -> List[Tuple[int, List[str]]]:
+    """(line number, fields) per data row; blank lines, '#' comments and a header row are skipped."""
+    rows = []
+    for lineno, fields in enumerate(csv.reader(io.StringIO(text)), start=1):
+        if not fields or not "".join(fields).strip() or fields[0].lstrip().startswith("#"):
+            continue
+        if not rows and tuple(f.strip().lower() for f in fields) == DECK_COLUMNS:
+            continue
+        rows.append((lineno, fields))
+    return rows
+
+
+def parse_json(text: str, source: str) -> List[Tuple[int, List[str]]]:
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise DeckError(f"{source}: invalid JSON: {e}") from e
+    if isinstance(data, dict):
+        data = data.get("verbs")
+    if not isinstance(data, list):
+        raise DeckError(f"{source}: expected a list of verbs (or {{\"verbs\": [...]}})")
+    rows = []
+    for i, item in enumerate(data, start=1):
+        if isinstance(item, dict):
+            item = [item.get(name, "") for name in DECK_COLUMNS]
+        if not isinstance(item, list) or not all(isinstance(f, str) for f in item):
+            raise DeckError(f"{source}: entry {i}: expected 4 strings")
+        rows.append((i, item))
+    return rows
+
+
+def validate(parsed: List[Tuple[int, List[str]]], source: str) -> List[Row]:
+    """Checks every row; all problems are reported at once, with their line/entry numbers."""
+    rows: List[Row] = []
+    errors: List[str] = []
+    seen: Dict[str, int] = {}
+    for lineno, fields in parsed:
+        if len(fields) != 4:
+            errors.append(f"{source}:{lineno}: expected 4 fields, got {len(fields)}")
+            continue
+        row = tuple(" ".join(f.split()) for f in fields)
+        bad = [name for name, f in zip(DECK_COLUMNS, row) if not f]
+        bad += [name for name, f in zip(DECK_COLUMNS[:3], row) if f and not all(split_options(f))]
+        if bad:
+            errors.append(f"{source}:{lineno}: empty {', '.join(bad)}")
+            continue
+        key = f"{row[3]}||{row[0]}"
+        if key in seen:
+            errors.append(f"{source}:{lineno}: duplicate of line {seen[key]} ({row[0]} / {row[3]})")
+            continue
+        seen[key] = lineno
+        rows.append(row)
+    if errors:
+        more = f"\n  ... ({len(errors) - 20} more)" if len(errors) > 20 else ""
+        raise DeckError("invalid deck:\n  " + "\n  ".join(errors[:20]) + more)
+    if not rows:
+        raise DeckError(f"{source}: deck is empty")
+    return rows
+
+
+def parse_deck(path: Path, data: bytes) -> List[Row]:
+    try:
+        text = data.decode("utf-8-sig")
+    except UnicodeDecodeError as e:
+        raise DeckError(f"{path}: not UTF-8: {e}") from e
+    if path.suffix.lower() == ".json":
+        parsed = parse_json(text, str(path))
+    else:
+        parsed = parse_csv(text, str(path))
+    return validate(parsed, str(path))
+
+
+# =========================
+# Compiled cache
+# =========================
+def cache_path_for(data: bytes, cache_dir: Path = CACHE_DIR) -> Path:
+    digest = hashlib.sha256(b"v%d\0" % CACHE_VERSION + data).hexdigest()
+    return cache_dir / f"{digest}.deck"
+
+
+def read_cache(cache_path: Path) -> Optional[List[Row]]:
+    try:
+        version, rows = marshal.loads(cache_path.read_bytes())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    return rows if version == CACHE_VERSION else None
+
+
+def write_cache(cache_path: Path, rows: List[Row]) -> None:
+    # The cache is only an accelerator: failing to write it must not stop the trainer.
+    tmp = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_bytes(marshal.dumps((CACHE_VERSION, rows)))
+        os.replace(tmp, cache_path)
+    except OSError:
+        with contextlib.suppress(OSError):
+            tmp.unlink()
+
+
+def load_deck(path: Path, cache_dir: Optional[Path] = CACHE_DIR) -> VerbTable:
+    """Parsed rows come from the cache when the file content is unchanged; cards compile lazily."""
+    try:
+        data = path.read_bytes()
+    except OSError as e:
+        raise DeckError(f"cannot read deck {path}: {e}") from e
+    cache_path = cache_path_for(data, cache_dir) if cache_dir is not None else None
+    rows = read_cache(cache_path) if cache_path is not None else None
+    if rows is None:
+        rows = parse_deck(path, data)
+        if cache_path is not None:
+            write_cache(cache_path, rows)
+    return VerbTable(rows)
+
+
+# =========================
+# Installed decks
+# =========================
+def available_decks(dirs=DECK_DIRS) -> Dict[str, Path]:
+    """Deck name -> file for every deck in `dirs` (later dirs win). Files are only listed, not read."""
+    decks: Dict[str, Path] = {}
+    for d in dirs:
+        if not d.is_dir():
+            continue
+        for p in sorted(d.iterdir()):
+            if p.suffix.lower() in DECK_SUFFIXES and p.is_file():
+                decks[p.stem] = p
+    return decks
+
+
+def resolve_deck(arg: str) -> Path:
+    path = Path(arg).expanduser()
+    if path.suffix.lower() in DECK_SUFFIXES or path.exists():
+        return path
+    decks = available_decks()
+    if arg not in decks:
+        names = ", ".join(sorted(decks)) or "none installed"
+        raise DeckError(f"unknown deck '{arg}' (available: {names})")
+    return decks[arg]
+
+
+def load_deck_arg(arg: str) -> VerbTable:
+    """--deck value: a path to a .csv/.json file or the name of an installed deck."""
+    return load_deck(resolve_deck(arg))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Verb deck tools")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("list", help="List installed decks")
+    chk = sub.add_parser("check", help="Validate a deck file")
+    chk.add_argument("deck")
+    args = parser.parse_args(argv)
+
+    if args.cmd == "list":
+        for name, path in available_decks().items():
+            print(f"{name:<20} {path}")
+        return 0
+
+    try:
+        path = resolve_deck(args.deck)
+        rows = parse_deck(path, path.read_bytes())
+    except (DeckError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(f"{path}: {len(rows)} verbs OK")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
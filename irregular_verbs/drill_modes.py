@@ -0,0 +1,212 @@
+import itertools
+import random
+import re
+import threading
+from typing import Callable, Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
+
+from verb_table import FIELD_NAMES, Card, VerbTable, form_entries, normalize
+
+# =========================
+# Drill modes
+# =========================
+#   german   German meaning -> infinitive, simple past, past participle (the classic drill)
+#   form     one English form, e.g. "Simple Past: brought" -> the other two forms
+#   english  the three English forms -> the German meaning
+# Reverse prompts are generated and graded through two indexes built once per
+# deck: every normalized English form ("/" variants, "wake up") -> (card, field),
+# and every accepted German answer -> cards. A prompt stores the cards that
+# share what it shows, so an answer is right for any of them ("lay" shown as
+# simple past is "lie"; "lie" shown as infinitive has two German meanings).
+# German prompts are ambiguous too ("fahren": drive, go, ride): an inverted
+# index of German meanings -> cards finds the verbs whose meanings cover a
+# prompt, and an answer counts for the one whose infinitive was given.
+MODES = ("german", "form", "english")
+# Field number of the German meaning in Prompt.ask.
+GERMAN = 3
+FIELD_LABELS = FIELD_NAMES + ("German meaning",)
+
+_OPTIONAL = re.compile(r"\(([^()]*)\)")
+_SICH = "sich "
+
+
+def german_variants(german: str) -> Set[str]:
+    """
+    Accepted (normalized) answers for a German meaning: the whole entry, each
+    "; "-separated meaning, with and without every "(...)" part, and without a
+    leading "sich": "(ver)brennen" -> verbrennen, brennen; "(sich) streiten" ->
+    sich streiten, streiten.
+    """
+    out = {normalize(german)}
+    for meaning in german.split(";"):
+        meaning = meaning.strip()
+        if not meaning:
+            continue
+        parts = _OPTIONAL.split(meaning)  # text, optional, text, optional, ..., text
+        choices = [[p] if i % 2 == 0 else [p, ""] for i, p in enumerate(parts)]
+        for combo in itertools.product(*choices):
+            v = normalize("".join(combo))
+            if v:
+                out.add(v)
+                if v.startswith(_SICH):
+                    out.add(v[len(_SICH):])
+        out.add(normalize(meaning))
+    return out
+
+
+def meanings(german: str) -> List[str]:
+    """The normalized "; "-separated meanings of a German entry."""
+    return [m for m in (normalize(x) for x in german.split(";")) if m]
+
+
+def german_answer(german: str) -> str:
+    """The "textbook" answer for a German meaning: its first meaning with the brackets removed."""
+    return normalize(german.split(";")[0].replace("(", "").replace(")", ""))
+
+
+class DrillIndex:
+    __slots__ = ("table", "by_form", "by_german", "by_meaning", "_covering")
+
+    def __init__(self, table: VerbTable) -> None:
+        self.table = table
+        self.by_form: Dict[str, List[Tuple[int, int]]] = form_entries(table)
+        self.by_german: Dict[str, List[int]] = {}
+        self.by_meaning: Dict[str, List[int]] = {}
+        for i, row in enumerate(table.rows):
+            for v in german_variants(row[3]):
+                self.by_german.setdefault(v, []).append(i)
+            for m in set(meanings(row[3])):
+                self.by_meaning.setdefault(m, []).append(i)
+        self._covering: Dict[str, FrozenSet[int]] = {}
+
+    def cards_with(self, form: str, field: int) -> List[int]:
+        """Cards that accept `form` in `field`."""
+        return [i for i, f in self.by_form.get(normalize(form), ()) if f == field]
+
+    def covering(self, german: str) -> FrozenSet[int]:
+        """Cards that have every meaning of `german` (its own card included); cached per prompt."""
+        found = self._covering.get(german)
+        if found is None:
+            postings = sorted((self.by_meaning.get(m, ()) for m in meanings(german)), key=len)
+            found = frozenset(postings[0]).intersection(*postings[1:]) if postings else frozenset()
+            self._covering[german] = found
+        return found
+
+
+_index: Optional[DrillIndex] = None
+_index_lock = threading.Lock()
+
+
+def drill_index(table: VerbTable) -> DrillIndex:
+    """Built on first use and kept for the current table only."""
+    global _index
+    with _index_lock:
+        if _index is None or _index.table is not table:
+            _index = DrillIndex(table)
+        return _index
+
+
+def covering_card(table: VerbTable, german: str, infinitive: str) -> Optional[Card]:
+    """The verb whose meanings cover the German prompt and whose infinitive is `infinitive`, if any."""
+    index = drill_index(table)
+    covering = index.covering(german)
+    for i, field in index.by_form.get(normalize(infinitive), ()):
+        if field == 0 and i in covering:
+            return table.cards[i]
+    return None
+
+
+def answered_card(table: VerbTable, card: Card, infinitive: str) -> Card:
+    """
+    The verb an answer to `card`'s German meaning was given for: another verb
+    whose meanings cover the prompt if `infinitive` is its infinitive
+    ("ride" for "fahren"), otherwise `card`. One dict lookup per answer.
+    """
+    return covering_card(table, card.german, infinitive) or card
+
+
+class Prompt:
+    """
+    What to show and what to ask for one card in one mode. `ask` lists the
+    fields to answer (0-2 English forms, GERMAN), `expected` their textbook
+    answers, `candidates` the cards any of which makes an answer right.
+    """
+
+    __slots__ = ("card", "mode", "shown_field", "shown", "ask", "expected", "candidates")
+
+    def __init__(self, card: Card, mode: str, shown_field: Optional[int], shown: str, ask: Sequence[int], candidates: List[int]) -> None:
+        self.card = card
+        self.mode = mode
+        self.shown_field = shown_field
+        self.shown = shown
+        self.ask = list(ask)
+        self.expected = [german_answer(card.german) if f == GERMAN else card.forms[f] for f in self.ask]
+        self.candidates = candidates
+
+    def title(self) -> str:
+        if self.mode == "english":
+            return "English"
+        if self.mode == "form":
+            return FIELD_NAMES[self.shown_field]
+        return "German meaning"
+
+    def label(self) -> str:
+        return f"{self.title()}: {self.shown}"
+
+    def allow_space(self, field: int) -> bool:
+        return True if field == GERMAN else self.card.allow_space[field]
+
+
+def make_prompt(table: VerbTable, card: Card, mode: str, rng=random) -> Prompt:
+    index = drill_index(table)
+    if mode == "german":
+        return Prompt(card, mode, None, card.german, (0, 1, 2), sorted(index.covering(card.german)))
+    if mode == "form":
+        field = rng.randrange(3)
+        shown = rng.choice(card.options[field])
+        return Prompt(card, mode, field, shown, [f for f in range(3) if f != field], index.cards_with(shown, field))
+    if mode == "english":
+        return Prompt(card, mode, 0, card.display, (GERMAN,), index.cards_with(card.inf, 0))
+    raise ValueError(f"unknown drill mode: {mode}")
+
+
+def _folded(card: Card, field: int, answer: str) -> bool:
+    return normalize(answer) in card.accepted[field]
+
+
+def grade(
+    table: VerbTable, prompt: Prompt, answers: Sequence[str], check: Callable[[Card, int, str], bool] = _folded
+) -> Tuple[List[bool], Card]:
+    """
+    Per-field results for the asked fields and the card they were graded
+    against: the candidate with the most right answers (the prompted card on
+    ties). `check` grades an English form (teacher.py passes its
+    case-sensitive check_field); German answers are always case-folded.
+    """
+    cards = table.cards
+    if prompt.mode == "german":
+        card = answered_card(table, prompt.card, answers[0])
+        return [check(card, f, a) for a, f in zip(answers, prompt.ask)], card
+    if GERMAN in prompt.ask:
+        hits = drill_index(table).by_german.get(normalize(answers[0]), ())
+        for i in prompt.candidates:
+            if i in hits:
+                return [True], cards[i]
+        return [False], prompt.card
+    best_oks: List[bool] = []
+    best = prompt.card
+    for i in [prompt.card.index] + [c for c in prompt.candidates if c != prompt.card.index]:
+        card = cards[i]
+        oks = [check(card, f, a) for a, f in zip(answers, prompt.ask)]
+        if not best_oks or sum(oks) > sum(best_oks):
+            best_oks, best = oks, card
+    return best_oks, best
+
+
+def field_score(prompt: Prompt, oks: Sequence[bool]) -> int:
+    """
+    Correct fields on the trainers' 0-3 scale: a form shown counts as known,
+    the German meaning of an "english" prompt counts for all three.
+    """
+    if prompt.mode == "english":
+        return 3 if oks[0] else 0
+    return 3 - len(prompt.ask) + sum(oks)
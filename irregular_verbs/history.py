@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+History queries by time range and verb, without loading the whole history.
+
+    python history.py --since 2024-05                     # sessions and verbs of May 2024 until now
+    python history.py --since 2024-05-01 --until 2024-05-07
+    python history.py --verb go --since 2024 --json
+
+--since/--until take a year, month, day or full timestamp; --until includes
+the whole period given ("2024-05" = through May 31). --verb matches an
+infinitive or a German meaning.
+
+With the JSON store, sessions and single answers that compaction has moved into
+the column files (<progress>.sessions/, <progress>.answers/) are found by binary
+search on their timestamp column, and only the rows in range are read; the
+events still in progress.journal (at most about 1 MiB) are scanned. With the
+SQLite store the same ranges are indexed queries. Single answers are only kept
+since this command exists; older history has sessions and per-verb totals only.
+"""
+
+import argparse
+import json
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from progress_store import is_sqlite_path, journal_path_for, read_meta
+from session_columns import AnswerLog, SessionHistory, answers_dir_for, columns_dir_for
+from verb_table import normalize
+
+# (at, key, correct fields 0..3, time_s)
+Answer = Tuple[str, str, int, float]
+
+# Bounds used when --since / --until are left out.
+EARLIEST = datetime(1970, 1, 2)
+LATEST = datetime(9999, 1, 1)
+
+
+def parse_period(text: str) -> Tuple[datetime, datetime]:
+    """[start, end) of "2024", "2024-05", "2024-05-01", "2024-05-01T14" or a full ISO timestamp."""
+    t = text.strip()
+    try:
+        if len(t) == 4:
+            start = datetime(int(t), 1, 1)
+            return start, start.replace(year=start.year + 1)
+        if len(t) == 7:
+            start = datetime.strptime(t, "%Y-%m")
+            return start, (start + timedelta(days=31)).replace(day=1)
+        start = datetime.fromisoformat(t)
+    except ValueError:
+        raise ValueError(f"not a date or timestamp: '{text}'") from None
+    # The period is as long as the least significant part given.
+    if len(t) == 10:
+        step = timedelta(days=1)
+    elif len(t) == 13:
+        step = timedelta(hours=1)
+    elif len(t) == 16:
+        step = timedelta(minutes=1)
+    else:
+        step = timedelta(seconds=1)
+    return start, start + step
+
+
+def matching_keys(keys, verb: str) -> List[str]:
+    """Verb keys ("german||infinitive") whose infinitive or one of whose German meanings is `verb`."""
+    q = normalize(verb)
+    out = []
+    for key in keys:
+        german, _, inf = key.partition("||")
+        if q == normalize(inf) or q == normalize(german) or q in (normalize(g) for g in german.split(";")):
+            out.append(key)
+    return out
+
+
+def _iso(epoch: int) -> str:
+    return datetime.fromtimestamp(epoch).isoformat(timespec="seconds")
+
+
+# =========================
+# Queries
+# =========================
+def query_json(progress_path: Path, since: datetime, until: datetime, verb: Optional[str]) -> Tuple[List[Dict], List[Answer]]:
+    since_iso, until_iso = since.isoformat(), until.isoformat()
+    since_epoch, until_epoch = int(since.timestamp()), int(until.timestamp())
+    meta = read_meta(progress_path)
+
+    if progress_path.exists() and "session_rows" not in meta:
+        # Snapshot from before the column files: its sessions are still inline and have to be parsed.
+        snapshot = json.loads(progress_path.read_text(encoding="utf-8"))
+        sessions = [s for s in snapshot.get("sessions", []) if since_iso <= s["timestamp"] < until_iso]
+    else:
+        history = SessionHistory(columns_dir_for(progress_path), meta.get("session_rows", 0))
+        lo, hi = history.time_range("timestamp", since_epoch, until_epoch)
+        sessions = history[lo:hi]
+        history.close()
+
+    log = AnswerLog(answers_dir_for(progress_path), meta.get("answer_rows", 0), meta.get("answer_keys_bytes", 0))
+    wanted = set(matching_keys(log.keys, verb)) if verb else None
+    answers = [
+        (_iso(at), key, correct, time_s)
+        for at, key, correct, time_s in log.rows_between(since_epoch, until_epoch)
+        if wanted is None or key in wanted
+    ]
+    log.close()
+
+    # Not compacted yet: everything in the journal past the snapshot.
+    seq = meta.get("journal_seq", 0)
+    journal_path = journal_path_for(progress_path)
+    if journal_path.exists():
+        with open(journal_path, "rb") as f:
+            lines = f.read().splitlines()
+        for line in lines:
+            try:
+                ev = json.loads(line)
+            except ValueError:
+                continue
+            if ev.get("n", 0) <= seq:
+                continue
+            if ev["type"] == "session":
+                if since_iso <= ev["session"]["timestamp"] < until_iso:
+                    sessions.append(ev["session"])
+            elif ev["type"] == "verb" and since_iso <= ev["at"] < until_iso:
+                if wanted is None or ev["key"] in wanted or matching_keys([ev["key"]], verb):
+                    answers.append((ev["at"], ev["key"], ev["correct"], ev["time_s"]))
+    return sessions, answers
+
+
+def query_sqlite(db_path: Path, since: datetime, until: datetime, verb: Optional[str]) -> Tuple[List[Dict], List[Answer]]:
+    import progress_sqlite
+
+    since_iso, until_iso = since.isoformat(), until.isoformat()
+    keys = matching_keys(progress_sqlite.verb_keys(db_path), verb) if verb else None
+    sessions = progress_sqlite.sessions_between(db_path, since_iso, until_iso)
+    answers = progress_sqlite.answers_between(db_path, since_iso, until_iso, keys) if keys != [] else []
+    return sessions, answers
+
+
+def query(
+    progress_path: Path, since: Optional[datetime] = None, until: Optional[datetime] = None, verb: Optional[str] = None
+) -> Tuple[List[Dict], List[Answer]]:
+    """(sessions, answers) with since <= timestamp < until, answers only for `verb` if given."""
+    since = since or EARLIEST
+    until = until or LATEST
+    if is_sqlite_path(progress_path):
+        return query_sqlite(progress_path, since, until, verb)
+    return query_json(progress_path, since, until, verb)
+
+
+def verb_summary(answers: List[Answer]) -> List[Dict]:
+    """Per-verb totals of `answers`, lowest accuracy first."""
+    by_key: Dict[str, List] = {}
+    for at, key, correct, time_s in answers:
+        row = by_key.get(key)
+        if row is None:
+            row = by_key[key] = [0, 0, 0.0, at]
+        row[0] += 1
+        row[1] += correct
+        row[2] += time_s
+        row[3] = max(row[3], at)
+    out = []
+    for key, (asked, correct, time_s, last_seen) in by_key.items():
+        german, _, inf = key.partition("||")
+        out.append(
+            {
+                "german": german,
+                "infinitive": inf,
+                "asked": asked,
+                "accuracy_percent": round(correct / (asked * 3) * 100.0, 2),
+                "avg_time_s": round(time_s / asked, 2),
+                "last_seen": last_seen,
+            }
+        )
+    out.sort(key=lambda r: (r["accuracy_percent"], -r["asked"]))
+    return out
+
+
+# =========================
+# CLI
+# =========================
+def print_history(sessions: List[Dict], answers: List[Answer], verb: Optional[str], top: int) -> None:
+    if not verb:
+        print(f"Sessions: {len(sessions)}")
+        for s in sessions[-top:]:
+            q = s["total_questions"]
+            acc = s["total_correct"] / q * 100.0 if q else 0.0
+            m, sec = divmod(int(round(s["total_time_s"])), 60)
+            print(f"  {s['timestamp']}  {s['base_sample_size']:>3} verbs  {s['total_correct']:>4}/{q:<4} {acc:5.1f}%  {m:02d}:{sec:02d}")
+        if len(sessions) > top:
+            print(f"  ... ({len(sessions) - top} earlier)")
+        print()
+    rows = verb_summary(answers)
+    print(f"Verbs: {len(rows)} ({len(answers)} answers)")
+    for r in rows[:top]:
+        print(
+            f"  {r['accuracy_percent']:6.1f}%  {r['asked']:>4}x  {r['avg_time_s']:6.1f}s  "
+            f"{r['german']} -> {r['infinitive']}  (last {r['last_seen']})"
+        )
+    if verb:
+        print("\nAnswers:")
+        for at, key, correct, time_s in answers[-top:]:
+            print(f"  {at}  {correct}/3  {time_s:6.1f}s  {key.partition('||')[2]}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Session and verb history by time range")
+    parser.add_argument("--data-dir", type=Path, default=Path.home() / "irregular_verbs_logs")
+    parser.add_argument("--store", choices=("json", "sqlite"), default="json", help="Progress backend (see irregular_verbs.py)")
+    parser.add_argument("--since", help="Start: YYYY, YYYY-MM, YYYY-MM-DD or a full timestamp")
+    parser.add_argument("--until", help="End, inclusive of the whole period given")
+    parser.add_argument("--verb", help="Only this verb (infinitive or German meaning)")
+    parser.add_argument("--top", type=int, default=30, help="Rows per list")
+    parser.add_argument("--json", action="store_true", help="Print the result as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        since = parse_period(args.since)[0] if args.since else None
+        until = parse_period(args.until)[1] if args.until else None
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    progress_path = args.data_dir / ("progress.sqlite" if args.store == "sqlite" else "progress.json")
+    sessions, answers = query(progress_path, since, until, args.verb)
+
+    if args.json:
+        doc = {"sessions": sessions, "verbs": verb_summary(answers)}
+        if args.verb:
+            doc["answers"] = [dict(zip(("at", "key", "correct", "time_s"), a)) for a in answers]
+        print(json.dumps(doc, ensure_ascii=False, indent=2))
+    else:
+        print_history(sessions, answers, args.verb, args.top)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
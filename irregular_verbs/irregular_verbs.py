@@ -1,128 +1,56 @@
-import json
+import time
+
+# Taken before any other import, for --profile-startup.
+STARTED_NS = time.perf_counter_ns()
+
+import argparse
+import contextlib
+import os
 import random
 import sys
-import time
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import TYPE_CHECKING, Callable, Dict, Generator, List, Optional, Tuple, Union
 
-# =========================
-# Data set (infinitive, simple_past, past_participle, german)
-# =========================
-VERBS: List[Tuple[str, str, str, str]] = [
-    ("be", "was/were", "been", "sein"),
-    ("beat", "beat", "beaten", "schlagen; besiegen"),
-    ("become", "became", "become", "werden"),
-    ("begin", "began", "begun", "beginnen; anfangen"),
-    ("bet", "bet", "bet", "wetten"),
-    ("bite", "bit", "bitten", "beißen"),
-    ("blow", "blew", "blown", "blasen; pusten"),
-    ("break", "broke", "broken", "(zer)brechen; kaputt machen"),
-    ("bring", "brought", "brought", "(mit)bringen"),
-    ("build", "built", "built", "bauen"),
-    ("burn", "burnt/burned", "burnt/burned", "(ver)brennen"),
-    ("buy", "bought", "bought", "kaufen"),
-    ("catch", "caught", "caught", "fangen"),
-    ("choose", "chose", "chosen", "(aus)wählen"),
-    ("come", "came", "come", "kommen"),
-    ("cost", "cost", "cost", "kosten"),
-    ("cut", "cut", "cut", "schneiden"),
-    ("deal (with)", "dealt (with)", "dealt (with)", "sich befassen (mit); umgehen (mit)"),
-    ("do", "did", "done", "machen; tun"),
-    ("draw", "drew", "drawn", "zeichnen; ziehen"),
-    ("dream", "dreamt/dreamed", "dreamt/dreamed", "träumen"),
-    ("drink", "drank", "drunk", "trinken"),
-    ("drive", "drove", "driven", "fahren"),
-    ("eat", "ate", "eaten", "essen"),
-    ("fall", "fell", "fallen", "(hin)fallen"),
-    ("feed", "fed", "fed", "füttern; ernähren"),
-    ("feel", "felt", "felt", "fühlen"),
-    ("fight", "fought", "fought", "kämpfen; (sich) streiten"),
-    ("find", "found", "found", "finden"),
-    ("fit", "fit/fitted", "fit/fitted", "passen"),
-    ("fly", "flew", "flown", "fliegen"),
-    ("forget", "forgot", "forgotten", "vergessen"),
-    ("forgive", "forgave", "forgiven", "vergeben; verzeihen"),
-    ("freeze", "froze", "frozen", "gefrieren; erstarren"),
-    ("get", "got", "got", "bekommen; erhalten"),
-    ("give", "gave", "given", "geben"),
-    ("go", "went", "gone", "gehen; fahren"),
-    ("grow", "grew", "grown", "wachsen; anbauen; züchten"),
-    ("hang", "hung", "hung", "hängen"),
-    ("have", "had", "had", "haben"),
-    ("hear", "heard", "heard", "hören"),
-    ("hide", "hid", "hidden", "(sich) verstecken"),
-    ("hit", "hit", "hit", "schlagen; treffen"),
-    ("hold", "held", "held", "(fest)halten"),
-    ("hurt", "hurt", "hurt", "verletzen; sich weh tun"),
-    ("keep", "kept", "kept", "(auf)bewahren; behalten"),
-    ("know", "knew", "known", "kennen; wissen"),
-    ("lead", "led", "led", "(an)führen"),
-    ("learn", "learnt/learned", "learnt/learned", "lernen"),
-    ("leave", "left", "left", "(ver)lassen"),
-    ("lend", "lent", "lent", "(ver)leihen"),
-    ("let", "let", "let", "lassen"),
-    ("lie", "lay", "lain", "liegen"),
-    ("lose", "lost", "lost", "verlieren"),
-    ("make", "made", "made", "machen; tun"),
-    ("mean", "meant", "meant", "bedeuten; meinen"),
-    ("meet", "met", "met", "treffen"),
-    ("pay", "paid", "paid", "(be)zahlen"),
-    ("put", "put", "put", "legen; setzen; stellen"),
-    ("read", "read", "read", "lesen"),
-    ("ride", "rode", "ridden", "fahren; reiten"),
-    ("ring", "rang", "rung", "klingeln; läuten"),
-    ("rise", "rose", "risen", "steigen; sich erheben"),
-    ("run", "ran", "run", "laufen; rennen"),
-    ("say", "said", "said", "sagen"),
-    ("see", "saw", "seen", "sehen"),
-    ("sell", "sold", "sold", "verkaufen"),
-    ("send", "sent", "sent", "senden; verschicken"),
-    ("set up", "set up", "set up", "erbauen; errichten"),
-    ("shine", "shone", "shone", "scheinen; glänzen"),
-    ("shoot", "shot", "shot", "schießen"),
-    ("show", "showed", "shown", "zeigen"),
-    ("sing", "sang", "sung", "singen"),
-    ("sink", "sank", "sunk", "untergehen; sinken"),
-    ("sit", "sat", "sat", "sitzen"),
-    ("sleep", "slept", "slept", "schlafen"),
-    ("smell", "smelt/smelled", "smelt/smelled", "riechen; duften"),
-    ("speak", "spoke", "spoken", "sprechen"),
-    ("spell", "spelt/spelled", "spelt/spelled", "buchstabieren"),
-    ("spend", "spent", "spent", "ausgeben; verbringen"),
-    ("spill", "spilt/spilled", "spilt/spilled", "verschütten; auslaufen"),
-    ("stand", "stood", "stood", "stehen"),
-    ("steal", "stole", "stolen", "stehlen"),
-    ("sting", "stung", "stung", "stechen"),
-    ("swim", "swam", "swum", "schwimmen"),
-    ("take", "took", "taken", "nehmen"),
-    ("teach", "taught", "taught", "unterrichten; lehren; beibringen"),
-    ("tell", "told", "told", "erzählen"),
-    ("think", "thought", "thought", "(nach)denken; glauben"),
-    ("throw", "threw", "thrown", "werfen"),
-    ("understand", "understood", "understood", "verstehen"),
-    ("wake up", "woke up", "woken up", "(auf)wachen; (auf)wecken"),
-    ("wear", "wore", "worn", "anhaben; tragen"),
-    ("win", "won", "won", "gewinnen; siegen"),
-    ("write", "wrote", "written", "schreiben"),
-]
+import metrics
+from key_input import read_field, take_field_times
+from session_log import SessionLogWriter
 
+from progress_store import (
+    RECENT_WINDOW,
+    BackgroundLoad,
+    TOUGH_MIN_ASKED,
+    ensure_progress_shape,
+    journal_path_for,
+    load_progress,
+    record_session,
+    record_verb,
+    save_progress,
+    tough_verbs,
+)
+from verb_table import FIELD_NAMES, Card, builtin_table, grade_card, normalize
 
-# =========================
-# Helpers: normalization & checking
-# =========================
-def normalize(s: str) -> str:
-    return " ".join(s.strip().lower().split())
+if TYPE_CHECKING:
+    # Only needed for headless runs / --archive-logs; imported there.
+    from answer_script import AnswerScript
+    from log_archive import LogArchive
 
+# Compiled once (verb_table.py): accepted-answer sets, space flags, keys and display strings per verb.
+TABLE = builtin_table()
 
-def accepted_answers(correct: str) -> List[str]:
-    return [normalize(x) for x in correct.split("/")]
+# How session verbs are picked: "random" (uniform sample) or "srs" (due verbs first, see scheduler.py).
+SCHEDULE = "random"
 
+# Max typos for "almost" feedback on wrong answers (0 = off, see near_miss.py). Scoring is unchanged.
+NEAR_MISS = 0
 
-def is_correct(user_input: str, correct: str) -> bool:
-    return normalize(user_input) in accepted_answers(correct)
+# What is shown and asked: "german" (meaning -> three forms), "form" or "english" (see drill_modes.py).
+DRILL = "german"
 
 
+# =========================
+# Helpers: formatting
+# =========================
 def format_mmss(seconds: float) -> str:
     total = int(round(seconds))
     minutes = total // 60
@@ -130,82 +58,33 @@ def format_mmss(seconds: float) -> str:
     return f"{minutes:02d}:{secs:02d}"
 
 
-def verb_key(v: Tuple[str, str, str, str]) -> str:
-    inf, _, _, german = v
-    return f"{german}||{inf}"
-
-
 # =========================
-# Progress persistence (JSON)
+# Progress persistence (journaled JSON, see progress_store.py)
 # =========================
-def load_progress(progress_path: Path) -> Dict:
-    if progress_path.exists():
-        try:
-            return json.loads(progress_path.read_text(encoding="utf-8"))
-        except Exception:
-            return {}
-    return {}
-
-
-def save_progress(progress_path: Path, progress: Dict) -> None:
-    progress_path.write_text(json.dumps(progress, ensure_ascii=False, indent=2), encoding="utf-8")
-
-
-def ensure_progress_shape(progress: Dict) -> Dict:
-    progress.setdefault("meta", {})
-    progress.setdefault("sessions", [])
-    progress.setdefault("verbs", {})
-    return progress
-
-
-def update_per_verb(progress: Dict, v: Tuple[str, str, str, str], correct_count: int, time_s: float) -> None:
-    k = verb_key(v)
-    pv = progress["verbs"].setdefault(
-        k,
-        {
-            "german": v[3],
-            "infinitive": v[0],
-            "times_asked": 0,
-            "total_fields": 0,
-            "total_correct_fields": 0,
-            "total_time_s": 0.0,
-            "last_seen": None,
-        },
-    )
-    pv["times_asked"] += 1
-    pv["total_fields"] += 3
-    pv["total_correct_fields"] += int(correct_count)
-    pv["total_time_s"] += float(time_s)
-    pv["last_seen"] = datetime.now().isoformat(timespec="seconds")
+def update_per_verb(progress: Dict, v: Card, correct_count: int, time_s: float) -> None:
+    record_verb(progress, v.key, v.german, v.inf, correct_count, time_s)
 
 
+@metrics.timed("render.summary")
 def print_progress_summary(progress: Dict) -> None:
-    sessions = progress.get("sessions", [])
-    if not sessions:
+    # Reads only the running totals and the tough-verb index kept by progress_store.
+    totals = progress["totals"]
+    total_sessions = totals["sessions"]
+    if not total_sessions:
         return
 
-    total_sessions = len(sessions)
-    total_fields = sum(s["total_questions"] for s in sessions)
-    total_correct = sum(s["total_correct"] for s in sessions)
-    total_time_s = sum(s["total_time_s"] for s in sessions)
+    total_fields = totals["fields"]
+    total_correct = totals["correct"]
+    total_time_s = totals["time_s"]
     overall_acc = (total_correct / total_fields * 100.0) if total_fields else 0.0
 
-    last_n = 5
-    recent = sessions[-last_n:]
-    recent_fields = sum(s["total_questions"] for s in recent)
-    recent_correct = sum(s["total_correct"] for s in recent)
-    recent_time_s = sum(s["total_time_s"] for s in recent)
+    recent = totals["recent"]
+    recent_fields = sum(r[0] for r in recent)
+    recent_correct = sum(r[1] for r in recent)
+    recent_time_s = sum(r[2] for r in recent)
     recent_acc = (recent_correct / recent_fields * 100.0) if recent_fields else 0.0
 
-    per = progress.get("verbs", {})
-    tough = []
-    for pv in per.values():
-        asked = pv["times_asked"]
-        if asked < 3:
-            continue
-        acc = (pv["total_correct_fields"] / pv["total_fields"]) if pv["total_fields"] else 0.0
-        tough.append((acc, asked, pv["german"], pv["infinitive"]))
-    tough.sort(key=lambda x: (x[0], -x[1]))
+    tough = tough_verbs(progress, 10)
 
     print("\n==============================")
     print("PROGRESS STATISTICS")
@@ -215,164 +94,330 @@ def print_progress_summary(progress: Dict) -> None:
     print(f"Overall total time: {format_mmss(total_time_s)}")
     print(f"Average time per session: {format_mmss(total_time_s / total_sessions)}")
 
-    print("\nLast 5 sessions:")
+    print(f"\nLast {RECENT_WINDOW} sessions:")
     print(f"  Accuracy: {recent_acc:.1f}%")
     print(f"  Total time: {format_mmss(recent_time_s)}")
 
     if tough:
-        print("\nTough verbs (lowest accuracy, asked ≥ 3 times):")
-        for acc, asked, german, inf in tough[:10]:
+        print(f"\nTough verbs (lowest accuracy, asked ≥ {TOUGH_MIN_ASKED} times):")
+        for acc, asked, german, inf in tough:
             print(f"  - {german} ({inf}) — {acc*100:.1f}% over {asked} asks")
     else:
-        print("\nTough verbs: not enough history yet (need a verb asked at least 3 times).")
+        print(f"\nTough verbs: not enough history yet (need a verb asked at least {TOUGH_MIN_ASKED} times).")
 
 
 # =========================
-# Raw input (space-blocking + backspace supported)
+# Raw input (space-blocking + backspace supported, see key_input.py)
 # =========================
-def beep() -> None:
-    # Terminal bell (works in many terminals)
-    sys.stdout.write("\a")
-    sys.stdout.flush()
-
-
 def read_line_no_spaces(prompt: str, allow_space: bool = False) -> str:
-    sys.stdout.write(prompt)
-    sys.stdout.flush()
-    user_input = sys.stdin.readline().rstrip("\n")
-    
-    if not allow_space:
-        user_input = user_input.replace(" ", "")
-        
-    return user_input.strip()
-
-
-def allow_space_for_field(correct_value: str) -> bool:
-    # Allow spaces ONLY when the correct answer(s) contains a space (e.g., "wake up", "set up")
-    # If there are alternatives, allow if any alternative has a space.
-    for alt in correct_value.split("/"):
-        if " " in alt.strip():
-            return True
-    return False
+    return read_field(prompt, allow_space)
 
 
 # =========================
 # Quiz interaction
 # =========================
-def ask_one(v: Tuple[str, str, str, str], log_lines: List[str]) -> Tuple[int, float, List[Tuple[str, str, str]]]:
+# read(prompt, allow_space, correct_value) -> answer
+Reader = Callable[[str, bool, str], str]
+
+
+def terminal_reader(prompt: str, allow_space: bool, correct_value: str) -> str:
+    return read_line_no_spaces(prompt, allow_space=allow_space)
+
+
+def script_reader(script: "AnswerScript") -> Reader:
+    def read(prompt: str, allow_space: bool, correct_value: str) -> str:
+        answer = script.next_answer(correct_value)
+        if answer is None:
+            # Exhausted script behaves like EOF on stdin: empty answers.
+            return ""
+        if not allow_space:
+            answer = answer.replace(" ", "")
+        return answer.strip()
+
+    return read
+
+
+# Anything with append(text); session_steps() additionally calls record(dict) once per prompt
+# (SessionLogWriter / MemoryLog in session_log.py).
+LogSink = List[str]
+
+# The quiz flow is written as generators that yield (prompt, allow_space, correct_value)
+# whenever they need an answer and receive it via send(). drive() runs them against a
+# blocking Reader; trainer_server.py runs the same generators from asyncio.
+ReadRequest = Tuple[str, bool, str]
+
+
+def answer_duration(start: float, fields: int, log: LogSink) -> float:
+    """
+    Time taken for the last `fields` answers: from each prompt to its Enter
+    when they were typed at a terminal (think and typing time are logged
+    separately), otherwise the wall-clock time since `start`.
+    """
+    typed = take_field_times()
+    if len(typed) != fields:
+        return time.time() - start
+    log.append("Think / typing: " + ", ".join(f"{t.think_s:.2f}s / {t.typing_s:.2f}s" for t in typed) + "\n")
+    return sum(t.total_s for t in typed)
+
+
+def drive(steps: Generator, read: Reader):
+    try:
+        request = next(steps)
+        while True:
+            request = steps.send(read(*request))
+    except StopIteration as stop:
+        return stop.value
+
+
+def ask_one(
+    v: Card, log: LogSink, read: Reader = terminal_reader
+) -> Tuple[int, float, List[Tuple[str, str, str]], Card]:
     """
     Returns:
       correct_count (0-3),
       duration_seconds,
-      wrong_fields: list of (field_name, user_value, correct_value)
+      wrong_fields: list of (field_name, user_value, correct_value),
+      the verb answered: `v`, or another verb with the same meaning whose
+      infinitive was given ("ride" for "fahren"); results count for that one
     """
-    inf, past, part, german = v
+    return drive(ask_one_steps(v, log), read)
+
+
+def ask_one_steps(
+    v: Card, log: LogSink
+) -> Generator[ReadRequest, str, Tuple[int, float, List[Tuple[str, str, str]], Card]]:
+    if DRILL != "german":
+        return (yield from drill_steps(v, log))
+    inf, past, part, german = v.inf, v.past, v.part, v.german
     print(f"German meaning: {german}")
 
-    log_lines.append(f"German meaning: {german}\n")
+    log.append(f"German meaning: {german}\n")
 
     # Space rule is applied per field based on whether the correct value needs spaces.
-    allow_inf_space = allow_space_for_field(inf)
-    allow_past_space = allow_space_for_field(past)
-    allow_part_space = allow_space_for_field(part)
+    allow_inf_space, allow_past_space, allow_part_space = v.allow_space
 
+    take_field_times()
     start = time.time()
-    user_inf = read_line_no_spaces("Infinitive: ", allow_space=allow_inf_space)
-    user_past = read_line_no_spaces("Simple Past: ", allow_space=allow_past_space)
-    user_part = read_line_no_spaces("Past Participle: ", allow_space=allow_part_space)
-    duration = time.time() - start
+    user_inf = yield ("Infinitive: ", allow_inf_space, inf)
+    user_past = yield ("Simple Past: ", allow_past_space, past)
+    user_part = yield ("Past Participle: ", allow_part_space, part)
+    duration = answer_duration(start, 3, log)
 
-    c_inf = is_correct(user_inf, inf)
-    c_past = is_correct(user_past, past)
-    c_part = is_correct(user_part, part)
+    metrics.incr("prompts")
+    with metrics.span("grade"):
+        card = v
+        if normalize(user_inf) not in v.accepted[0]:
+            from drill_modes import answered_card
+
+            card = answered_card(TABLE, v, user_inf)
+        c_inf, c_past, c_part = grade_card(card, (user_inf, user_past, user_part))
 
     correct_count = int(c_inf) + int(c_past) + int(c_part)
 
     wrong_fields = []
     if not c_inf:
-        wrong_fields.append(("Infinitive", user_inf, inf))
+        wrong_fields.append(("Infinitive", user_inf, card.inf))
     if not c_past:
-        wrong_fields.append(("Simple Past", user_past, past))
+        wrong_fields.append(("Simple Past", user_past, card.past))
     if not c_part:
-        wrong_fields.append(("Past Participle", user_part, part))
+        wrong_fields.append(("Past Participle", user_part, card.part))
 
     print(f"Time: {format_mmss(duration)} | Correct: {correct_count}/3")
+    if card is not v:
+        print(f"  (accepted as {card.display} = {card.german})")
 
-    log_lines.append(f"Your answers: inf='{user_inf}', past='{user_past}', part='{user_part}'\n")
-    log_lines.append(f"Correct:      inf='{inf}', past='{past}', part='{part}'\n")
-    log_lines.append(f"Result: {correct_count}/3 | Time: {duration:.2f}s ({format_mmss(duration)})\n")
+    log.append(f"Your answers: inf='{user_inf}', past='{user_past}', part='{user_part}'\n")
+    log.append(f"Correct:      inf='{card.inf}', past='{card.past}', part='{card.part}'\n")
+    log.append(f"Result: {correct_count}/3 | Time: {duration:.2f}s ({format_mmss(duration)})\n")
 
     if wrong_fields:
+        metrics.incr("prompts_wrong")
+        notes = near_miss_notes(card, wrong_fields) if NEAR_MISS else {}
+        for field, note in notes.items():
+            print(f"  {field}: {note}")
         print("Correct forms:")
-        print(f"  {inf} | {past} | {part}")
-        log_lines.append("Mistakes:\n")
+        print(f"  {card.display}")
+        log.append("Mistakes:\n")
         for field, u, corr in wrong_fields:
-            log_lines.append(f"  - {field}: user='{u}' -> correct='{corr}'\n")
+            note = f" ({notes[field]})" if field in notes else ""
+            log.append(f"  - {field}: user='{u}' -> correct='{corr}'{note}\n")
 
-    log_lines.append("\n")
-    return correct_count, duration, wrong_fields
+    log.append("\n")
+    return correct_count, duration, wrong_fields, card
 
 
-def main():
-    print("\nIrregular Verbs Trainer")
-    print("------------------------")
-    print("You will see the German base meaning.")
-    print("Enter the English infinitive, simple past, and past participle.")
-    print("Typing spaces is blocked (beep) unless the correct answer needs spaces (e.g., 'wake up').")
-    print("Backspace works normally.\n")
+def drill_steps(
+    v: Card, log: LogSink
+) -> Generator[ReadRequest, str, Tuple[int, float, List[Tuple[str, str, str]], Card]]:
+    """ask_one_steps() for the reverse drill modes; same result, scored on the same 0-3 scale."""
+    from drill_modes import FIELD_LABELS, GERMAN, field_score, grade, make_prompt
 
-    N = 20
+    prompt = make_prompt(TABLE, v, DRILL)
+    print(prompt.label())
+    log.append(f"{prompt.label()}\n")
 
-    # Paths
-    base_dir = Path.home() / "irregular_verbs_logs"
-    base_dir.mkdir(parents=True, exist_ok=True)
-    progress_path = base_dir / "progress.json"
-    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    session_log_path = base_dir / f"session_{timestamp}.txt"
+    take_field_times()
+    start = time.time()
+    answers = []
+    for field, expected in zip(prompt.ask, prompt.expected):
+        answers.append((yield (f"{FIELD_LABELS[field]}: ", prompt.allow_space(field), expected)))
+    duration = answer_duration(start, len(answers), log)
+
+    metrics.incr("prompts")
+    with metrics.span("grade"):
+        oks, card = grade(TABLE, prompt, answers)
+    correct_count = field_score(prompt, oks)
+    wrong_fields = [
+        (FIELD_LABELS[field], answer, card.german if field == GERMAN else card.forms[field])
+        for field, answer, ok in zip(prompt.ask, answers, oks)
+        if not ok
+    ]
+
+    print(f"Time: {format_mmss(duration)} | Correct: {correct_count}/3")
+    if card is not v:
+        # Right for another verb that shares what was shown.
+        print(f"  (accepted as {card.display} = {card.german})")
 
-    # Load progress
-    progress = ensure_progress_shape(load_progress(progress_path))
+    given = ", ".join(f"{FIELD_LABELS[f]}='{a}'" for f, a in zip(prompt.ask, answers))
+    log.append(f"Your answers: {given}\n")
+    log.append(f"Correct:      {card.display} = {card.german}\n")
+    log.append(f"Result: {correct_count}/3 | Time: {duration:.2f}s ({format_mmss(duration)})\n")
+
+    if wrong_fields:
+        metrics.incr("prompts_wrong")
+        english = [w for w in wrong_fields if w[0] in FIELD_NAMES]
+        notes = near_miss_notes(card, english) if NEAR_MISS and english else {}
+        for field, note in notes.items():
+            print(f"  {field}: {note}")
+        print("Correct:")
+        print(f"  {card.display} = {card.german}")
+        log.append("Mistakes:\n")
+        for field, u, corr in wrong_fields:
+            note = f" ({notes[field]})" if field in notes else ""
+            log.append(f"  - {field}: user='{u}' -> correct='{corr}'{note}\n")
+
+    log.append("\n")
+    return correct_count, duration, wrong_fields, card
+
+
+@metrics.timed("grade.near_miss")
+def near_miss_notes(v: Card, wrong_fields: List[Tuple[str, str, str]]) -> Dict[str, str]:
+    """Field name -> "almost (1 typo: ...)" / "'bought' is the simple past of 'buy'" for wrong answers that deserve it."""
+    from near_miss import classify
+
+    notes = {}
+    for field, user, _ in wrong_fields:
+        verdict = classify(TABLE, v, FIELD_NAMES.index(field), user, NEAR_MISS)
+        if verdict.kind != "wrong":
+            notes[field] = verdict.describe(TABLE)
+    return notes
+
+
+@metrics.timed("select")
+def select_verbs(progress: Dict, N: int) -> List[Card]:
+    if SCHEDULE == "srs":
+        from scheduler import due_queue
+
+        # O(N log n) pops from the due-time heap; fewer than N only if the deck is smaller.
+        return due_queue(progress, TABLE).select(N, datetime.now().isoformat(timespec="seconds"))
+    return random.sample(TABLE.cards, N)
+
+
+def run_session(
+    progress: Union[Dict, BackgroundLoad],
+    progress_path: Path,
+    session_log_path: Path,
+    N: int = 20,
+    read: Reader = terminal_reader,
+    jsonl_log: bool = False,
+    archive: Optional["LogArchive"] = None,
+    keep_prompts: bool = False,
+) -> Dict:
+    """
+    Runs one full session (first round, repeat rounds, recap), records it
+    into progress and writes the session log and the progress journal.
+    With an `archive`, the finished log files are then moved into it.
 
-    # Show progress at start
-    if progress.get("sessions"):
-        print_progress_summary(progress)
-        print()
+    Returns a machine-readable result: the stored session record, plus one
+    entry per prompt with `keep_prompts` (headless runs; otherwise prompts
+    only go to the streamed log). `progress` may still be loading (BackgroundLoad).
+    """
+    jsonl_path = session_log_path.with_suffix(".jsonl") if jsonl_log else None
+    # The log is streamed while the session runs; leaving the block (also via Ctrl-C) flushes it.
+    with SessionLogWriter(session_log_path, jsonl_path) as log:
+        archived_to = archive.directory if archive is not None else None
+        result = drive(session_steps(progress, progress_path, session_log_path, log, N, keep_prompts, archived_to), read)
+    if archive is not None:
+        # Only a finished session is packed; an interrupted one stays a loose file for `log_archive.py migrate`.
+        archive.pack([p for p in (session_log_path, jsonl_path) if p is not None])
+    if isinstance(progress, BackgroundLoad):
+        progress = progress.result()
+    save_progress(progress_path, progress)
+    return result
+
+
+def session_steps(
+    progress: Union[Dict, BackgroundLoad],
+    progress_path: Path,
+    session_log_path: Path,
+    log: LogSink,
+    N: int = 20,
+    keep_prompts: bool = False,
+    archived_to: Optional[Path] = None,
+) -> Generator[ReadRequest, str, Dict]:
+    """
+    The quiz part of run_session: writes to `log` and records into `progress`, but does not save it.
+    `archived_to` is the log archive the caller packs the finished log into (the loose file is then gone).
+    """
+    # A history still loading in the background is only waited for once it is needed:
+    # right away for spaced repetition, otherwise after the first answer.
+    loader = progress if isinstance(progress, BackgroundLoad) else None
+    if loader is not None and SCHEDULE == "srs":
+        progress, loader = loader.result(), None
 
     # Prepare session
-    selected = random.sample(VERBS, N)
+    selected = select_verbs(progress, N)
+    N = len(selected)
 
     total_correct = 0
     total_questions = N * 3
     total_time_s = 0.0
 
-    wrong_verbs: List[Tuple[str, str, str, str]] = []
+    wrong_verbs: List[Card] = []
     mistakes_detail = []
 
-    log_lines: List[str] = []
-    log_lines.append("Irregular Verbs Trainer Session Log\n")
-    log_lines.append(f"Timestamp: {datetime.now().isoformat(timespec='seconds')}\n")
-    log_lines.append(f"Sample size: {N}\n")
-    log_lines.append("=" * 60 + "\n\n")
+    log.append("Irregular Verbs Trainer Session Log\n")
+    log.append(f"Timestamp: {datetime.now().isoformat(timespec='seconds')}\n")
+    log.append(f"Sample size: {N}\n")
+    log.append("=" * 60 + "\n\n")
 
     # Round 1
+    # Per-prompt records are streamed to the log; they are only kept in memory for the result if asked to.
+    prompts: Optional[List[Dict]] = [] if keep_prompts else None
     for idx, v in enumerate(selected, 1):
         print(f"\nVerb {idx}/{N}")
-        log_lines.append(f"Verb {idx}/{N}\n")
+        log.append(f"Verb {idx}/{N}\n")
 
-        correct_count, dur, wrong_fields = ask_one(v, log_lines)
+        correct_count, dur, wrong_fields, answered = yield from ask_one_steps(v, log)
+        if loader is not None:
+            progress, loader = loader.result(), None
         total_correct += correct_count
         total_time_s += dur
+        rec = prompt_result(0, answered, correct_count, dur, wrong_fields)
+        log.record(rec)
+        if prompts is not None:
+            prompts.append(rec)
 
-        update_per_verb(progress, v, correct_count, dur)
+        update_per_verb(progress, answered, correct_count, dur)
 
         if wrong_fields:
             wrong_verbs.append(v)
             mistakes_detail.append(
                 {
-                    "german": v[3],
-                    "inf": v[0],
-                    "past": v[1],
-                    "part": v[2],
+                    "german": answered.german,
+                    "inf": answered.inf,
+                    "past": answered.past,
+                    "part": answered.part,
                     "wrong_fields": wrong_fields,
                     "time_s": dur,
                 }
@@ -386,21 +431,25 @@ def main():
         print("\n" + "=" * 30)
         print(f"REPEAT ROUND {round_num}")
         print("=" * 30)
-        log_lines.append("=" * 60 + "\n")
-        log_lines.append(f"REPEAT ROUND {round_num}\n\n")
+        log.append("=" * 60 + "\n")
+        log.append(f"REPEAT ROUND {round_num}\n\n")
 
         random.shuffle(wrong_verbs)
         still_wrong = []
         for idx, v in enumerate(wrong_verbs, 1):
             print(f"\nRepeat {idx}/{len(wrong_verbs)}")
-            log_lines.append(f"Repeat {idx}/{len(wrong_verbs)}\n")
+            log.append(f"Repeat {idx}/{len(wrong_verbs)}\n")
 
-            correct_count, dur, wrong_fields = ask_one(v, log_lines)
+            correct_count, dur, wrong_fields, answered = yield from ask_one_steps(v, log)
             total_correct += correct_count
             total_questions += 3
             total_time_s += dur
+            rec = prompt_result(round_num, answered, correct_count, dur, wrong_fields)
+            log.record(rec)
+            if prompts is not None:
+                prompts.append(rec)
 
-            update_per_verb(progress, v, correct_count, dur)
+            update_per_verb(progress, answered, correct_count, dur)
 
             if wrong_fields:
                 still_wrong.append(v)
@@ -418,19 +467,25 @@ def main():
     print(f"Accuracy: {accuracy:.1f}%")
     print(f"Total time: {format_mmss(total_time_s)}")
     print(f"Average time per verb prompt: {format_mmss(avg_time_per_prompt)}")
-    print(f"Session log saved to: {session_log_path}")
+    if archived_to is None:
+        print(f"Session log saved to: {session_log_path}")
+    else:
+        from log_archive import timestamp_for
+
+        print(f"Session log archived in: {archived_to}")
+        print(f"  show it with: log_archive.py show {session_log_path.parent} {timestamp_for(session_log_path)}")
     print(f"Progress file: {progress_path}")
 
-    log_lines.append("\n" + "=" * 60 + "\n")
-    log_lines.append("FINAL RESULT\n")
-    log_lines.append(f"Total correct answers: {total_correct}/{total_questions}\n")
-    log_lines.append(f"Accuracy: {accuracy:.1f}%\n")
-    log_lines.append(f"Total time: {format_mmss(total_time_s)}\n")
-    log_lines.append(f"Average time per verb prompt: {format_mmss(avg_time_per_prompt)}\n")
+    log.append("\n" + "=" * 60 + "\n")
+    log.append("FINAL RESULT\n")
+    log.append(f"Total correct answers: {total_correct}/{total_questions}\n")
+    log.append(f"Accuracy: {accuracy:.1f}%\n")
+    log.append(f"Total time: {format_mmss(total_time_s)}\n")
+    log.append(f"Average time per verb prompt: {format_mmss(avg_time_per_prompt)}\n")
     if wrong_verbs:
-        log_lines.append(f"Still wrong after repetitions (max {max_rounds} rounds): {len(wrong_verbs)}\n")
+        log.append(f"Still wrong after repetitions (max {max_rounds} rounds): {len(wrong_verbs)}\n")
     else:
-        log_lines.append("All repeated verbs were answered correctly.\n")
+        log.append("All repeated verbs were answered correctly.\n")
 
     # Mistakes recap (first round)
     if mistakes_detail:
@@ -443,34 +498,253 @@ def main():
                 print(f"  {field}: you='{u}' -> correct='{corr}'")
             print(f"  Time: {format_mmss(m['time_s'])}\n")
 
-        log_lines.append("\nMISTAKES RECAP (first round)\n")
-        log_lines.append("-" * 60 + "\n")
+        log.append("\nMISTAKES RECAP (first round)\n")
+        log.append("-" * 60 + "\n")
         for m in mistakes_detail:
-            log_lines.append(f"German: {m['german']}\n")
-            log_lines.append(f"Correct: {m['inf']} | {m['past']} | {m['part']}\n")
+            log.append(f"German: {m['german']}\n")
+            log.append(f"Correct: {m['inf']} | {m['past']} | {m['part']}\n")
             for field, u, corr in m["wrong_fields"]:
-                log_lines.append(f"  {field}: user='{u}' -> correct='{corr}'\n")
-            log_lines.append(f"Time: {m['time_s']:.2f}s ({format_mmss(m['time_s'])})\n\n")
+                log.append(f"  {field}: user='{u}' -> correct='{corr}'\n")
+            log.append(f"Time: {m['time_s']:.2f}s ({format_mmss(m['time_s'])})\n\n")
     else:
         print("\nPerfect first round! No mistakes!")
-        log_lines.append("\nPerfect first round. No mistakes.\n")
-
-    # Store session into progress.json
-    progress["sessions"].append(
-        {
-            "timestamp": datetime.now().isoformat(timespec="seconds"),
-            "base_sample_size": N,
-            "total_questions": total_questions,
-            "total_correct": total_correct,
-            "accuracy_percent": round(accuracy, 2),
-            "total_time_s": float(total_time_s),
-            "total_time_mmss": format_mmss(total_time_s),
-        }
+        log.append("\nPerfect first round. No mistakes.\n")
+
+    # Store session into the progress journal
+    session = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "base_sample_size": N,
+        "total_questions": total_questions,
+        "total_correct": total_correct,
+        "accuracy_percent": round(accuracy, 2),
+        "total_time_s": float(total_time_s),
+        "total_time_mmss": format_mmss(total_time_s),
+    }
+    if loader is not None:
+        progress = loader.result()
+    record_session(progress, session)
+
+    result = {
+        "session": session,
+        "still_wrong": [v.inf for v in wrong_verbs],
+        "log": str(archived_to if archived_to is not None else session_log_path),
+    }
+    if prompts is not None:
+        result["prompts"] = prompts
+    return result
+
+
+def prompt_result(
+    round_num: int, v: Card, correct_count: int, duration: float, wrong_fields: List[Tuple[str, str, str]]
+) -> Dict:
+    return {
+        "round": round_num,
+        "key": v.key,
+        "correct": correct_count,
+        "time_s": round(duration, 6),
+        "wrong": {field: user for field, user, _ in wrong_fields},
+    }
+
+
+def prepare_sqlite_store(base_dir: Path) -> Path:
+    db_path = base_dir / "progress.sqlite"
+    json_path = base_dir / "progress.json"
+    if not db_path.exists() and (json_path.exists() or journal_path_for(json_path).exists()):
+        import progress_sqlite
+
+        sessions, verbs = progress_sqlite.import_json(json_path, db_path)
+        print(f"Imported {sessions} sessions and {verbs} verbs from {json_path} into {db_path}", file=sys.stderr)
+    return db_path
+
+
+def run_headless(
+    script: "AnswerScript",
+    progress_path: Path,
+    N: int,
+    sessions: int,
+    out,
+    jsonl_log: bool = False,
+    archive: Optional["LogArchive"] = None,
+) -> None:
+    """Runs sessions back to back from an answer script, one JSON line per session on `out`."""
+    import json
+
+    base_dir = progress_path.parent
+    progress = load_progress(progress_path)
+    read = script_reader(script)
+    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    # Keep the session's own prints off the terminal; only results go to `out`.
+    with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+        for i in range(1, sessions + 1):
+            session_log_path = base_dir / f"session_{timestamp}_{i:06d}.txt"
+            result = run_session(
+                progress, progress_path, session_log_path, N, read, jsonl_log, archive, keep_prompts=True
+            )
+            result["index"] = i
+            out.write(json.dumps(result, ensure_ascii=False) + "\n")
+    out.flush()
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Irregular Verbs Trainer")
+    parser.add_argument("--script", help="Run headless: read answers from this file ('-' for stdin)")
+    parser.add_argument("--seed", type=int, help="Seed the random verb selection")
+    parser.add_argument("--sessions", type=int, default=1, help="Headless: number of sessions to run")
+    parser.add_argument("--sample-size", type=int, default=20, help="Verbs per session")
+    parser.add_argument("--data-dir", type=Path, help="Directory for logs and progress (default: ~/irregular_verbs_logs)")
+    parser.add_argument(
+        "--jsonl-log", action="store_true", help="Also write a structured session_<timestamp>.jsonl next to the text log"
+    )
+    parser.add_argument(
+        "--archive-logs",
+        action="store_true",
+        help="Pack finished session logs into <data-dir>/logs.archive/ instead of keeping one file per session",
+    )
+    parser.add_argument(
+        "--store",
+        choices=("json", "sqlite"),
+        default="json",
+        help="Progress backend: progress.json + journal, or progress.sqlite (imports progress.json once)",
+    )
+    parser.add_argument("--deck", help="Deck file (.csv/.json) or name of an installed deck instead of the built-in verbs")
+    parser.add_argument(
+        "--schedule",
+        choices=("random", "srs"),
+        default=SCHEDULE,
+        help="Verb selection: random sample, or spaced repetition (due verbs first, then new ones)",
     )
+    parser.add_argument(
+        "--drill",
+        choices=("german", "form", "english"),
+        default=DRILL,
+        help="german: meaning -> three forms; form: one English form -> the other two; english: forms -> German meaning",
+    )
+    parser.add_argument(
+        "--near-miss",
+        type=int,
+        nargs="?",
+        const=2,
+        default=NEAR_MISS,
+        metavar="TYPOS",
+        help="Point out answers within TYPOS edits of the right form (default 2) or that are forms of another verb",
+    )
+    parser.add_argument(
+        "--quick-start",
+        action="store_true",
+        help="Show the first prompt right away; progress loads in the background and the summary is shown at the end",
+    )
+    parser.add_argument(
+        "--profile-startup", action="store_true", help="Print a breakdown of the time to the first prompt to stderr"
+    )
+    parser.add_argument(
+        "--metrics",
+        type=Path,
+        metavar="PATH",
+        help="Time grading, selection and persistence; write the histograms on exit (.prom/.txt: Prometheus text, else JSON)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    global TABLE, SCHEDULE, NEAR_MISS, DRILL
+    main_ns = time.perf_counter_ns()
+    profile = None
+    args = parse_args(argv)
+    if args.profile_startup:
+        from startup_profile import StartupProfile
+
+        profile = StartupProfile(STARTED_NS)
+        profile.marks.append(("imports + verb table", main_ns))
+        profile.mark("argument parsing")
+    if args.metrics:
+        import atexit
+
+        metrics.enable()
+        # atexit also covers Ctrl-C and errors, so a partial session still leaves its numbers.
+        atexit.register(metrics.write_snapshot, args.metrics)
+    SCHEDULE = args.schedule
+    DRILL = args.drill
+    if args.deck:
+        from decks import DeckError, load_deck_arg
 
-    # Save files
-    session_log_path.write_text("".join(log_lines), encoding="utf-8")
-    save_progress(progress_path, progress)
+        try:
+            TABLE = load_deck_arg(args.deck)
+        except DeckError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 2
+        if profile:
+            profile.mark(f"deck loaded ({len(TABLE)} verbs)")
+    if args.seed is not None:
+        random.seed(args.seed)
+    NEAR_MISS = args.near_miss
+    if NEAR_MISS and not args.script:
+        from near_miss import prebuild
+
+        prebuild(TABLE)
+
+    N = args.sample_size
+
+    # Paths
+    base_dir = args.data_dir or Path.home() / "irregular_verbs_logs"
+    base_dir.mkdir(parents=True, exist_ok=True)
+    progress_path = base_dir / "progress.json"
+    if args.store == "sqlite":
+        progress_path = prepare_sqlite_store(base_dir)
+
+    archive = None
+    if args.archive_logs:
+        from log_archive import LogArchive, archive_dir_for
+
+        archive = LogArchive(archive_dir_for(base_dir))
+
+    if args.script:
+        from answer_script import AnswerScript
+
+        script = AnswerScript.open(args.script)
+        try:
+            run_headless(script, progress_path, N, args.sessions, sys.stdout, args.jsonl_log, archive)
+        finally:
+            script.close()
+        return
+
+    print("\nIrregular Verbs Trainer")
+    print("------------------------")
+    print("You will see the German base meaning.")
+    print("Enter the English infinitive, simple past, and past participle.")
+    print("Typing spaces is blocked (beep) unless the correct answer needs spaces (e.g., 'wake up').")
+    print("Backspace works normally.\n")
+
+    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    session_log_path = base_dir / f"session_{timestamp}.txt"
+
+    read = terminal_reader
+    if profile:
+        read = profile.wrap_reader(read)
+
+    if args.quick_start:
+        # History (and the summary) stay off the path to the first prompt.
+        on_done = (lambda: profile.mark("progress loaded (background)")) if profile else None
+        progress = BackgroundLoad(progress_path, on_done)
+    else:
+        # Load progress
+        progress = ensure_progress_shape(load_progress(progress_path))
+        if profile:
+            profile.mark("progress loaded")
+
+        # Show progress at start
+        if progress["totals"]["sessions"]:
+            print_progress_summary(progress)
+            print()
+            if profile:
+                profile.mark("progress summary shown")
+
+    try:
+        run_session(progress, progress_path, session_log_path, N, read, args.jsonl_log, archive)
+    finally:
+        if profile:
+            profile.report()
+    if isinstance(progress, BackgroundLoad):
+        progress = progress.result()
 
     # Show updated progress
     print("\n")
@@ -478,4 +752,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    raise SystemExit(main())
@@ -0,0 +1,201 @@
+import array
+import codecs
+import os
+import select
+import sys
+import time
+from typing import List, NamedTuple, Tuple
+
+import metrics
+
+try:
+    import termios
+    import tty
+except ImportError:  # Windows: line input only
+    termios = tty = None
+
+# =========================
+# Keystroke input
+# =========================
+# At a terminal, answers are read key by key in cbreak mode: keys are echoed by
+# us, spaces are refused with a beep unless the field allows them, backspace
+# erases, arrow keys and other control keys are ignored. Every keystroke is
+# timestamped (perf_counter_ns) into a preallocated ring buffer, and each
+# field's timing is read back from the ring: the time until the first key
+# ("think") and from there to Enter ("typing"). Without a terminal (pipes,
+# files) a plain line is read instead.
+
+# Keystroke kinds in the ring.
+KEY, ERASE, REJECTED, ENTER = range(4)
+RING_SIZE = 4096  # Keystrokes kept; a power of two, more than one field takes
+ESC_TIMEOUT_S = 0.05  # Esc with nothing after it within this time is a lone Esc key
+
+_ENTER = (b"\r", b"\n")
+_ERASE = (b"\x7f", b"\x08")
+_EOF = b"\x04"
+_ESC = b"\x1b"
+
+
+def beep() -> None:
+    # Terminal bell (works in many terminals)
+    sys.stdout.write("\a")
+    sys.stdout.flush()
+
+
+class KeyRing:
+    """The last `size` keystrokes as (perf_counter_ns, kind), in arrays allocated once."""
+
+    __slots__ = ("ns", "kinds", "count", "_mask")
+
+    def __init__(self, size: int = RING_SIZE) -> None:
+        if size & (size - 1):
+            raise ValueError("ring size must be a power of two")
+        self.ns = array.array("q", bytes(8 * size))
+        self.kinds = array.array("b", bytes(size))
+        self.count = 0  # Keystrokes recorded so far; position of the next one
+        self._mask = size - 1
+
+    def record(self, kind: int) -> int:
+        i = self.count & self._mask
+        t = self.ns[i] = time.perf_counter_ns()
+        self.kinds[i] = kind
+        self.count += 1
+        return t
+
+    def events(self, since: int = 0) -> List[Tuple[int, int]]:
+        """(ns, kind) of keystrokes from position `since` on, as far as they are still kept."""
+        start = max(since, self.count - len(self.ns))
+        return [(self.ns[p & self._mask], self.kinds[p & self._mask]) for p in range(start, self.count)]
+
+    def timing(self, since: int, shown_ns: int, enter_ns: int) -> "FieldTiming":
+        """The timing of a field shown at `shown_ns` whose keystrokes start at position `since`."""
+        events = self.events(since)
+        kinds = [kind for _, kind in events]
+        first_key_ns = events[0][0] if events else enter_ns
+        return FieldTiming(
+            shown_ns, first_key_ns, enter_ns, kinds.count(KEY), kinds.count(ERASE), kinds.count(REJECTED)
+        )
+
+
+RING = KeyRing()
+
+
+class FieldTiming(NamedTuple):
+    shown_ns: int
+    first_key_ns: int
+    enter_ns: int
+    keys: int
+    erased: int
+    rejected: int
+
+    @property
+    def think_s(self) -> float:
+        return (self.first_key_ns - self.shown_ns) / 1e9
+
+    @property
+    def typing_s(self) -> float:
+        return (self.enter_ns - self.first_key_ns) / 1e9
+
+    @property
+    def total_s(self) -> float:
+        return (self.enter_ns - self.shown_ns) / 1e9
+
+
+# Timings of the fields read since the last take_field_times().
+_fields: List[FieldTiming] = []
+
+
+def take_field_times() -> List[FieldTiming]:
+    taken = _fields[:]
+    _fields.clear()
+    return taken
+
+
+def is_terminal() -> bool:
+    return termios is not None and sys.stdin.isatty()
+
+
+def read_field(prompt: str, allow_space: bool, ring: KeyRing = RING) -> str:
+    """One answer, keystroke by keystroke at a terminal (its timing goes to take_field_times())."""
+    if not is_terminal():
+        return _read_line(prompt, allow_space)
+
+    fd = sys.stdin.fileno()
+    saved = termios.tcgetattr(fd)
+    decode = codecs.getincrementaldecoder("utf-8")("replace").decode
+    chars: List[str] = []
+    out = sys.stdout
+    out.write(prompt)
+    out.flush()
+    since = ring.count
+    shown_ns = time.perf_counter_ns()
+    try:
+        tty.setcbreak(fd)
+        while True:
+            b = os.read(fd, 1)
+            if not b or (b == _EOF and not chars):
+                enter_ns = time.perf_counter_ns()
+                break
+            if b in _ENTER:
+                enter_ns = ring.record(ENTER)
+                break
+            if b in _ERASE:
+                ring.record(ERASE)
+                if chars:
+                    chars.pop()
+                    out.write("\b \b")
+                    out.flush()
+            elif b == _ESC or b[0] < 0x20:
+                ring.record(REJECTED)
+                if b == _ESC:
+                    _skip_escape_sequence(fd)
+            else:
+                ch = decode(b)
+                if not ch:
+                    continue  # Rest of a multi-byte character still to come
+                if ch == " " and not allow_space:
+                    ring.record(REJECTED)
+                    beep()
+                else:
+                    ring.record(KEY)
+                    chars.append(ch)
+                    out.write(ch)
+                    out.flush()
+    finally:
+        termios.tcsetattr(fd, termios.TCSADRAIN, saved)
+    out.write("\n")
+    out.flush()
+
+    timing = ring.timing(since, shown_ns, enter_ns)
+    _fields.append(timing)
+    if metrics.ENABLED:
+        metrics.observe("input.think", timing.first_key_ns - shown_ns)
+        metrics.observe("input.typing", enter_ns - timing.first_key_ns)
+    return "".join(chars).strip()
+
+
+def _has_input(fd: int) -> bool:
+    return bool(select.select([fd], [], [], ESC_TIMEOUT_S)[0])
+
+
+def _skip_escape_sequence(fd: int) -> None:
+    # ESC [ ... final byte (arrow keys, Home, Delete, ...): swallow the rest.
+    # A lone Esc has nothing after it; do not wait for (and eat) the next key.
+    if not _has_input(fd):
+        return
+    b = os.read(fd, 1)
+    if b not in (b"[", b"O"):
+        return
+    while _has_input(fd):
+        b = os.read(fd, 1)
+        if not b or 0x40 <= b[0] <= 0x7E:
+            return
+
+
+def _read_line(prompt: str, allow_space: bool) -> str:
+    sys.stdout.write(prompt)
+    sys.stdout.flush()
+    user_input = sys.stdin.readline().rstrip("\n")
+    if not allow_space:
+        user_input = user_input.replace(" ", "")
+    return user_input.strip()
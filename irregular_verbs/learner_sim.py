@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Monte Carlo learner simulator for tuning verb selection (requires NumPy).
+
+    python learner_sim.py                                   # current settings and a small grid around them
+    python learner_sim.py --weight-per-wrong 0,0.75,1.5,3 --sample-size 10,20,30 --learners 5000
+    python learner_sim.py --deck phrasal --max-rounds 0,1,3 --json sim.json
+
+Each synthetic learner has a forgetting curve per verb: the chance to recall
+a verb is exp(-days since last review / stability). A fully right answer
+multiplies the stability by the learner's growth rate; a wrong one cuts it to
+LAPSE_FACTOR of what it was, but not below the verb's initial stability (the
+learner has just seen the right forms). Each field of an answer is right with probability recall ** (1/3), so the
+whole verb is right with probability `recall`.
+
+Every day the learner does one session like irregular_verbs.py: N verbs, then
+up to max_rounds repeat rounds of the verbs answered wrong. The N verbs are a
+weighted sample without replacement using teacher.py's weights
+(MIN_WEIGHT + WEIGHT_PER_WRONG * mistakes), so --weight-per-wrong 0 is the
+uniform sample of irregular_verbs.py. A learner has mastered the deck on the
+first day the mean recall over all verbs before the session (the expected
+score of a test on the whole deck) is at least MASTERY_RECALL; time to mastery
+is reported in days and in study minutes (prompts answered until then x
+SECONDS_PER_PROMPT).
+
+All learners of a parameter set are simulated as arrays (learners x verbs),
+one day at a time; chunks of learners run on a process pool.
+"""
+
+import argparse
+import itertools
+import json
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - reported by main()
+    np = None
+
+import teacher
+
+# ---------------- Learner model ----------------
+INITIAL_STABILITY_DAYS = 0.5   # Median stability right after first seeing a verb ...
+DIFFICULTY_SPREAD = 0.6        # ... log-normal spread over verbs and learners
+GROWTH = 2.5                   # Median stability factor per fully right answer ...
+GROWTH_SPREAD = 0.25           # ... log-normal spread over learners
+LAPSE_FACTOR = 0.3             # Stability kept after a wrong answer
+PRIOR_KNOWN = 0.3              # Share of verbs a learner already knows on day 0
+REPEAT_GAP_DAYS = 5 / 1440     # Time between a mistake and its repetition in the same session
+MASTERY_RECALL = 0.9
+SECONDS_PER_PROMPT = 15.0
+
+LEARNERS = 2000
+MAX_SESSIONS = 365
+CHUNK_LEARNERS = 500
+
+
+class Params(NamedTuple):
+    min_weight: float
+    weight_per_wrong: float
+    sample_size: int
+    max_rounds: int
+
+
+# The settings the trainers use today.
+CURRENT = Params(teacher.MIN_WEIGHT, teacher.WEIGHT_PER_WRONG, 20, 3)
+
+
+def recall_probability(stability: "np.ndarray", gap_days: "np.ndarray") -> "np.ndarray":
+    """exp(-gap / stability); 0 for verbs never learned (stability 0)."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(stability > 0, np.exp(-gap_days / np.maximum(stability, 1e-12)), 0.0)
+
+
+# =========================
+# Simulation (worker processes)
+# =========================
+def simulate(
+    params: Params, learners: int, verbs: int, max_sessions: int, seed: "np.random.SeedSequence"
+) -> Tuple["np.ndarray", "np.ndarray", int]:
+    """
+    Simulates `learners` learners until mastery or `max_sessions` days.
+    Returns (day of mastery per learner, -1 if never; prompts answered until
+    then; sessions simulated).
+    """
+    rng = np.random.default_rng(seed)
+    n = min(params.sample_size, verbs)
+    growth = rng.lognormal(math.log(GROWTH), GROWTH_SPREAD, size=(learners, 1))
+    initial = rng.lognormal(math.log(INITIAL_STABILITY_DAYS), DIFFICULTY_SPREAD, size=(learners, verbs))
+    known = rng.random((learners, verbs)) < PRIOR_KNOWN
+    # Verbs known before day 0 were last reviewed a while ago, with a few reviews' worth of stability.
+    stability = np.where(known, initial * growth ** rng.integers(2, 6, size=(learners, verbs)), 0.0)
+    last = np.where(known, -rng.uniform(1.0, 30.0, size=(learners, verbs)), 0.0)
+    wrong = np.zeros((learners, verbs), dtype=np.int64)
+    prompts = np.zeros(learners, dtype=np.int64)
+    mastered_at = np.full(learners, -1, dtype=np.int64)
+    prompts_until = np.zeros(learners, dtype=np.int64)
+    active = np.arange(learners)
+    sessions = 0
+
+    for day in range(max_sessions):
+        recall = recall_probability(stability[active], day - last[active])
+        done = recall.mean(axis=1) >= MASTERY_RECALL
+        mastered_at[active[done]] = day
+        prompts_until[active[done]] = prompts[active[done]]
+        active = active[~done]
+        if not active.size:
+            break
+        sessions += active.size
+
+        # Weighted sample without replacement (Efraimidis-Spirakis): the n largest u ** (1 / w).
+        weights = params.min_weight + params.weight_per_wrong * wrong[active]
+        keys = np.log(rng.random((active.size, verbs))) / weights
+        rows = active[:, None]
+        chosen = np.argpartition(-keys, n - 1, axis=1)[:, :n]
+
+        st = stability[rows, chosen]
+        gap = day - last[rows, chosen]
+        pending = np.ones(chosen.shape, dtype=bool)
+        for round_num in range(params.max_rounds + 1):
+            if round_num:
+                gap = np.full(chosen.shape, REPEAT_GAP_DAYS)
+            field_p = recall_probability(st, gap) ** (1 / 3)
+            ok = rng.binomial(3, field_p) == 3
+            first = initial[rows, chosen]
+            after = np.where(ok, np.where(st > 0, st * growth[rows, 0], first), np.maximum(st * LAPSE_FACTOR, first))
+            st = np.where(pending, after, st)
+            prompts[active] += pending.sum(axis=1)
+            wrong[rows, chosen] += pending & ~ok
+            pending &= ~ok
+            if not pending.any():
+                break
+        stability[rows, chosen] = st
+        last[rows, chosen] = day
+    return mastered_at, prompts_until, sessions
+
+
+def _run_chunk(task: Tuple[Params, int, int, int, "np.random.SeedSequence"]) -> Tuple[Params, "np.ndarray", "np.ndarray", int]:
+    params, learners, verbs, max_sessions, seed = task
+    return (params,) + simulate(params, learners, verbs, max_sessions, seed)
+
+
+def run_grid(
+    grid: List[Params],
+    learners: int = LEARNERS,
+    verbs: int = 0,
+    max_sessions: int = MAX_SESSIONS,
+    workers: Optional[int] = None,
+    seed: int = 0,
+    chunk_learners: int = CHUNK_LEARNERS,
+) -> List[Dict]:
+    """One result row per parameter set, fastest median time to mastery first."""
+    tasks = []
+    for params in grid:
+        for start in range(0, learners, chunk_learners):
+            tasks.append((params, min(chunk_learners, learners - start), verbs, max_sessions))
+    seeds = np.random.SeedSequence(seed).spawn(len(tasks))
+    tasks = [t + (s,) for t, s in zip(tasks, seeds)]
+    if workers == 1 or len(tasks) <= 1:
+        results = [_run_chunk(t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_run_chunk, tasks))
+
+    by_params: Dict[Params, List] = {p: [[], [], 0] for p in grid}
+    for params, mastered_at, prompts_until, sessions in results:
+        acc = by_params[params]
+        acc[0].append(mastered_at)
+        acc[1].append(prompts_until)
+        acc[2] += sessions
+    rows = [summarize(p, *acc) for p, acc in by_params.items()]
+    return sorted(rows, key=lambda r: (_last_if_none(r["median_days"]), _last_if_none(r["median_minutes"]), -r["mastered_percent"]))
+
+
+def _last_if_none(v: Optional[float]) -> float:
+    return math.inf if v is None else v
+
+
+def summarize(params: Params, mastered_parts: List, prompt_parts: List, sessions: int) -> Dict:
+    mastered_at = np.concatenate(mastered_parts)
+    prompts = np.concatenate(prompt_parts)
+    ok = mastered_at >= 0
+    # Learners who never got there count as infinitely slow, so medians stay honest.
+    days = np.where(ok, mastered_at, np.inf)
+    minutes = np.where(ok, prompts * SECONDS_PER_PROMPT / 60.0, np.inf)
+
+    def q(a: "np.ndarray", p: float) -> Optional[float]:
+        # None: more than 1 - p of the learners never got there.
+        v = float(np.quantile(a, p, method="inverted_cdf"))
+        return round(v, 1) if math.isfinite(v) else None
+
+    return {
+        **params._asdict(),
+        "learners": int(mastered_at.size),
+        "sessions": int(sessions),
+        "mastered_percent": round(float(ok.mean()) * 100.0, 1),
+        "median_days": q(days, 0.5),
+        "p90_days": q(days, 0.9),
+        "median_minutes": q(minutes, 0.5),
+        "p90_minutes": q(minutes, 0.9),
+        "current": params == CURRENT,
+    }
+
+
+# =========================
+# CLI
+# =========================
+def _floats(text: str) -> List[float]:
+    return [float(x) for x in text.split(",") if x.strip()]
+
+
+def _ints(text: str) -> List[int]:
+    return [int(x) for x in text.split(",") if x.strip()]
+
+
+def _fmt(v) -> str:
+    return "-" if v is None else f"{v:g}"
+
+
+def print_results(rows: List[Dict], max_sessions: int) -> None:
+    total = sum(r["sessions"] for r in rows)
+    print(f"Simulated {total:,} sessions ({rows[0]['learners'] if rows else 0} learners per setting, up to {max_sessions} days)")
+    print(f"{'min_w':>6} {'w/wrong':>7} {'N':>4} {'rounds':>6}  {'mastered':>8}  {'days p50':>8} {'p90':>5}  {'min p50':>8} {'p90':>6}")
+    for r in rows:
+        mark = "  <- current" if r["current"] else ""
+        print(
+            f"{r['min_weight']:>6g} {r['weight_per_wrong']:>7g} {r['sample_size']:>4} {r['max_rounds']:>6}  "
+            f"{r['mastered_percent']:>7.1f}%  {_fmt(r['median_days']):>8} {_fmt(r['p90_days']):>5}  "
+            f"{_fmt(r['median_minutes']):>8} {_fmt(r['p90_minutes']):>6}{mark}"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Simulate learners to compare verb selection settings")
+    parser.add_argument("--min-weight", type=_floats, default=[CURRENT.min_weight], help="Comma-separated MIN_WEIGHT values")
+    parser.add_argument(
+        "--weight-per-wrong", type=_floats, default=[0.0, CURRENT.weight_per_wrong, 1.5], help="Comma-separated WEIGHT_PER_WRONG values"
+    )
+    parser.add_argument("--sample-size", type=_ints, default=[10, CURRENT.sample_size, 30], help="Comma-separated session sizes N")
+    parser.add_argument("--max-rounds", type=_ints, default=[0, CURRENT.max_rounds], help="Comma-separated repeat round limits")
+    parser.add_argument("--learners", type=int, default=LEARNERS, help="Simulated learners per setting")
+    parser.add_argument("--max-sessions", type=int, default=MAX_SESSIONS, help="Days (one session each) before giving up")
+    parser.add_argument("--deck", help="Deck file or installed deck name (only its size matters)")
+    parser.add_argument("--verbs", type=int, help="Number of verbs instead of a deck")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes (1 = in-process)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", type=Path, help="Also write the results as JSON")
+    args = parser.parse_args(argv)
+
+    if np is None:
+        print("Error: learner_sim.py requires NumPy (pip install numpy)", file=sys.stderr)
+        return 2
+
+    verbs = args.verbs
+    if verbs is None:
+        table = teacher.TABLE
+        if args.deck:
+            from decks import DeckError, load_deck_arg
+
+            try:
+                table = load_deck_arg(args.deck)
+            except DeckError as e:
+                print(f"Error: {e}", file=sys.stderr)
+                return 2
+        verbs = len(table.rows)
+    grid = [Params(*p) for p in itertools.product(args.min_weight, args.weight_per_wrong, args.sample_size, args.max_rounds)]
+    if verbs < 1 or any(p.min_weight <= 0 or p.weight_per_wrong < 0 or p.sample_size < 1 or p.max_rounds < 0 for p in grid):
+        print("Error: need at least one verb, MIN_WEIGHT > 0, WEIGHT_PER_WRONG >= 0, N >= 1, rounds >= 0", file=sys.stderr)
+        return 2
+
+    rows = run_grid(grid, args.learners, verbs, args.max_sessions, args.workers, args.seed)
+    print_results(rows, args.max_sessions)
+    if args.json:
+        doc = {"verbs": verbs, "max_sessions": args.max_sessions, "results": rows}
+        args.json.write_text(json.dumps(doc, indent=2), encoding="utf-8")
+        print(f"\nResults written to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
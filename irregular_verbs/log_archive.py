@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Packed session-log archive.
+
+    python log_archive.py migrate ~/irregular_verbs_logs   # fold session_*.txt/.jsonl into the archive
+    python log_archive.py list ~/irregular_verbs_logs 2024-05
+    python log_archive.py show ~/irregular_verbs_logs 2024-05-01
+
+Instead of one small file per session, logs are appended to a few large
+segment files under <logs>/logs.archive/, each log compressed with zlib on
+its own, so a single session can be read back without touching the rest.
+index.tsv lists every log by timestamp (segment, offset, sizes); lookups
+binary-search it by timestamp prefix, e.g. "2024-05-01" or "2024-05-01T14".
+"""
+
+import argparse
+import bisect
+import os
+import re
+import struct
+import sys
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, List, NamedTuple, Optional
+
+ARCHIVE_DIR = "logs.archive"
+INDEX_NAME = "index.tsv"
+# A segment is closed once it grows past this size; the next log starts a new one.
+SEGMENT_BYTES = 16 * 1024 * 1024
+COMPRESS_LEVEL = 6
+LOG_SUFFIXES = (".txt", ".jsonl")
+
+# Every record is self-describing, so the index can be rebuilt from the segments:
+# magic, compressed size, raw size, label size (all big-endian), label
+# ("<timestamp>\t<file name>"), zlib data.
+RECORD_MAGIC = b"IVLG"
+RECORD_HEADER = struct.Struct(">4sIIH")
+
+# session_2024-05-01_14-03-59.txt, session_2024-05-01_14-03-59_000001.txt (headless)
+SESSION_NAME_RE = re.compile(r"^session_(\d{4}-\d{2}-\d{2})_(\d{2})-(\d{2})-(\d{2})")
+
+
+class ArchiveError(ValueError):
+    pass
+
+
+class Entry(NamedTuple):
+    timestamp: str
+    name: str
+    segment: str
+    offset: int
+    size: int
+    raw_size: int
+
+
+def archive_dir_for(base_dir: Path) -> Path:
+    return base_dir / ARCHIVE_DIR
+
+
+def timestamp_for(path: Path) -> str:
+    """ISO timestamp of a session log, from its name (or its mtime for other files)."""
+    m = SESSION_NAME_RE.match(path.name)
+    if m:
+        date, hh, mm, ss = m.groups()
+        return f"{date}T{hh}:{mm}:{ss}"
+    return datetime.fromtimestamp(path.stat().st_mtime).isoformat(timespec="seconds")
+
+
+class LogArchive:
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self.index_path = directory / INDEX_NAME
+        self._entries: Optional[List[Entry]] = None
+        self._keys: List[str] = []
+
+    # ---------- reading ----------
+    @property
+    def entries(self) -> List[Entry]:
+        """All logs sorted by timestamp (then name); the index is read once."""
+        if self._entries is None:
+            entries: List[Entry] = []
+            if self.index_path.exists():
+                sizes = {}
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        parts = line.rstrip("\n").split("\t")
+                        try:
+                            ts, name, segment, offset, size, raw_size = parts
+                            entry = Entry(ts, name, segment, int(offset), int(size), int(raw_size))
+                        except ValueError:
+                            continue  # torn line left by a crash
+                        if segment not in sizes:
+                            p = self.directory / segment
+                            sizes[segment] = p.stat().st_size if p.exists() else 0
+                        if entry.offset + entry.size <= sizes[segment]:
+                            entries.append(entry)
+            # Appends are chronological, so this is a nearly free check in the usual case.
+            entries.sort()
+            self._entries = entries
+            self._keys = [e.timestamp for e in entries]
+        return self._entries
+
+    def find(self, prefix: str = "") -> List[Entry]:
+        """Logs whose timestamp starts with `prefix` ("2024", "2024-05-01", "2024-05-01T14:03")."""
+        entries = self.entries
+        lo = bisect.bisect_left(self._keys, prefix)
+        hi = lo
+        while hi < len(entries) and entries[hi].timestamp.startswith(prefix):
+            hi += 1
+        return entries[lo:hi]
+
+    def read(self, entry: Entry) -> str:
+        with open(self.directory / entry.segment, "rb") as f:
+            f.seek(entry.offset)
+            data = f.read(entry.size)
+        return zlib.decompress(data).decode("utf-8")
+
+    # ---------- writing ----------
+    def _current_segment(self, incoming: int) -> Path:
+        segments = sorted(self.directory.glob("segment-*.pack"))
+        if segments and segments[-1].stat().st_size + incoming <= SEGMENT_BYTES:
+            return segments[-1]
+        number = int(segments[-1].stem.split("-")[1]) + 1 if segments else 1
+        return self.directory / f"segment-{number:06d}.pack"
+
+    def add_many(self, paths: List[Path]) -> List[Entry]:
+        """
+        Appends the files as one batch: segment data is fsynced before the
+        index lines are written, so a crash can leave unindexed bytes in a
+        segment (ignored) but never an index entry without its data.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        added: List[Entry] = []
+        lines: List[str] = []
+        seg_path: Optional[Path] = None
+        seg = None
+        try:
+            for path in paths:
+                raw = path.read_bytes()
+                data = zlib.compress(raw, COMPRESS_LEVEL)
+                ts = timestamp_for(path)
+                label = f"{ts}\t{path.name}".encode("utf-8")
+                record = RECORD_HEADER.pack(RECORD_MAGIC, len(data), len(raw), len(label)) + label
+                need = len(record) + len(data)
+                if seg is not None and seg.tell() and seg.tell() + need > SEGMENT_BYTES:
+                    seg.flush()
+                    os.fsync(seg.fileno())
+                    seg.close()
+                    seg = None
+                if seg is None:
+                    seg_path = self._current_segment(need)
+                    seg = open(seg_path, "ab")
+                offset = seg.tell() + len(record)
+                seg.write(record)
+                seg.write(data)
+                entry = Entry(ts, path.name, seg_path.name, offset, len(data), len(raw))
+                added.append(entry)
+                lines.append("\t".join(str(x) for x in entry) + "\n")
+            if seg is not None:
+                seg.flush()
+                os.fsync(seg.fileno())
+        finally:
+            if seg is not None:
+                seg.close()
+        with open(self.index_path, "a+b") as f:
+            # Never continue a torn last line.
+            end = f.seek(0, os.SEEK_END)
+            if end:
+                f.seek(end - 1)
+                if f.read(1) != b"\n":
+                    lines.insert(0, "\n")
+            f.write("".join(lines).encode("utf-8"))
+            f.flush()
+            os.fsync(f.fileno())
+        self._entries = None
+        return added
+
+    def add(self, path: Path) -> Entry:
+        return self.add_many([path])[0]
+
+    def pack(self, paths: List[Path]) -> List[Entry]:
+        """Moves logs into the archive: they are deleted only once their data and index entries are on disk."""
+        paths = [p for p in paths if p.exists()]
+        added = self.add_many(paths)
+        for p in paths:
+            p.unlink()
+        return added
+
+    def rebuild_index(self) -> int:
+        """Rewrites index.tsv from the segment files (e.g. after it was lost)."""
+        entries = sorted(self._scan())
+        tmp = self.index_path.with_suffix(".tsv.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write("".join("\t".join(str(x) for x in e) + "\n" for e in entries))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.index_path)
+        self._entries = None
+        return len(entries)
+
+    def _scan(self) -> Iterator[Entry]:
+        for seg_path in sorted(self.directory.glob("segment-*.pack")):
+            seg_size = seg_path.stat().st_size
+            with open(seg_path, "rb") as f:
+                while True:
+                    header = f.read(RECORD_HEADER.size)
+                    if len(header) < RECORD_HEADER.size:
+                        break
+                    magic, size, raw_size, label_size = RECORD_HEADER.unpack(header)
+                    if magic != RECORD_MAGIC:
+                        raise ArchiveError(f"{seg_path}: bad record at offset {f.tell() - len(header)}")
+                    ts, _, name = f.read(label_size).decode("utf-8").partition("\t")
+                    offset = f.tell()
+                    if offset + size > seg_size:
+                        break  # torn record at the end
+                    f.seek(size, os.SEEK_CUR)
+                    yield Entry(ts, name, seg_path.name, offset, size, raw_size)
+
+
+def session_logs(base_dir: Path) -> List[Path]:
+    """Loose session_*.txt / .jsonl files in `base_dir`, oldest first."""
+    paths = [p for p in base_dir.glob("session_*") if p.suffix in LOG_SUFFIXES and p.is_file()]
+    return sorted(paths, key=lambda p: (timestamp_for(p), p.name))
+
+
+def migrate(base_dir: Path, batch: int = 500) -> int:
+    archive = LogArchive(archive_dir_for(base_dir))
+    paths = session_logs(base_dir)
+    for i in range(0, len(paths), batch):
+        archive.pack(paths[i : i + batch])
+    return len(paths)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Packed session-log archive")
+    sub = parser.add_subparsers(dest="command", required=True)
+    default_dir = Path.home() / "irregular_verbs_logs"
+    p = sub.add_parser("migrate", help="Move loose session logs into the archive")
+    p.add_argument("dir", type=Path, nargs="?", default=default_dir)
+    p = sub.add_parser("list", help="List archived logs (optionally only those matching a timestamp prefix)")
+    p.add_argument("dir", type=Path, nargs="?", default=default_dir)
+    p.add_argument("prefix", nargs="?", default="")
+    p = sub.add_parser("show", help="Print the archived logs matching a timestamp prefix, e.g. 2024-05-01")
+    p.add_argument("dir", type=Path)
+    p.add_argument("prefix")
+    p = sub.add_parser("reindex", help="Rebuild index.tsv from the segment files")
+    p.add_argument("dir", type=Path, nargs="?", default=default_dir)
+    args = parser.parse_args(argv)
+
+    archive = LogArchive(archive_dir_for(args.dir))
+    if args.command == "migrate":
+        n = migrate(args.dir)
+        print(f"Archived {n} session logs into {archive.directory}")
+    elif args.command == "list":
+        for e in archive.find(args.prefix):
+            print(f"{e.timestamp}  {e.raw_size:>8}  {e.name}")
+    elif args.command == "show":
+        found = archive.find(args.prefix)
+        if not found:
+            print(f"No archived session logs match '{args.prefix}'", file=sys.stderr)
+            return 1
+        for e in found:
+            print(f"===== {e.name} =====")
+            print(archive.read(e), end="")
+    elif args.command == "reindex":
+        try:
+            n = archive.rebuild_index()
+        except ArchiveError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        print(f"Indexed {n} logs")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,182 @@
+import bisect
+import functools
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+# =========================
+# Hot-path instrumentation
+# =========================
+# Spans time a block with perf_counter_ns into a per-name histogram; counters
+# count events. Everything is off until enable() is called: span() then hands
+# out one shared no-op context manager and timed() functions just call through,
+# so a disabled build pays a function call and an attribute check per span.
+#
+#     with metrics.span("grade"):
+#         ...
+#
+#     @metrics.timed("progress.save")
+#     def save_progress(...): ...
+#
+# snapshot() / write_snapshot() export JSON or Prometheus text (by file suffix).
+ENABLED = False
+
+# Histogram bucket upper bounds (ns): 1 µs .. 10 s.
+BUCKET_BOUNDS_NS = (
+    1_000, 2_500, 5_000, 10_000, 25_000, 50_000, 100_000, 250_000, 500_000,
+    1_000_000, 2_500_000, 5_000_000, 10_000_000, 25_000_000, 50_000_000,
+    100_000_000, 250_000_000, 500_000_000, 1_000_000_000, 10_000_000_000,
+)
+PROMETHEUS_SUFFIXES = (".prom", ".txt")
+PREFIX = "irregular_verbs"
+
+_lock = threading.Lock()
+# name -> [count, sum_ns, min_ns, max_ns, per-bucket counts (last one = +Inf)]
+_spans: Dict[str, list] = {}
+_counters: Dict[str, int] = {}
+
+
+def enable() -> None:
+    global ENABLED
+    ENABLED = True
+
+
+def reset() -> None:
+    with _lock:
+        _spans.clear()
+        _counters.clear()
+
+
+def observe(name: str, elapsed_ns: int) -> None:
+    with _lock:
+        h = _spans.get(name)
+        if h is None:
+            h = _spans[name] = [0, 0, elapsed_ns, elapsed_ns, [0] * (len(BUCKET_BOUNDS_NS) + 1)]
+        h[0] += 1
+        h[1] += elapsed_ns
+        if elapsed_ns < h[2]:
+            h[2] = elapsed_ns
+        if elapsed_ns > h[3]:
+            h[3] = elapsed_ns
+        h[4][bisect.bisect_left(BUCKET_BOUNDS_NS, elapsed_ns)] += 1
+
+
+def incr(name: str, n: int = 1) -> None:
+    if ENABLED:
+        with _lock:
+            _counters[name] = _counters.get(name, 0) + n
+
+
+class _Span:
+    __slots__ = ("name", "started_ns")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __enter__(self) -> "_Span":
+        self.started_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        observe(self.name, time.perf_counter_ns() - self.started_ns)
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name: str):
+    return _Span(name) if ENABLED else _NULL_SPAN
+
+
+def timed(name: str):
+    """Decorator: times every call of the function as span `name` (checked per call, so enable() works later)."""
+
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return fn(*args, **kwargs)
+            started_ns = time.perf_counter_ns()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                observe(name, time.perf_counter_ns() - started_ns)
+
+        return wrapper
+
+    return decorate
+
+
+# =========================
+# Export
+# =========================
+def snapshot() -> Dict:
+    with _lock:
+        spans = {name: [h[0], h[1], h[2], h[3], list(h[4])] for name, h in _spans.items()}
+        counters = dict(_counters)
+    out = {"created": datetime.now().isoformat(timespec="seconds"), "pid": os.getpid(), "spans": {}, "counters": counters}
+    for name, (count, sum_ns, min_ns, max_ns, buckets) in sorted(spans.items()):
+        cumulative: List[int] = []
+        running = 0
+        for c in buckets:
+            running += c
+            cumulative.append(running)
+        out["spans"][name] = {
+            "count": count,
+            "sum_ns": sum_ns,
+            "min_ns": min_ns,
+            "max_ns": max_ns,
+            "mean_ns": sum_ns // count if count else 0,
+            # Cumulative counts per upper bound (ns), Prometheus style.
+            "buckets": {str(b): n for b, n in zip(BUCKET_BOUNDS_NS + ("+Inf",), cumulative)},
+        }
+    return out
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def to_prometheus(snap: Dict) -> str:
+    lines = [
+        f"# HELP {PREFIX}_span_seconds Time spent in instrumented code paths.",
+        f"# TYPE {PREFIX}_span_seconds histogram",
+    ]
+    for name, s in snap["spans"].items():
+        label = f'span="{_label(name)}"'
+        for bound, n in s["buckets"].items():
+            le = "+Inf" if bound == "+Inf" else repr(int(bound) / 1e9)
+            lines.append(f'{PREFIX}_span_seconds_bucket{{{label},le="{le}"}} {n}')
+        lines.append(f"{PREFIX}_span_seconds_sum{{{label}}} {s['sum_ns'] / 1e9!r}")
+        lines.append(f"{PREFIX}_span_seconds_count{{{label}}} {s['count']}")
+    lines.append(f"# HELP {PREFIX}_events_total Counted events.")
+    lines.append(f"# TYPE {PREFIX}_events_total counter")
+    for name, n in sorted(snap["counters"].items()):
+        lines.append(f'{PREFIX}_events_total{{name="{_label(name)}"}} {n}')
+    return "\n".join(lines) + "\n"
+
+
+def write_snapshot(path: Path) -> None:
+    """Writes the current snapshot atomically; .prom/.txt -> Prometheus text, anything else -> JSON."""
+    snap = snapshot()
+    if path.suffix in PROMETHEUS_SUFFIXES:
+        text = to_prometheus(snap)
+    else:
+        text = json.dumps(snap, indent=2)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
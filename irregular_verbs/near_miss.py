@@ -0,0 +1,171 @@
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from verb_table import FIELD_NAMES, Card, VerbTable, form_entries, normalize
+
+# =========================
+# Near-miss grading
+# =========================
+# Every accepted form of the deck (normalized like the answers) is kept in a dict,
+# for "is this exactly a form of another verb?", and in a trie, for "is this one
+# typo away from a form of another verb?". Typos of the expected answer itself are
+# measured against its few variants directly and may be up to max_distance edits.
+# Distance is Levenshtein plus adjacent transpositions ("brougth" -> "brought" = 1).
+DEFAULT_MAX_DISTANCE = 2
+# Deck-wide search radius: one edit keeps a trie lookup well under a millisecond
+# on 50,000-verb decks; two edits can touch a large part of the trie.
+OTHER_VERB_DISTANCE = 1
+
+# (card index, field) of every card that accepts a form.
+Entry = Tuple[int, int]
+
+
+class FormIndex:
+    __slots__ = ("table", "exact", "root")
+
+    def __init__(self, table: VerbTable) -> None:
+        self.table = table
+        self.exact: Dict[str, List[Entry]] = form_entries(table)
+        # Node = [children by character, form ending here or None].
+        self.root: list = [{}, None]
+        for form in self.exact:
+            self._insert(form)
+
+    def _insert(self, form: str) -> None:
+        node = self.root
+        for ch in form:
+            child = node[0].get(ch)
+            if child is None:
+                child = node[0][ch] = [{}, None]
+            node = child
+        node[1] = form
+
+    def within(self, word: str, max_distance: int) -> List[Tuple[int, str]]:
+        """
+        (distance, form) of every indexed form within max_distance edits of
+        `word`, closest first. The trie is followed along `word`; each edit
+        (extra, missing, wrong or swapped character) branches off once and
+        spends one unit of the budget, so with max_distance=1 a lookup visits
+        about len(word) * fan-out nodes however large the deck is.
+        """
+        best: Dict[str, int] = {}
+        n = len(word)
+        stack = [(self.root, 0, max_distance)]
+        visited = set()
+        while stack:
+            node, i, budget = stack.pop()
+            state = (id(node), i, budget)
+            if state in visited:
+                continue
+            visited.add(state)
+            children, form = node
+            if i == n and form is not None:
+                d = max_distance - budget
+                if best.get(form, d + 1) > d:
+                    best[form] = d
+            if i < n:
+                child = children.get(word[i])
+                if child is not None:
+                    stack.append((child, i + 1, budget))
+            if not budget:
+                continue
+            rest = budget - 1
+            if i < n:
+                stack.append((node, i + 1, rest))  # extra character typed
+            for ch, child in children.items():
+                stack.append((child, i, rest))  # character left out
+                if i < n and ch != word[i]:
+                    stack.append((child, i + 1, rest))  # wrong character
+            if i + 1 < n and word[i] != word[i + 1]:
+                swapped = children.get(word[i + 1])
+                if swapped is not None:
+                    child = swapped[0].get(word[i])
+                    if child is not None:
+                        stack.append((child, i + 2, rest))  # neighbours swapped
+        return sorted((d, form) for form, d in best.items())
+
+
+def distance(a: str, b: str) -> int:
+    """Levenshtein distance plus adjacent transpositions (optimal string alignment)."""
+    prev_prev: List[int] = []
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        row = [i]
+        for j in range(1, len(b) + 1):
+            d = min(row[j - 1] + 1, prev[j] + 1, prev[j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                d = min(d, prev_prev[j - 2] + 1)
+            row.append(d)
+        prev_prev, prev = prev, row
+    return prev[-1]
+
+
+class Verdict:
+    """
+    kind: "correct", "almost" (within max_distance of an accepted variant),
+    "other" (exactly a form of another verb or field), "near_other" (one
+    typo away from such a form) or "wrong".
+    """
+
+    __slots__ = ("kind", "distance", "form", "entries")
+
+    def __init__(self, kind: str, distance: Optional[int] = None, form: str = "", entries: List[Entry] = ()) -> None:
+        self.kind = kind
+        self.distance = distance
+        self.form = form
+        self.entries = list(entries)
+
+    def describe(self, table: VerbTable) -> str:
+        if self.kind == "correct":
+            # Only reachable from graders stricter than normalize() (teacher.py, case-sensitive).
+            return "only capitalization or spacing differs"
+        if self.kind == "almost":
+            typos = "1 typo" if self.distance == 1 else f"{self.distance} typos"
+            return f"almost ({typos}: '{self.form}')"
+        if self.kind in ("other", "near_other"):
+            owners = " / ".join(f"{FIELD_NAMES[f].lower()} of '{table.rows[i][0]}'" for i, f in self.entries[:3])
+            if self.kind == "other":
+                return f"'{self.form}' is the {owners}"
+            return f"close to '{self.form}', the {owners}"
+        return self.kind
+
+    def __repr__(self) -> str:
+        return f"Verdict({self.kind!r}, {self.distance!r}, {self.form!r})"
+
+
+_index: Optional[FormIndex] = None
+_index_lock = threading.Lock()
+
+
+def form_index(table: VerbTable) -> FormIndex:
+    """Built on first use (or by prebuild()) and kept for the current table only."""
+    global _index
+    with _index_lock:
+        if _index is None or _index.table is not table:
+            _index = FormIndex(table)
+        return _index
+
+
+def prebuild(table: VerbTable) -> None:
+    """Builds the index on a background thread, so a big deck does not stall the first wrong answer."""
+    threading.Thread(target=form_index, args=(table,), name="form-index", daemon=True).start()
+
+
+def classify(table: VerbTable, card: Card, field: int, answer: str, max_distance: int = DEFAULT_MAX_DISTANCE) -> Verdict:
+    u = normalize(answer)
+    if u in card.accepted[field]:
+        return Verdict("correct", 0, u)
+    if not u:
+        return Verdict("wrong")
+    index = form_index(table)
+    entries = index.exact.get(u)
+    if entries:
+        return Verdict("other", 0, u, entries)
+    # Short words get fewer typos: two edits turn "ran" into almost anything.
+    limit = min(max_distance, max(1, len(u) // 3))
+    d, form = min((distance(u, f), f) for f in card.accepted[field])
+    if d <= limit:
+        return Verdict("almost", d, form, [(card.index, field)])
+    for d, form in index.within(u, min(limit, OTHER_VERB_DISTANCE)):
+        return Verdict("near_other", d, form, index.exact[form])
+    return Verdict("wrong")
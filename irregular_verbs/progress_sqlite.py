@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SQLite backend for the progress store.
+
+Used automatically by progress_store.load_progress/save_progress when the
+progress path ends in .sqlite or .db. Each save writes the pending events
+of one session in a single transaction.
+
+    python progress_sqlite.py import ~/irregular_verbs_logs/progress.json ~/irregular_verbs_logs/progress.sqlite
+"""
+
+import argparse
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from progress_store import (
+    PENDING_KEY,
+    RECENT_WINDOW,
+    add_session_totals,
+    ensure_progress_shape,
+    new_totals,
+)
+from progress_store import load_progress as load_json_progress
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    base_sample_size INTEGER NOT NULL,
+    total_questions INTEGER NOT NULL,
+    total_correct INTEGER NOT NULL,
+    accuracy_percent REAL NOT NULL,
+    total_time_s REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_timestamp ON sessions(timestamp);
+
+CREATE TABLE IF NOT EXISTS verb_stats (
+    key TEXT PRIMARY KEY,
+    german TEXT NOT NULL,
+    infinitive TEXT NOT NULL,
+    times_asked INTEGER NOT NULL,
+    total_fields INTEGER NOT NULL,
+    total_correct_fields INTEGER NOT NULL,
+    total_time_s REAL NOT NULL,
+    last_seen TEXT,
+    reps INTEGER,
+    interval_days REAL,
+    ease REAL,
+    due TEXT
+);
+CREATE INDEX IF NOT EXISTS verb_stats_last_seen ON verb_stats(last_seen);
+
+CREATE TABLE IF NOT EXISTS answers (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL,
+    at TEXT NOT NULL,
+    correct INTEGER NOT NULL,
+    time_s REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS answers_key ON answers(key, at);
+CREATE INDEX IF NOT EXISTS answers_at ON answers(at);
+
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# Columns added after the first release; connect() adds them to older files.
+SCHEDULE_COLUMNS = (("reps", "INTEGER"), ("interval_days", "REAL"), ("ease", "REAL"), ("due", "TEXT"))
+
+UPSERT_VERB = """
+INSERT INTO verb_stats (key, german, infinitive, times_asked, total_fields, total_correct_fields, total_time_s, last_seen,
+                        reps, interval_days, ease, due)
+VALUES (?, ?, ?, 1, 3, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(key) DO UPDATE SET
+    times_asked = times_asked + 1,
+    total_fields = total_fields + 3,
+    total_correct_fields = total_correct_fields + excluded.total_correct_fields,
+    total_time_s = total_time_s + excluded.total_time_s,
+    last_seen = excluded.last_seen,
+    reps = excluded.reps,
+    interval_days = excluded.interval_days,
+    ease = excluded.ease,
+    due = excluded.due
+"""
+
+INSERT_SESSION = """
+INSERT INTO sessions (timestamp, base_sample_size, total_questions, total_correct, accuracy_percent, total_time_s)
+VALUES (:timestamp, :base_sample_size, :total_questions, :total_correct, :accuracy_percent, :total_time_s)
+"""
+
+
+def connect(db_path: Path, read_only: bool = False) -> sqlite3.Connection:
+    if read_only:
+        # Reports over learners' files: no schema setup, migration or journal-mode change.
+        return sqlite3.connect(f"{db_path.resolve().as_uri()}?mode=ro", uri=True)
+    conn = sqlite3.connect(str(db_path))
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(verb_stats)")}
+    for name, decl in SCHEDULE_COLUMNS:
+        if name not in existing:
+            conn.execute(f"ALTER TABLE verb_stats ADD COLUMN {name} {decl}")
+    conn.execute("CREATE INDEX IF NOT EXISTS verb_stats_due ON verb_stats(due)")
+    return conn
+
+
+def load_progress(db_path: Path, read_only: bool = False) -> Dict:
+    """
+    Builds the usual progress dict from aggregate queries. progress["sessions"]
+    starts empty (history stays in the database); totals, the recent window
+    and per-verb stats are complete. `read_only` leaves the file untouched
+    (files from before the schedule columns then read them as NULL).
+    """
+    with connect(db_path, read_only) as conn:
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(verb_stats)")}
+        schedule = ", ".join(name if name in existing else "NULL" for name, _ in SCHEDULE_COLUMNS)
+        verbs = {}
+        for row in conn.execute(
+            "SELECT key, german, infinitive, times_asked, total_fields, total_correct_fields, total_time_s, last_seen,"
+            f" {schedule} FROM verb_stats"
+        ):
+            pv = verbs[row[0]] = {
+                "german": row[1],
+                "infinitive": row[2],
+                "times_asked": row[3],
+                "total_fields": row[4],
+                "total_correct_fields": row[5],
+                "total_time_s": row[6],
+                "last_seen": row[7],
+            }
+            if row[11] is not None:
+                pv.update(reps=row[8], interval_days=row[9], ease=row[10], due=row[11])
+
+        totals = new_totals()
+        recent = conn.execute(
+            "SELECT total_questions, total_correct, total_time_s FROM sessions ORDER BY id DESC LIMIT ?",
+            (RECENT_WINDOW,),
+        ).fetchall()
+        for q, c, t in reversed(recent):
+            add_session_totals(totals, {"total_questions": q, "total_correct": c, "total_time_s": t})
+        n, fields, correct, time_s = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(total_questions), 0), COALESCE(SUM(total_correct), 0),"
+            " COALESCE(SUM(total_time_s), 0.0) FROM sessions"
+        ).fetchone()
+        totals.update({"sessions": n, "fields": fields, "correct": correct, "time_s": time_s})
+    conn.close()
+    return ensure_progress_shape({"meta": {"store": "sqlite"}, "sessions": [], "verbs": verbs, "totals": totals})
+
+
+def write_events(conn: sqlite3.Connection, events: List[Dict]) -> None:
+    verb_rows = []
+    answer_rows = []
+    session_rows = []
+    for ev in events:
+        if ev["type"] == "verb":
+            sched = ev.get("sched") or {}
+            verb_rows.append(
+                (ev["key"], ev["german"], ev["infinitive"], ev["correct"], ev["time_s"], ev["at"])
+                + tuple(sched.get(name) for name, _ in SCHEDULE_COLUMNS)
+            )
+            answer_rows.append((ev["key"], ev["at"], ev["correct"], ev["time_s"]))
+        elif ev["type"] == "session":
+            session_rows.append(ev["session"])
+    conn.executemany(UPSERT_VERB, verb_rows)
+    conn.executemany("INSERT INTO answers (key, at, correct, time_s) VALUES (?, ?, ?, ?)", answer_rows)
+    conn.executemany(INSERT_SESSION, session_rows)
+
+
+def save_progress(db_path: Path, progress: Dict) -> None:
+    pending: List[Dict] = progress.pop(PENDING_KEY, [])
+    if not pending:
+        return
+    conn = connect(db_path)
+    try:
+        with conn:  # one transaction per save (= per session)
+            write_events(conn, pending)
+    finally:
+        conn.close()
+
+
+# =========================
+# Queries
+# =========================
+def verbs_not_seen_since(db_path: Path, since_iso: str) -> List[Tuple[str, str, Optional[str]]]:
+    """(german, infinitive, last_seen) of verbs last asked before `since_iso`, oldest first."""
+    with connect(db_path) as conn:
+        rows = conn.execute(
+            "SELECT german, infinitive, last_seen FROM verb_stats WHERE last_seen < ? ORDER BY last_seen",
+            (since_iso,),
+        ).fetchall()
+    conn.close()
+    return rows
+
+
+def accuracy_between(db_path: Path, since_iso: str, until_iso: str) -> Tuple[int, int, float]:
+    """(sessions, fields, accuracy_percent) for sessions with since <= timestamp < until."""
+    with connect(db_path) as conn:
+        n, fields, correct = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(total_questions), 0), COALESCE(SUM(total_correct), 0)"
+            " FROM sessions WHERE timestamp >= ? AND timestamp < ?",
+            (since_iso, until_iso),
+        ).fetchone()
+    conn.close()
+    return n, fields, (correct / fields * 100.0) if fields else 0.0
+
+
+def sessions_between(db_path: Path, since_iso: str, until_iso: str) -> List[Dict]:
+    """Session records with since <= timestamp < until, oldest first (range scan on sessions_timestamp)."""
+    with connect(db_path) as conn:
+        rows = conn.execute(
+            "SELECT timestamp, base_sample_size, total_questions, total_correct, accuracy_percent, total_time_s"
+            " FROM sessions WHERE timestamp >= ? AND timestamp < ? ORDER BY timestamp",
+            (since_iso, until_iso),
+        ).fetchall()
+    conn.close()
+    names = ("timestamp", "base_sample_size", "total_questions", "total_correct", "accuracy_percent", "total_time_s")
+    return [dict(zip(names, row)) for row in rows]
+
+
+def answers_between(
+    db_path: Path, since_iso: str, until_iso: str, keys: Optional[List[str]] = None
+) -> List[Tuple[str, str, int, float]]:
+    """(at, key, correct, time_s) of answers with since <= at < until, optionally only for `keys`."""
+    sql = "SELECT at, key, correct, time_s FROM answers WHERE at >= ? AND at < ?"
+    params: List = [since_iso, until_iso]
+    if keys is not None:
+        sql += f" AND key IN ({', '.join('?' * len(keys))})"
+        params.extend(keys)
+    with connect(db_path) as conn:
+        rows = conn.execute(sql + " ORDER BY at, id", params).fetchall()
+    conn.close()
+    return rows
+
+
+def verb_keys(db_path: Path) -> List[str]:
+    with connect(db_path) as conn:
+        keys = [row[0] for row in conn.execute("SELECT key FROM verb_stats")]
+    conn.close()
+    return keys
+
+
+# =========================
+# One-time import of progress.json (+ journal)
+# =========================
+def import_json(json_path: Path, db_path: Path) -> Tuple[int, int]:
+    progress = load_json_progress(json_path)
+    conn = connect(db_path)
+    try:
+        with conn:
+            if conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0] or conn.execute(
+                "SELECT COUNT(*) FROM verb_stats"
+            ).fetchone()[0]:
+                raise ValueError(f"{db_path} already contains progress; refusing to import twice")
+            conn.executemany(INSERT_SESSION, progress["sessions"])
+            conn.executemany(
+                "INSERT INTO verb_stats (key, german, infinitive, times_asked, total_fields, total_correct_fields,"
+                " total_time_s, last_seen, reps, interval_days, ease, due) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        k,
+                        pv["german"],
+                        pv["infinitive"],
+                        pv["times_asked"],
+                        pv["total_fields"],
+                        pv["total_correct_fields"],
+                        pv["total_time_s"],
+                        pv["last_seen"],
+                    )
+                    + tuple(pv.get(name) for name, _ in SCHEDULE_COLUMNS)
+                    for k, pv in progress["verbs"].items()
+                ],
+            )
+            conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('imported_from', ?)", (str(json_path),))
+    finally:
+        conn.close()
+    return len(progress["sessions"]), len(progress["verbs"])
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="SQLite progress store tools")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    imp = sub.add_parser("import", help="Import progress.json (and its journal) into a new SQLite file")
+    imp.add_argument("json_path", type=Path)
+    imp.add_argument("db_path", type=Path)
+    args = parser.parse_args(argv)
+
+    if args.cmd == "import":
+        try:
+            sessions, verbs = import_json(args.json_path, args.db_path)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        print(f"Imported {sessions} sessions and {verbs} verbs into {args.db_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
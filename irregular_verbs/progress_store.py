@@ -0,0 +1,350 @@
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import metrics
+from scheduler import DUE_KEY, next_review
+from session_columns import (
+    SessionHistory,
+    answers_dir_for,
+    append_answers,
+    append_rows,
+    columns_dir_for,
+    intern_keys,
+    read_keys,
+)
+from verb_stats import VerbStats
+
+# =========================
+# Journaled progress store
+# =========================
+# progress.json is a snapshot; every change since then lives in progress.journal,
+# one compact JSON event per line. Saving only appends the events of the current
+# session, and the journal is folded into a fresh snapshot in the background once
+# it grows past COMPACT_BYTES. Compaction moves finished sessions out of the JSON
+# into the memory-mapped column files of session_columns.py, and appends every
+# answer to the per-answer columns there. Per-verb stats are a VerbStats
+# (typed arrays by verb id); the snapshot stores them as "verb_columns", one
+# list per counter in the order of the answer log's keys.txt.
+COMPACT_BYTES = 1 << 20
+
+# In-memory only: events recorded since the last save (never written to the snapshot).
+PENDING_KEY = "_pending"
+
+# Progress paths with these suffixes are stored in SQLite (progress_sqlite.py) instead.
+SQLITE_SUFFIXES = (".sqlite", ".sqlite3", ".db")
+
+# read_meta(): snapshots start with '{"meta":{...}' (see _dump()).
+META_PREFIX = '{"meta":'
+META_PEEK_CHARS = 64 * 1024
+
+RECENT_WINDOW = 5
+TOUGH_MIN_ASKED = 3
+
+_journal_lock = threading.Lock()
+_compactions: Dict[Path, threading.Thread] = {}
+
+
+def is_sqlite_path(progress_path: Path) -> bool:
+    return progress_path.suffix in SQLITE_SUFFIXES
+
+
+def journal_path_for(progress_path: Path) -> Path:
+    return progress_path.with_suffix(".journal")
+
+
+def ensure_progress_shape(progress: Dict) -> Dict:
+    progress.setdefault("meta", {})
+    progress.setdefault("sessions", [])
+    verbs = progress.setdefault("verbs", {})
+    if not isinstance(verbs, VerbStats):
+        # Per-verb dicts: snapshots from before the verb columns, the SQLite store.
+        progress["verbs"] = VerbStats.from_dicts(verbs)
+    if "totals" not in progress:
+        # One-time migration of files written before running totals existed.
+        progress["totals"] = new_totals()
+        for s in progress["sessions"]:
+            add_session_totals(progress["totals"], s)
+    return progress
+
+
+# =========================
+# Running aggregates (O(1) per session and per answer)
+# =========================
+def new_totals() -> Dict:
+    return {
+        "sessions": 0,
+        "fields": 0,
+        "correct": 0,
+        "time_s": 0.0,
+        # Ring buffer of [fields, correct, time_s] for the last RECENT_WINDOW sessions.
+        "recent": [],
+        "recent_next": 0,
+    }
+
+
+def add_session_totals(totals: Dict, session: Dict) -> None:
+    totals["sessions"] += 1
+    totals["fields"] += session["total_questions"]
+    totals["correct"] += session["total_correct"]
+    totals["time_s"] += session["total_time_s"]
+    row = [session["total_questions"], session["total_correct"], session["total_time_s"]]
+    recent = totals["recent"]
+    if len(recent) < RECENT_WINDOW:
+        recent.append(row)
+    else:
+        recent[totals["recent_next"]] = row
+    totals["recent_next"] = (totals["recent_next"] + 1) % RECENT_WINDOW
+
+
+def tough_verbs(progress: Dict, limit: int = 10) -> List[Tuple[float, int, str, str]]:
+    """Lowest-accuracy verbs as (accuracy, times_asked, german, infinitive), from VerbStats' sorted index."""
+    out = []
+    for acc, neg_asked, key in progress["verbs"].lowest_accuracy(TOUGH_MIN_ASKED, limit):
+        german, _, infinitive = key.partition("||")
+        out.append((acc, -neg_asked, german, infinitive))
+    return out
+
+
+def apply_event(progress: Dict, ev: Dict) -> None:
+    if ev["type"] == "verb":
+        key = ev["key"]
+        stats: VerbStats = progress["verbs"]
+        i = stats.record(key, int(ev["correct"]), float(ev["time_s"]), ev["at"], ev.get("sched"))
+        if "sched" in ev:
+            queue = progress.get(DUE_KEY)
+            if queue is not None:
+                queue.push(i)
+    elif ev["type"] == "session":
+        progress["sessions"].append(ev["session"])
+        add_session_totals(progress["totals"], ev["session"])
+    progress["meta"]["journal_seq"] = ev["n"]
+
+
+def record_event(progress: Dict, ev: Dict) -> None:
+    """Apply an event to the in-memory progress and queue it for the next save."""
+    ev["n"] = progress["meta"].get("journal_seq", 0) + 1
+    apply_event(progress, ev)
+    progress.setdefault(PENDING_KEY, []).append(ev)
+
+
+def record_verb(progress: Dict, key: str, german: str, infinitive: str, correct_count: int, time_s: float) -> None:
+    now = datetime.now()
+    record_event(
+        progress,
+        {
+            "type": "verb",
+            "key": key,
+            "german": german,
+            "infinitive": infinitive,
+            "correct": int(correct_count),
+            "time_s": float(time_s),
+            "at": now.isoformat(timespec="seconds"),
+            # The new schedule travels with the event, so replay never recomputes it.
+            "sched": next_review(progress["verbs"].get(key), correct_count, now),
+        },
+    )
+
+
+def record_session(progress: Dict, session: Dict) -> None:
+    record_event(progress, {"type": "session", "session": session})
+
+
+class BackgroundLoad:
+    """load_progress() on a worker thread, so the caller can show its first prompt meanwhile."""
+
+    def __init__(self, progress_path: Path, on_done=None) -> None:
+        self._progress: Optional[Dict] = None
+        self._error: Optional[BaseException] = None
+        self._on_done = on_done
+        self._thread = threading.Thread(target=self._run, args=(progress_path,), name="progress-load", daemon=True)
+        self._thread.start()
+
+    def _run(self, progress_path: Path) -> None:
+        try:
+            self._progress = ensure_progress_shape(load_progress(progress_path))
+        except BaseException as e:
+            self._error = e
+        if self._on_done is not None:
+            self._on_done()
+
+    def result(self) -> Dict:
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+        return self._progress
+
+
+def _read_snapshot(progress_path: Path) -> Dict:
+    if progress_path.exists():
+        try:
+            return json.loads(progress_path.read_text(encoding="utf-8"))
+        except Exception:
+            return {}
+    return {}
+
+
+def _open_snapshot(progress_path: Path) -> Dict:
+    """The snapshot with its verb columns turned back into a VerbStats (ids = lines of keys.txt)."""
+    snapshot = _read_snapshot(progress_path)
+    columns = snapshot.pop("verb_columns", None)
+    if columns is not None:
+        keys = read_keys(answers_dir_for(progress_path), snapshot.get("meta", {}).get("answer_keys_bytes", 0))
+        snapshot["verbs"] = VerbStats.from_columns(keys, columns)
+    return snapshot
+
+
+def read_meta(progress_path: Path) -> Dict:
+    """
+    The snapshot's "meta" object. _dump() writes it first, so only the start
+    of the file is read and parsed; older snapshots are parsed in full.
+    """
+    if not progress_path.exists():
+        return {}
+    with open(progress_path, "r", encoding="utf-8") as f:
+        head = f.read(META_PEEK_CHARS)
+    if head.startswith(META_PREFIX):
+        try:
+            return json.JSONDecoder().raw_decode(head, len(META_PREFIX))[0]
+        except ValueError:
+            pass
+    return _read_snapshot(progress_path).get("meta", {})
+
+
+def _replay(progress: Dict, journal_path: Path, upto: Optional[int] = None, on_event=None) -> None:
+    if not journal_path.exists():
+        return
+    seq = progress["meta"].get("journal_seq", 0)
+    with open(journal_path, "rb") as f:
+        data = f.read() if upto is None else f.read(upto)
+    for line in data.splitlines():
+        try:
+            ev = json.loads(line)
+        except ValueError:
+            # Torn last line after a crash; everything before it is intact.
+            continue
+        # Events already folded into the snapshot are skipped.
+        if ev.get("n", 0) > seq:
+            apply_event(progress, ev)
+            seq = ev["n"]
+            if on_event is not None:
+                on_event(ev)
+
+
+@metrics.timed("progress.load")
+def load_progress(progress_path: Path) -> Dict:
+    if is_sqlite_path(progress_path):
+        import progress_sqlite
+
+        return progress_sqlite.load_progress(progress_path)
+    wait_for_compaction(progress_path)
+    snapshot = _open_snapshot(progress_path)
+    rows = snapshot.get("meta", {}).get("session_rows")
+    if rows is not None and "sessions" not in snapshot:
+        # Sessions are not parsed at all: they are mapped from the column files on first access.
+        snapshot["sessions"] = SessionHistory(columns_dir_for(progress_path), rows)
+    progress = ensure_progress_shape(snapshot)
+    _replay(progress, journal_path_for(progress_path))
+    return progress
+
+
+def _dump(progress: Dict, verb_columns: Dict[str, list]) -> str:
+    # meta goes first so read_meta() can stop after it.
+    doc = {"meta": progress.get("meta", {})}
+    doc.update(
+        (k, v) for k, v in progress.items() if not k.startswith("_") and not isinstance(v, (SessionHistory, VerbStats))
+    )
+    doc["verb_columns"] = verb_columns
+    return json.dumps(doc, ensure_ascii=False, separators=(",", ":"))
+
+
+def write_snapshot(progress_path: Path, progress: Dict) -> None:
+    # Not ensure_progress_shape(): compact() has popped "sessions" into the column files,
+    # and an empty list put back here would hide them from load_progress().
+    stats = progress.get("verbs", {})
+    if not isinstance(stats, VerbStats):
+        stats = VerbStats.from_dicts(stats)
+    meta = progress.setdefault("meta", {})
+    # Verbs new to keys.txt get their ids there before the snapshot that refers to them is written.
+    keys, meta["answer_keys_bytes"] = intern_keys(
+        answers_dir_for(progress_path), meta.get("answer_keys_bytes", 0), stats.verb_keys
+    )
+    tmp = progress_path.with_suffix(".json.tmp")
+    tmp.write_text(_dump(progress, stats.column_lists(keys)), encoding="utf-8")
+    os.replace(tmp, progress_path)
+
+
+@metrics.timed("progress.save")
+def save_progress(progress_path: Path, progress: Dict) -> None:
+    if is_sqlite_path(progress_path):
+        import progress_sqlite
+
+        return progress_sqlite.save_progress(progress_path, progress)
+    pending: List[Dict] = progress.pop(PENDING_KEY, [])
+    if not pending:
+        return
+    journal_path = journal_path_for(progress_path)
+    payload = "".join(json.dumps(ev, ensure_ascii=False, separators=(",", ":")) + "\n" for ev in pending)
+    with _journal_lock:
+        with open(journal_path, "a", encoding="utf-8") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        size = journal_path.stat().st_size
+    if size >= COMPACT_BYTES:
+        start_compaction(progress_path)
+
+
+@metrics.timed("progress.compact")
+def compact(progress_path: Path) -> None:
+    """Fold the journal into a new snapshot, built from disk and not from live state."""
+    journal_path = journal_path_for(progress_path)
+    if not journal_path.exists():
+        return
+    # Up to the last whole line, read under the lock: an append still being written is left in the tail.
+    with _journal_lock:
+        with open(journal_path, "rb") as f:
+            upto = f.read().rfind(b"\n") + 1
+    # Only sessions not yet in the column files are loaded here (all of them for old snapshots).
+    progress = ensure_progress_shape(_open_snapshot(progress_path))
+    events: List[Dict] = []
+    _replay(progress, journal_path, upto, events.append)
+    meta = progress["meta"]
+    rows = meta.get("session_rows", 0)
+    meta["session_rows"] = append_rows(columns_dir_for(progress_path), rows, progress.pop("sessions"))
+    # Single answers are kept too (for history queries by time range); the snapshot only has per-verb totals.
+    meta["answer_rows"], meta["answer_keys_bytes"] = append_answers(
+        answers_dir_for(progress_path),
+        meta.get("answer_rows", 0),
+        meta.get("answer_keys_bytes", 0),
+        [ev for ev in events if ev["type"] == "verb"],
+    )
+    # Crash between these steps is harmless: column rows past session_rows are dropped on the
+    # next append, and replay skips events the snapshot already has.
+    write_snapshot(progress_path, progress)
+    with _journal_lock:
+        with open(journal_path, "rb") as f:
+            f.seek(upto)
+            tail = f.read()
+        tmp = journal_path.with_suffix(".journal.tmp")
+        tmp.write_bytes(tail)
+        os.replace(tmp, journal_path)
+
+
+def start_compaction(progress_path: Path) -> None:
+    running = _compactions.get(progress_path)
+    if running is not None and running.is_alive():
+        return
+    # Not a daemon thread: the interpreter waits for it before exiting.
+    t = threading.Thread(target=compact, args=(progress_path,), name="progress-compaction")
+    _compactions[progress_path] = t
+    t.start()
+
+
+def wait_for_compaction(progress_path: Path) -> None:
+    running = _compactions.get(progress_path)
+    if running is not None:
+        running.join()
@@ -0,0 +1,142 @@
+import heapq
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from session_columns import iso_to_epoch
+from verb_stats import VerbStats
+from verb_table import Card, VerbTable
+
+# =========================
+# Spaced repetition (SM-2 with Leitner-style pass/fail)
+# =========================
+# Every answered verb carries reps / interval_days / ease / due in its progress
+# stats. A prompt only counts as a pass when all three forms are right; any
+# mistake puts the verb back to a one-day interval (the first Leitner box).
+START_EASE = 2.5
+MIN_EASE = 1.3
+FIRST_INTERVALS_DAYS = (1.0, 6.0)
+
+# In-memory only: the DueQueue of a progress dict (never written to the snapshot).
+DUE_KEY = "_due"
+
+
+def quality(correct_count: int) -> int:
+    """SM-2 quality 0..5 from the number of correct forms (3 = pass)."""
+    return 5 if correct_count >= 3 else correct_count
+
+
+def next_review(pv: Optional[Dict], correct_count: int, at: datetime) -> Dict:
+    """The schedule fields of a verb after one answer at `at` (pv: its stats so far, or None)."""
+    reps = pv.get("reps", 0) if pv else 0
+    interval = pv.get("interval_days", 0.0) if pv else 0.0
+    ease = pv.get("ease", START_EASE) if pv else START_EASE
+    q = quality(correct_count)
+    if q < 3:
+        reps = 0
+        interval = FIRST_INTERVALS_DAYS[0]
+    else:
+        reps += 1
+        interval = FIRST_INTERVALS_DAYS[reps - 1] if reps <= len(FIRST_INTERVALS_DAYS) else interval * ease
+    ease = max(MIN_EASE, ease + 0.1 - (5 - q) * (0.08 + (5 - q) * 0.02))
+    return {
+        "reps": reps,
+        "interval_days": round(interval, 3),
+        "ease": round(ease, 3),
+        "due": (at + timedelta(days=interval)).isoformat(timespec="seconds"),
+    }
+
+
+class DueQueue:
+    """
+    Min-heap of (due, verb id) over every verb that has been answered, plus a
+    cursor over the deck for verbs never asked. Due times are epoch seconds
+    read straight from the VerbStats columns. Entries are not removed when a
+    verb is rescheduled; an entry whose due no longer matches the verb's
+    stats is stale and skipped when it reaches the top.
+    """
+
+    def __init__(self, verbs: VerbStats, table: VerbTable) -> None:
+        self.verbs = verbs
+        self.table = table
+        self.heap: List[Tuple[int, int]] = []
+        self._rebuild()
+        self.next_new = 0
+
+    def _due(self, i: int) -> int:
+        # Verbs answered before scheduling existed are due since they were last seen.
+        return self.verbs.due[i] or self.verbs.last_seen[i]
+
+    def _rebuild(self) -> None:
+        asked = self.verbs.times_asked
+        self.heap = [(self._due(i), i) for i in range(len(asked)) if asked[i]]
+        heapq.heapify(self.heap)
+
+    def push(self, i: int) -> None:
+        """Reschedules verb id `i` after an answer (its stats are already updated)."""
+        heapq.heappush(self.heap, (self._due(i), i))
+        if len(self.heap) > 2 * len(self.verbs) + 64:
+            # Mostly stale entries: rebuild in O(n) instead of carrying them around.
+            self._rebuild()
+
+    def _pop_valid(self, taken: set) -> Optional[Tuple[int, int]]:
+        asked = self.verbs.times_asked
+        while self.heap:
+            due, i = heapq.heappop(self.heap)
+            if asked[i] and self._due(i) == due and i not in taken:
+                return due, i
+        return None
+
+    def _new_cards(self, n: int) -> List[Card]:
+        out: List[Card] = []
+        rows = self.table.rows
+        i = self.next_new
+        while len(out) < n and i < len(rows):
+            inf, _, _, german = rows[i]
+            if f"{german}||{inf}" not in self.verbs:
+                out.append(self.table.cards[i])
+            elif i == self.next_new:
+                # Only skip rows for good once they have been answered.
+                self.next_new += 1
+            i += 1
+        return out
+
+    def select(self, n: int, now: str) -> List[Card]:
+        """
+        Up to n cards: overdue verbs first (earliest due), then never-asked
+        verbs in deck order, then the verbs that come due soonest.
+        O(n log m) for m answered verbs; the deck itself is not scanned.
+        """
+        now_epoch = iso_to_epoch(now)
+        verb_keys = self.verbs.verb_keys
+        picked: List[Card] = []
+        popped: List[Tuple[int, int]] = []
+        taken: set = set()
+        later: List[Card] = []
+        while len(picked) + len(later) < n:
+            entry = self._pop_valid(taken)
+            if entry is None:
+                break
+            popped.append(entry)
+            taken.add(entry[1])
+            card = self.table.card_for_key(verb_keys[entry[1]])
+            if card is None:
+                continue  # answered in another deck
+            if entry[0] <= now_epoch:
+                picked.append(card)
+            else:
+                # Not due yet: only used if there are not enough new verbs.
+                later.append(card)
+        picked += self._new_cards(n - len(picked))
+        picked += later[: n - len(picked)]
+        # Selection does not consume entries: a verb left unanswered stays scheduled.
+        for entry in popped:
+            heapq.heappush(self.heap, entry)
+        return picked
+
+
+def due_queue(progress: Dict, table: VerbTable) -> DueQueue:
+    """The DueQueue cached on `progress`, built once per progress dict and deck."""
+    queue = progress.get(DUE_KEY)
+    if queue is None or queue.table is not table:
+        queue = progress[DUE_KEY] = DueQueue(progress["verbs"], table)
+    return queue
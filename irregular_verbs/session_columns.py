@@ -0,0 +1,232 @@
+import bisect
+import mmap
+import os
+from array import array
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+# =========================
+# Columnar, memory-mapped session history
+# =========================
+# One file per column of fixed-width native values, appended by compaction:
+#   <progress>.sessions/timestamp.q   epoch seconds (int64)
+#   <progress>.sessions/sample.i      base sample size (int32)
+#   <progress>.sessions/questions.i   total questions (int32)
+#   <progress>.sessions/correct.i     total correct (int32)
+#   <progress>.sessions/time_s.d      total time in seconds (float64)
+# The number of valid rows is recorded in the snapshot (meta["session_rows"]);
+# anything past it is a leftover from an interrupted compaction and is ignored.
+COLUMNS = (
+    ("timestamp", "q"),
+    ("sample", "i"),
+    ("questions", "i"),
+    ("correct", "i"),
+    ("time_s", "d"),
+)
+
+# Every single answer, in the same layout under <progress>.answers/:
+#   at.q        epoch seconds (int64, ascending: rows are appended in answer order)
+#   verb.i      line number of the verb key in keys.txt (int32)
+#   correct.b   correct fields, 0..3 (int8)
+#   time_s.d    time in seconds (float64)
+# keys.txt holds one "german||infinitive" key per line; meta["answer_rows"] and
+# meta["answer_keys_bytes"] mark the valid rows and bytes like session_rows.
+ANSWER_COLUMNS = (
+    ("at", "q"),
+    ("verb", "i"),
+    ("correct", "b"),
+    ("time_s", "d"),
+)
+KEYS_NAME = "keys.txt"
+
+
+def columns_dir_for(progress_path: Path) -> Path:
+    return progress_path.with_suffix(".sessions")
+
+
+def answers_dir_for(progress_path: Path) -> Path:
+    return progress_path.with_suffix(".answers")
+
+
+def iso_to_epoch(ts: str) -> int:
+    return int(datetime.fromisoformat(ts).timestamp())
+
+
+def epoch_to_iso(epoch: int) -> str:
+    return datetime.fromtimestamp(epoch).isoformat(timespec="seconds")
+
+
+def session_from_row(ts: int, sample: int, questions: int, correct: int, time_s: float) -> Dict:
+    # total_time_mmss is not stored; it is derived from total_time_s wherever it is shown.
+    return {
+        "timestamp": epoch_to_iso(ts),
+        "base_sample_size": sample,
+        "total_questions": questions,
+        "total_correct": correct,
+        "accuracy_percent": round(correct / questions * 100.0, 2) if questions else 0.0,
+        "total_time_s": time_s,
+    }
+
+
+class MappedColumns:
+    """The first `rows` values of each column file, memory-mapped on first use."""
+
+    def __init__(self, directory: Path, columns, rows: int) -> None:
+        self.directory = directory
+        self.columns = dict(columns)
+        self.rows = rows
+        self._maps: Dict[str, mmap.mmap] = {}
+        self._views: Dict[str, memoryview] = {}
+
+    def column(self, name: str) -> memoryview:
+        """Typed view over the first `rows` values of one column (only that file is mapped)."""
+        view = self._views.get(name)
+        if view is None:
+            code = self.columns[name]
+            path = self.directory / f"{name}.{code}"
+            if not self.rows or not path.exists():
+                view = memoryview(array(code))
+            else:
+                with open(path, "rb") as f:
+                    mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                self._maps[name] = mm
+                view = memoryview(mm).cast(code)[: self.rows]
+            self._views[name] = view
+        return view
+
+    def close(self) -> None:
+        for view in self._views.values():
+            view.release()
+        self._views.clear()
+        for mm in self._maps.values():
+            mm.close()
+        self._maps.clear()
+
+    def time_range(self, name: str, since: int, until: int) -> Tuple[int, int]:
+        """Rows [lo, hi) with since <= value < until in an ascending column, by binary search."""
+        col = self.column(name)
+        return bisect.bisect_left(col, since), bisect.bisect_left(col, until)
+
+
+class SessionHistory(MappedColumns):
+    """
+    List-like view of all sessions: rows already in the column files are
+    read lazily through mmap, sessions appended since then live in `tail`
+    until the next compaction writes them out.
+    """
+
+    def __init__(self, directory: Path, rows: int) -> None:
+        super().__init__(directory, COLUMNS, rows)
+        self.tail: List[Dict] = []
+
+    def __len__(self) -> int:
+        return self.rows + len(self.tail)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("session index out of range")
+        if index >= self.rows:
+            return self.tail[index - self.rows]
+        return session_from_row(*(self.column(name)[index] for name, _ in COLUMNS))
+
+    def __iter__(self) -> Iterator[Dict]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def append(self, session: Dict) -> None:
+        self.tail.append(session)
+
+
+class AnswerLog(MappedColumns):
+    """Per-answer columns; keys[verb] is the key of a row's verb id."""
+
+    def __init__(self, directory: Path, rows: int, keys_bytes: int) -> None:
+        super().__init__(directory, ANSWER_COLUMNS, rows)
+        self.keys = read_keys(directory, keys_bytes)
+
+    def rows_between(self, since: int, until: int) -> Iterator[Tuple[int, str, int, float]]:
+        """(epoch, key, correct, time_s) of the answers with since <= epoch < until; only those rows are read."""
+        lo, hi = self.time_range("at", since, until)
+        at, verb, correct, time_s = (self.column(name)[lo:hi] for name, _ in ANSWER_COLUMNS)
+        keys = self.keys
+        for i in range(hi - lo):
+            yield at[i], keys[verb[i]], correct[i], time_s[i]
+
+
+def read_keys(directory: Path, keys_bytes: int) -> List[str]:
+    path = directory / KEYS_NAME
+    if not keys_bytes or not path.exists():
+        return []
+    with open(path, "rb") as f:
+        return f.read(keys_bytes).decode("utf-8").splitlines()
+
+
+def _append_columns(directory: Path, columns, valid_rows: int, values: Dict[str, list]) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    for name, code in columns:
+        path = directory / f"{name}.{code}"
+        with open(path, "ab") as f:
+            f.truncate(valid_rows * array(code).itemsize)
+            array(code, values[name]).tofile(f)
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def append_rows(directory: Path, valid_rows: int, sessions: List[Dict]) -> int:
+    """Drops rows past `valid_rows`, appends `sessions` and returns the new row count."""
+    values = {
+        "timestamp": [iso_to_epoch(s["timestamp"]) for s in sessions],
+        "sample": [int(s["base_sample_size"]) for s in sessions],
+        "questions": [int(s["total_questions"]) for s in sessions],
+        "correct": [int(s["total_correct"]) for s in sessions],
+        "time_s": [float(s["total_time_s"]) for s in sessions],
+    }
+    _append_columns(directory, COLUMNS, valid_rows, values)
+    return valid_rows + len(sessions)
+
+
+def intern_keys(directory: Path, keys_bytes: int, keys) -> Tuple[List[str], int]:
+    """
+    Appends the keys keys.txt does not have yet (their ids are their line
+    numbers, never reassigned) and returns (all keys in id order, new keys_bytes).
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    known = read_keys(directory, keys_bytes)
+    seen = set(known)
+    new_keys = []
+    for key in keys:
+        if key not in seen:
+            seen.add(key)
+            new_keys.append(key)
+    added = "".join(key + "\n" for key in new_keys).encode("utf-8")
+    with open(directory / KEYS_NAME, "ab") as f:
+        f.truncate(keys_bytes)
+        f.write(added)
+        f.flush()
+        os.fsync(f.fileno())
+    return known + new_keys, keys_bytes + len(added)
+
+
+def append_answers(directory: Path, valid_rows: int, keys_bytes: int, events: List[Dict]) -> Tuple[int, int]:
+    """
+    Appends the "verb" journal events as answer rows (new keys go to
+    keys.txt first) and returns the new (answer_rows, answer_keys_bytes).
+    """
+    keys, keys_bytes = intern_keys(directory, keys_bytes, (ev["key"] for ev in events))
+    ids = {key: i for i, key in enumerate(keys)}
+    values = {
+        "at": [iso_to_epoch(ev["at"]) for ev in events],
+        "verb": [ids[ev["key"]] for ev in events],
+        "correct": [int(ev["correct"]) for ev in events],
+        "time_s": [float(ev["time_s"]) for ev in events],
+    }
+    _append_columns(directory, ANSWER_COLUMNS, valid_rows, values)
+    return valid_rows + len(events), keys_bytes
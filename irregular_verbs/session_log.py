@@ -0,0 +1,75 @@
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import metrics
+
+# =========================
+# Streaming session log
+# =========================
+# Log text is written as it is produced instead of being collected for the end of
+# the session, so memory stays flat and a crash or Ctrl-C keeps everything up to
+# the last fsync. Both sinks expose the same append(text)/record(dict) interface.
+FSYNC_INTERVAL_S = 5.0
+BUFFER_SIZE = 64 * 1024
+
+
+class SessionLogWriter:
+    """
+    Human-readable log at `path`; if `jsonl_path` is given, every record()
+    is also written there as one JSON line.
+    """
+
+    def __init__(self, path: Path, jsonl_path: Optional[Path] = None, fsync_interval_s: Optional[float] = FSYNC_INTERVAL_S) -> None:
+        self.path = path
+        self.jsonl_path = jsonl_path
+        self.fsync_interval_s = fsync_interval_s
+        self._text = open(path, "w", encoding="utf-8", buffering=BUFFER_SIZE)
+        self._jsonl = open(jsonl_path, "w", encoding="utf-8", buffering=BUFFER_SIZE) if jsonl_path else None
+        self._last_sync = time.monotonic()
+
+    def append(self, text: str) -> None:
+        self._text.write(text)
+
+    @metrics.timed("log.record")
+    def record(self, rec: Dict) -> None:
+        if self._jsonl is not None:
+            self._jsonl.write(json.dumps(rec, ensure_ascii=False, separators=(",", ":")) + "\n")
+        # Records mark the end of a prompt: a cheap point to sync now and then.
+        if self.fsync_interval_s is not None and time.monotonic() - self._last_sync >= self.fsync_interval_s:
+            self.sync()
+
+    @metrics.timed("log.sync")
+    def sync(self) -> None:
+        for f in (self._text, self._jsonl):
+            if f is not None:
+                f.flush()
+                os.fsync(f.fileno())
+        self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        if self._text.closed:
+            return
+        self.sync()
+        self._text.close()
+        if self._jsonl is not None:
+            self._jsonl.close()
+
+    def __enter__(self) -> "SessionLogWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class MemoryLog(list):
+    """In-memory sink (list of text chunks plus `records`), e.g. for callers that render the log themselves."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.records: List[Dict] = []
+
+    def record(self, rec: Dict) -> None:
+        self.records.append(rec)
@@ -0,0 +1,40 @@
+import sys
+import time
+from typing import List, Optional, Tuple
+
+# =========================
+# --profile-startup
+# =========================
+# Marks are taken with perf_counter_ns relative to `started_ns` (the first line of
+# the entry point); the report lists each stage up to the first prompt and what
+# happened after it, e.g. a history load that finished in the background.
+
+
+class StartupProfile:
+    def __init__(self, started_ns: int) -> None:
+        self.started_ns = started_ns
+        self.marks: List[Tuple[str, int]] = []
+        self.first_prompt_ns: Optional[int] = None
+
+    def mark(self, label: str) -> None:
+        self.marks.append((label, time.perf_counter_ns()))
+
+    def wrap_reader(self, read):
+        """Reader/asker wrapper that marks the moment the first prompt is shown."""
+
+        def first_prompt(*args):
+            if self.first_prompt_ns is None:
+                self.mark("first prompt shown")
+                self.first_prompt_ns = self.marks[-1][1]
+            return read(*args)
+
+        return first_prompt
+
+    def report(self, out=None) -> None:
+        out = out or sys.stderr
+        print("\nStartup profile (ms since start):", file=out)
+        prev = self.started_ns
+        for label, t in sorted(self.marks, key=lambda m: m[1]):
+            after = " (after first prompt)" if self.first_prompt_ns is not None and t > self.first_prompt_ns else ""
+            print(f"  {(t - self.started_ns) / 1e6:9.2f}  +{(t - prev) / 1e6:8.2f}  {label}{after}", file=out)
+            prev = t
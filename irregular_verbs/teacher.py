@@ -3,111 +3,32 @@
 
 from __future__ import annotations
 
+import time
+
+# Taken before any other import, for --profile-startup.
+STARTED_NS = time.perf_counter_ns()
+
+import argparse
+import contextlib
 import json
 import os
 import random
-from dataclasses import dataclass
-from typing import Dict, List, Tuple, Optional
+import sys
+import threading
+from typing import TYPE_CHECKING, Callable, Dict, List, Tuple, Optional
+
+import metrics
+from drill_modes import FIELD_LABELS, GERMAN, answered_card, grade, make_prompt
+from verb_table import FIELD_NAMES, Card, VerbTable, builtin_table
+from weighted_sampler import FenwickSampler
+
+if TYPE_CHECKING:
+    # Only needed for headless runs; imported there.
+    from answer_script import AnswerScript
 
 # ---------------- Data ----------------
-# Format: (base, past, past participle, german)
-VERBS: List[Tuple[str, str, str, str]] = [
-    ("be", "was/were", "been", "sein"),
-    ("beat", "beat", "beaten", "schlagen; besiegen"),
-    ("become", "became", "become", "werden"),
-    ("begin", "began", "begun", "beginnen; anfangen"),
-    ("bet", "bet", "bet", "wetten"),
-    ("bite", "bit", "bitten", "beißen"),
-    ("blow", "blew", "blown", "blasen; pusten"),
-    ("break", "broke", "broken", "(zer)brechen; kaputt machen"),
-    ("bring", "brought", "brought", "(mit)bringen"),
-    ("build", "built", "built", "bauen"),
-    ("burn", "burnt/burned", "burnt/burned", "(ver)brennen"),
-    ("buy", "bought", "bought", "kaufen"),
-    ("catch", "caught", "caught", "fangen"),
-    ("choose", "chose", "chosen", "(aus)wählen"),
-    ("come", "came", "come", "kommen"),
-    ("cost", "cost", "cost", "kosten"),
-    ("cut", "cut", "cut", "schneiden"),
-    ("deal (with)", "dealt (with)", "dealt (with)", "sich befassen (mit); umgehen (mit)"),
-    ("do", "did", "done", "machen; tun"),
-    ("draw", "drew", "drawn", "zeichnen; ziehen"),
-    ("dream", "dreamt/dreamed", "dreamt/dreamed", "träumen"),
-    ("drink", "drank", "drunk", "trinken"),
-    ("drive", "drove", "driven", "fahren"),
-    ("eat", "ate", "eaten", "essen"),
-    ("fall", "fell", "fallen", "(hin)fallen"),
-    ("feed", "fed", "fed", "füttern; ernähren"),
-    ("feel", "felt", "felt", "fühlen"),
-    ("fight", "fought", "fought", "kämpfen; (sich) streiten"),
-    ("find", "found", "found", "finden"),
-    ("fit", "fit/fitted", "fit/fitted", "passen"),
-    ("fly", "flew", "flown", "fliegen"),
-    ("forget", "forgot", "forgotten", "vergessen"),
-    ("forgive", "forgave", "forgiven", "vergeben; verzeihen"),
-    ("freeze", "froze", "frozen", "gefrieren; erstarren"),
-    ("get", "got", "got", "bekommen; erhalten"),
-    ("give", "gave", "given", "geben"),
-    ("go", "went", "gone", "gehen; fahren"),
-    ("grow", "grew", "grown", "wachsen; anbauen; züchten"),
-    ("hang", "hung", "hung", "hängen"),
-    ("have", "had", "had", "haben"),
-    ("hear", "heard", "heard", "hören"),
-    ("hide", "hid", "hidden", "(sich) verstecken"),
-    ("hit", "hit", "hit", "schlagen; treffen"),
-    ("hold", "held", "held", "(fest)halten"),
-    ("hurt", "hurt", "hurt", "verletzen; sich weh tun"),
-    ("keep", "kept", "kept", "(auf)bewahren; behalten"),
-    ("know", "knew", "known", "kennen; wissen"),
-    ("lead", "led", "led", "(an)führen"),
-    ("learn", "learnt/learned", "learnt/learned", "lernen"),
-    ("leave", "left", "left", "(ver)lassen"),
-    ("lend", "lent", "lent", "(ver)leihen"),
-    ("let", "let", "let", "lassen"),
-    ("lie", "lay", "lain", "liegen"),
-    ("lose", "lost", "lost", "verlieren"),
-    ("make", "made", "made", "machen; tun"),
-    ("mean", "meant", "meant", "bedeuten; meinen"),
-    ("meet", "met", "met", "treffen"),
-    ("pay", "paid", "paid", "(be)zahlen"),
-    ("put", "put", "put", "legen; setzen; stellen"),
-    ("read", "read", "read", "lesen"),
-    ("ride", "rode", "ridden", "fahren; reiten"),
-    ("ring", "rang", "rung", "klingeln; läuten"),
-    ("rise", "rose", "risen", "steigen; sich erheben"),
-    ("run", "ran", "run", "laufen; rennen"),
-    ("say", "said", "said", "sagen"),
-    ("see", "saw", "seen", "sehen"),
-    ("sell", "sold", "sold", "verkaufen"),
-    ("send", "sent", "sent", "senden; verschicken"),
-    ("set up", "set up", "set up", "erbauen; errichten"),
-    ("shine", "shone", "shone", "scheinen; glänzen"),
-    ("shoot", "shot", "shot", "schießen"),
-    ("show", "showed", "shown", "zeigen"),
-    ("sing", "sang", "sung", "singen"),
-    ("sink", "sank", "sunk", "untergehen; sinken"),
-    ("sit", "sat", "sat", "sitzen"),
-    ("sleep", "slept", "slept", "schlafen"),
-    ("smell", "smelt/smelled", "smelt/smelled", "riechen; duften"),
-    ("speak", "spoke", "spoken", "sprechen"),
-    ("spell", "spelt/spelled", "spelt/spelled", "buchstabieren"),
-    ("spend", "spent", "spent", "ausgeben; verbringen"),
-    ("spill", "spilt/spilled", "spilt/spilled", "verschütten; auslaufen"),
-    ("stand", "stood", "stood", "stehen"),
-    ("steal", "stole", "stolen", "stehlen"),
-    ("sting", "stung", "stung", "stechen"),
-    ("swim", "swam", "swum", "schwimmen"),
-    ("take", "took", "taken", "nehmen"),
-    ("teach", "taught", "taught", "unterrichten; lehren; beibringen"),
-    ("tell", "told", "told", "erzählen"),
-    ("think", "thought", "thought", "(nach)denken; glauben"),
-    ("throw", "threw", "thrown", "werfen"),
-    ("understand", "understood", "understood", "verstehen"),
-    ("wake up", "woke up", "woken up", "(auf)wachen; (auf)wecken"),
-    ("wear", "wore", "worn", "anhaben; tragen"),
-    ("win", "won", "won", "gewinnen; siegen"),
-    ("write", "wrote", "written", "schreiben"),
-]
+# Compiled once (verb_table.py), the same table object as irregular_verbs.TABLE.
+TABLE = builtin_table()
 
 # ---------------- Settings ----------------
 CASE_INSENSITIVE = False       # If True: ignore case
@@ -115,6 +36,10 @@ WEIGHTED_RANDOM = True         # If True: verbs you miss more often show up more
 MIN_WEIGHT = 1.0
 WEIGHT_PER_WRONG = 0.75
 SHOW_HINT_AFTER_FAIL = True    # Show allowed variants after a mistake
+NEAR_MISS_TYPOS = 0            # > 0: point out typos / forms of other verbs (scoring unchanged)
+DRILL_MODE = "german"          # "german", "form" or "english" (see drill_modes.py)
+SAVE_INTERVAL_S = 2.0          # Unsaved mistakes are written at most this long after they happen ...
+SAVE_EVERY_UPDATES = 10        # ... or as soon as this many have piled up
 
 STATE_PATH = os.path.join(os.path.expanduser("~"), ".irregular_verbs_trainer_state.json")
 
@@ -126,36 +51,18 @@ YELLOW = "\033[0;33m"
 NC = "\033[0m"
 
 
-@dataclass(frozen=True)
-class Verb:
-    base: str
-    past: str
-    pp: str
-    german: str
-
-
-def normalize(s: str) -> str:
-    s = s.strip()
-    return s.lower() if CASE_INSENSITIVE else s
-
-
-def split_options(allowed: str) -> List[str]:
-    # "burnt/burned" -> ["burnt", "burned"]
-    return [opt.strip() for opt in allowed.split("/")]
-
-
-def is_correct(user_input: str, allowed: str) -> bool:
-    u = normalize(user_input)
-    for opt in split_options(allowed):
-        if u == normalize(opt):
-            return True
-    return False
+def check_field(card: Card, field: int, user_input: str) -> bool:
+    # O(1) lookup against the card's precompiled variant sets.
+    if CASE_INSENSITIVE:
+        return user_input.strip().lower() in card.accepted[field]
+    return user_input.strip() in card.exact[field]
 
 
 def colorize(ok: bool, text: str) -> str:
     return f"{GREEN if ok else RED}{text}{NC}"
 
 
+@metrics.timed("state.load")
 def load_state() -> Dict[str, int]:
     if not os.path.exists(STATE_PATH):
         return {}
@@ -169,10 +76,16 @@ def load_state() -> Dict[str, int]:
     return {}
 
 
+@metrics.timed("state.save")
 def save_state(wrong_counts: Dict[str, int]) -> None:
+    # Temp file + rename: a crash mid-write leaves the previous state, never half a file.
+    tmp = STATE_PATH + ".tmp"
     try:
-        with open(STATE_PATH, "w", encoding="utf-8") as f:
+        with open(tmp, "w", encoding="utf-8") as f:
             json.dump(wrong_counts, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, STATE_PATH)
     except Exception as e:
         print(f"{YELLOW}Warning: Could not save progress: {e}{NC}")
 
@@ -185,7 +98,68 @@ def reset_state() -> None:
         print(f"{YELLOW}Warning: Could not delete progress file: {e}{NC}")
 
 
-def print_stats(wrong_counts: Dict[str, int], verbs: List[Verb]) -> None:
+class StateWriter:
+    """
+    Write-behind for the mistake counts. set() only records the new count
+    (a dict store under a lock), so answering never waits for the disk; a
+    background thread folds the pending counts into its own copy and calls
+    save_state() every `interval_s` seconds, or earlier once `max_pending`
+    updates are waiting. close() stops the thread and writes what is left.
+    """
+
+    def __init__(self, wrong_counts: Dict[str, int], interval_s: float = SAVE_INTERVAL_S, max_pending: int = SAVE_EVERY_UPDATES) -> None:
+        self.interval_s = interval_s
+        self.max_pending = max_pending
+        self._saved = dict(wrong_counts)
+        self._pending: Dict[str, int] = {}
+        self._updates = 0
+        self._lock = threading.Lock()
+        # Held for every file write or delete, so a reset never races a flush.
+        self._io_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="state-writer", daemon=True)
+        self._thread.start()
+
+    def set(self, base: str, count: int) -> None:
+        with self._lock:
+            self._pending[base] = count
+            self._updates += 1
+            if self._updates >= self.max_pending:
+                self._wake.set()
+
+    def flush(self) -> None:
+        with self._io_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                self._updates = 0
+            if pending:
+                self._saved.update(pending)
+                save_state(self._saved)
+
+    def reset(self) -> None:
+        """Drops unsaved counts and deletes the state file (":reset")."""
+        with self._io_lock:
+            with self._lock:
+                self._pending.clear()
+                self._updates = 0
+            self._saved.clear()
+            reset_state()
+
+    def _run(self) -> None:
+        while not self._closed:
+            self._wake.wait(self.interval_s)
+            self._wake.clear()
+            self.flush()
+
+    def close(self) -> None:
+        self._closed = True
+        self._wake.set()
+        self._thread.join()
+        self.flush()
+
+
+def print_stats(wrong_counts: Dict[str, int], table: VerbTable) -> None:
     print()
     print(f"{CYAN}Stats (only verbs with mistakes). File: {STATE_PATH}{NC}")
     items = [(k, v) for k, v in wrong_counts.items() if v > 0]
@@ -194,7 +168,7 @@ def print_stats(wrong_counts: Dict[str, int], verbs: List[Verb]) -> None:
         print("  (no mistakes saved yet)")
         return
 
-    de_map = {v.base: v.german for v in verbs}
+    de_map = {inf: german for inf, _, _, german in table.rows}
     for base, cnt in items[:30]:
         print(f"  {base:<15} {cnt:>3}  {de_map.get(base, '')}")
     if len(items) > 30:
@@ -202,15 +176,20 @@ def print_stats(wrong_counts: Dict[str, int], verbs: List[Verb]) -> None:
     print()
 
 
-def choose_verb(verbs: List[Verb], wrong_counts: Dict[str, int]) -> Verb:
+def verb_weight(wrong: int) -> float:
+    return max(MIN_WEIGHT, MIN_WEIGHT + WEIGHT_PER_WRONG * float(wrong))
+
+
+def build_sampler(table: VerbTable, wrong_counts: Dict[str, int]) -> FenwickSampler:
+    # Index i of the sampler is table.cards[i]; keep it in sync via sampler.update() on every count change.
+    return FenwickSampler([verb_weight(wrong_counts.get(row[0], 0)) for row in table.rows])
+
+
+@metrics.timed("choose_verb")
+def choose_verb(verbs: List[Card], sampler: FenwickSampler) -> Card:
     if not WEIGHTED_RANDOM:
         return random.choice(verbs)
-
-    weights = []
-    for v in verbs:
-        w = MIN_WEIGHT + WEIGHT_PER_WRONG * float(wrong_counts.get(v.base, 0))
-        weights.append(max(MIN_WEIGHT, w))
-    return random.choices(verbs, weights=weights, k=1)[0]
+    return verbs[sampler.sample()]
 
 
 def read_answer(prompt: str) -> Optional[str]:
@@ -226,68 +205,250 @@ def read_answer(prompt: str) -> Optional[str]:
     return s
 
 
-def main() -> int:
-    verbs = [Verb(*t) for t in VERBS]
+# ask(prompt, correct_value) -> answer, "" for empty, None to quit
+Asker = Callable[[str, str], Optional[str]]
+
+
+def terminal_asker(prompt: str, correct_value: str) -> Optional[str]:
+    return read_answer(prompt)
+
+
+def script_asker(script: AnswerScript) -> Asker:
+    def ask(prompt: str, correct_value: str) -> Optional[str]:
+        s = script.next_answer(correct_value)
+        if s is None:
+            return None
+        s = s.strip()
+        if s.lower() == "q":
+            return None
+        return s
+
+    return ask
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    global STATE_PATH, NEAR_MISS_TYPOS, DRILL_MODE
+    parser = argparse.ArgumentParser(description="Irregular Verbs Trainer")
+    parser.add_argument("--script", help="Run headless: read answers from this file ('-' for stdin)")
+    parser.add_argument("--seed", type=int, help="Seed the random verb selection")
+    parser.add_argument("--state", default=STATE_PATH, help=f"Progress file (default: {STATE_PATH})")
+    parser.add_argument("--deck", help="Deck file (.csv/.json) or name of an installed deck instead of the built-in verbs")
+    parser.add_argument(
+        "--profile-startup", action="store_true", help="Print a breakdown of the time to the first prompt to stderr"
+    )
+    parser.add_argument(
+        "--near-miss",
+        type=int,
+        nargs="?",
+        const=2,
+        default=NEAR_MISS_TYPOS,
+        metavar="TYPOS",
+        help="Point out answers within TYPOS edits of the right form (default 2) or that are forms of another verb",
+    )
+    parser.add_argument(
+        "--drill",
+        choices=("german", "form", "english"),
+        default=DRILL_MODE,
+        help="german: meaning -> three forms; form: one English form -> the other two; english: forms -> German meaning",
+    )
+    parser.add_argument(
+        "--metrics",
+        metavar="PATH",
+        help="Time grading, verb choice and state I/O; write the histograms on exit (.prom/.txt: Prometheus text, else JSON)",
+    )
+    args = parser.parse_args(argv)
+    STATE_PATH = args.state
+    NEAR_MISS_TYPOS = args.near_miss
+    DRILL_MODE = args.drill
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    global TABLE
+    main_ns = time.perf_counter_ns()
+    profile = None
+    args = parse_args(argv)
+    if args.profile_startup:
+        from startup_profile import StartupProfile
+
+        profile = StartupProfile(STARTED_NS)
+        profile.marks.append(("imports + verb table", main_ns))
+        profile.mark("argument parsing")
+    if args.metrics:
+        import atexit
+        from pathlib import Path
+
+        metrics.enable()
+        atexit.register(metrics.write_snapshot, Path(args.metrics))
+    if args.deck:
+        from decks import DeckError, load_deck_arg
+
+        try:
+            TABLE = load_deck_arg(args.deck)
+        except DeckError as e:
+            print(f"{RED}Error: {e}{NC}", file=sys.stderr)
+            return 2
+        if profile:
+            profile.mark(f"deck loaded ({len(TABLE)} verbs)")
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    if not args.script:
+        try:
+            return run(profile.wrap_reader(terminal_asker) if profile else terminal_asker, profile=profile)
+        finally:
+            if profile:
+                profile.report()
+
+    from answer_script import AnswerScript
+
+    # Headless: session prints are discarded, one JSON line per prompt goes to stdout.
+    out = sys.stdout
+    script = AnswerScript.open(args.script)
+    try:
+        with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+            return run(script_asker(script), lambda rec: out.write(json.dumps(rec, ensure_ascii=False) + "\n"))
+    finally:
+        script.close()
+        out.flush()
+
+
+def run(ask: Asker, emit: Optional[Callable[[Dict], None]] = None, profile=None) -> int:
+    verbs = TABLE.cards
     wrong_counts = load_state()
+    if profile:
+        profile.mark(f"state loaded ({len(wrong_counts)} verbs)")
+    sampler = build_sampler(TABLE, wrong_counts)
+    if profile:
+        profile.mark("sampler built")
+    writer = StateWriter(wrong_counts)
+    try:
+        return drill(ask, emit, verbs, wrong_counts, sampler, writer)
+    finally:
+        # Reached on q, EOF, Ctrl-C and errors alike: nothing answered is lost.
+        writer.close()
+
+
+def ask_all(ask: Asker, questions: List[Tuple[str, str]]) -> Optional[List[str]]:
+    """Answers to (label, correct value) questions; None on quit, just the command if the first answer is one."""
+    answers: List[str] = []
+    for label, correct_value in questions:
+        a = ask(label, correct_value)
+        if a is None:
+            return None
+        if not answers and a in (":stats", ":reset"):
+            return [a]
+        answers.append(a)
+    return answers
+
+
+def drill(
+    ask: Asker,
+    emit: Optional[Callable[[Dict], None]],
+    verbs: List[Card],
+    wrong_counts: Dict[str, int],
+    sampler: FenwickSampler,
+    writer: StateWriter,
+) -> int:
+    asked = 0
+    all_correct = 0
 
     print(f"{CYAN}Irregular Verbs Trainer{NC}")
     print("Type 'q' to quit at any prompt.")
     print("Commands: ':stats' (show stats), ':reset' (delete saved progress)")
-    print(f"Mode: weighted_random={WEIGHTED_RANDOM}, case_insensitive={CASE_INSENSITIVE}")
+    print(f"Mode: drill={DRILL_MODE}, weighted_random={WEIGHTED_RANDOM}, case_insensitive={CASE_INSENSITIVE}")
     print()
 
     while True:
-        v = choose_verb(verbs, wrong_counts)
-
-        print(f"{YELLOW}German meaning:{NC} {v.german}")
-
-        a1 = read_answer("Infinitive (base form): ")
-        if a1 is None:
+        v = choose_verb(verbs, sampler)
+
+        if DRILL_MODE == "german":
+            prompt = None
+            print(f"{YELLOW}German meaning:{NC} {v.german}")
+            questions = list(zip(("Infinitive (base form): ", "Simple Past: ", "Past Participle: "), v.forms))
+        else:
+            prompt = make_prompt(TABLE, v, DRILL_MODE)
+            print(f"{YELLOW}{prompt.title()}:{NC} {prompt.shown}")
+            questions = [(f"{FIELD_LABELS[f]}: ", e) for f, e in zip(prompt.ask, prompt.expected)]
+
+        answers = ask_all(ask, questions)
+        if answers is None:
             break
-        if a1 == ":stats":
-            print_stats(wrong_counts, verbs)
+        if answers[0] == ":stats":
+            print_stats(wrong_counts, TABLE)
             continue
-        if a1 == ":reset":
-            reset_state()
-            wrong_counts = {}
+        if answers[0] == ":reset":
+            writer.reset()
+            wrong_counts.clear()
+            sampler.fill(MIN_WEIGHT)
             print(f"{CYAN}Progress deleted.{NC}\n")
             continue
 
-        a2 = read_answer("Simple Past: ")
-        if a2 is None:
-            break
-
-        a3 = read_answer("Past Participle: ")
-        if a3 is None:
-            break
-
-        ok1 = is_correct(a1, v.base)
-        ok2 = is_correct(a2, v.past)
-        ok3 = is_correct(a3, v.pp)
-
-        any_wrong = not (ok1 and ok2 and ok3)
+        metrics.incr("prompts")
+        with metrics.span("grade"):
+            if prompt is None:
+                fields = [0, 1, 2]
+                card = v if check_field(v, 0, answers[0]) else answered_card(TABLE, v, answers[0])
+                oks = [check_field(card, f, a) for f, a in enumerate(answers)]
+            else:
+                fields = prompt.ask
+                oks, card = grade(TABLE, prompt, answers, check_field)
+
+        # Mistakes count for the verb answered, e.g. "ride" given for "fahren".
+        any_wrong = not all(oks)
         if any_wrong:
-            wrong_counts[v.base] = wrong_counts.get(v.base, 0) + 1
-            save_state(wrong_counts)
+            metrics.incr("prompts_wrong")
+            wrong_counts[card.inf] = wrong_counts.get(card.inf, 0) + 1
+            # Every row of this infinitive is weighted by its count (see build_sampler).
+            weight = verb_weight(wrong_counts[card.inf])
+            for i in TABLE.indexes_for_inf(card.inf):
+                sampler.update(i, weight)
+            writer.set(card.inf, wrong_counts[card.inf])
+
+        asked += 1
+        all_correct += not any_wrong
+        if emit is not None:
+            record = {"base": v.inf, "answers": answers, "ok": oks, "wrong_count": wrong_counts.get(card.inf, 0)}
+            if prompt is not None:
+                record.update(mode=DRILL_MODE, shown=prompt.shown)
+            if card is not v:
+                record["accepted_as"] = card.inf
+            emit(record)
 
         print()
+        if card is not v:
+            # Right for another verb that shares what was shown.
+            print(f"Accepted as: {card.display} = {card.german}")
         print("Correct forms:")
-        print("  " + colorize(ok1, v.base) + " | " + colorize(ok2, v.past) + " | " + colorize(ok3, v.pp))
+        ok_by_field = dict(zip(fields, oks))
+        print("  " + " | ".join(colorize(ok_by_field.get(f, True), form) for f, form in enumerate(card.forms)))
+        if prompt is not None:
+            print("  " + (colorize(ok_by_field[GERMAN], card.german) if GERMAN in ok_by_field else card.german))
+
+        if any_wrong and NEAR_MISS_TYPOS:
+            from near_miss import classify
+
+            for field, ok, answer in zip(fields, oks, answers):
+                if ok or field == GERMAN:
+                    continue
+                with metrics.span("grade.near_miss"):
+                    verdict = classify(TABLE, card, field, answer, NEAR_MISS_TYPOS)
+                if verdict is not None and verdict.kind != "wrong":
+                    print(f"{YELLOW}{FIELD_NAMES[field]}: {verdict.describe(TABLE)}{NC}")
 
         if any_wrong and SHOW_HINT_AFTER_FAIL:
-            def fmt_opts(s: str) -> str:
-                opts = split_options(s)
-                return ", ".join(opts) if len(opts) > 1 else opts[0]
-
-            print(f"Allowed variants: base={fmt_opts(v.base)}; past={fmt_opts(v.past)}; pp={fmt_opts(v.pp)}")
+            base_opts, past_opts, pp_opts = (", ".join(opts) for opts in card.options)
+            print(f"Allowed variants: base={base_opts}; past={past_opts}; pp={pp_opts}")
 
-        print(f"Mistakes for '{v.base}': {wrong_counts.get(v.base, 0)}")
+        print(f"Mistakes for '{card.inf}': {wrong_counts.get(card.inf, 0)}")
         print("-" * 60)
         print()
 
     print()
     print(f"{CYAN}Goodbye.{NC} (progress file: {STATE_PATH})")
-    print_stats(wrong_counts, verbs)
+    print_stats(wrong_counts, TABLE)
+    if emit is not None:
+        emit({"summary": {"asked": asked, "all_correct": all_correct, "state": STATE_PATH}})
     return 0
 
 
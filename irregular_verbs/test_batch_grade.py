@@ -0,0 +1,71 @@
+import csv
+import io
+
+import batch_grade
+
+
+def _grade(text: str, workers: int = 1):
+    out = io.StringIO()
+    totals = batch_grade.grade_stream(io.StringIO(text), out, workers=workers, chunk_rows=2)
+    rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+    return rows, totals
+
+
+HEADER = "learner,german,infinitive,past,participle\n"
+SHEET = HEADER + """ann,fahren,ride,rode,ridden
+ann,fahren,drive,drove,driven
+bob,fahren,x,drove,driven
+bob,(ver)brennen,Burn , burnt ,burned
+bob,quatsch,a,b,c
+"""
+
+
+def test_rows_are_graded_like_the_drill():
+    rows, totals = _grade(SHEET)
+    assert [r["correct"] for r in rows] == ["3", "3", "2", "3", "0"]
+    # Any verb covering the prompt counts, and the row is graded against it.
+    assert rows[0]["expected"] == "ride | rode | ridden"
+    assert rows[2]["expected"] == "drive | drove | driven"
+    assert rows[4]["error"] == "unknown prompt"
+    assert totals["bob"] == {"rows": 3, "fields": 9, "correct": 5, "all_correct_rows": 1, "unknown_prompts": 1}
+
+
+def test_pool_keeps_input_order():
+    rows, _ = _grade(HEADER + SHEET[len(HEADER):] * 3, workers=2)
+    assert [r["correct"] for r in rows] == ["3", "3", "2", "3", "0"] * 3
+
+
+def test_spaces_are_dropped_unless_the_form_has_one():
+    row = batch_grade.grade_row(["ann", "fahren", "r ide", "rode", "ridden"])
+    assert row[5:9] == ["1", "1", "1", "3"]
+
+
+def test_chunks_skip_header_and_blank_lines():
+    chunks = list(batch_grade.read_chunks(io.StringIO(SHEET + "\n,,,,\n" + SHEET[len(HEADER):]), chunk_rows=4))
+    assert [len(c) for c in chunks] == [4, 4, 2]
+    assert chunks[0][0] == ["ann", "fahren", "ride", "rode", "ridden"]
+
+
+def test_read_ahead_is_bounded():
+    pulled = []
+
+    def chunks():
+        for i in range(20):
+            pulled.append(i)
+            yield [["ann", "fahren", "drive", "drove", "driven"]]
+
+    graded = batch_grade.graded_chunks(chunks(), None, workers=2)
+    next(graded)
+    assert len(pulled) == 4
+    assert sum(1 for _ in graded) == 19
+
+
+def test_main_writes_rows_and_totals(tmp_path, capsys):
+    src = tmp_path / "sheet.csv"
+    src.write_text(SHEET + "bob,gehen\n", encoding="utf-8")
+    out, totals = tmp_path / "graded.csv", tmp_path / "totals.csv"
+    assert batch_grade.main([str(src), "--out", str(out), "--totals", str(totals), "--workers", "1"]) == 0
+    rows = list(csv.DictReader(out.open(encoding="utf-8")))
+    assert rows[-1]["error"] == "expected 5 columns, got 2"
+    assert [r["learner"] for r in csv.DictReader(totals.open(encoding="utf-8"))] == ["ann", "bob"]
+    assert "Graded 6 rows for 2 learners" in capsys.readouterr().err
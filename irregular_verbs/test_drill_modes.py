@@ -0,0 +1,82 @@
+import pytest
+
+import drill_modes
+from drill_modes import GERMAN, field_score, german_variants, grade, make_prompt
+from verb_table import compile_table
+
+TABLE = compile_table(
+    [
+        ("lie", "lay", "lain", "liegen"),
+        ("lie", "lied", "lied", "lügen"),
+        ("lay", "laid", "laid", "legen"),
+        ("drive", "drove", "driven", "fahren"),
+        ("ride", "rode", "ridden", "fahren; reiten"),
+        ("go", "went", "gone", "gehen; fahren"),
+        ("burn", "burnt/burned", "burnt/burned", "(ver)brennen"),
+    ]
+)
+LIE, LIE_TELL, LAY, DRIVE, RIDE, GO, BURN = TABLE.cards
+
+
+class FirstChoice:
+    """rng for make_prompt that shows `field`, first variant."""
+
+    def __init__(self, field: int) -> None:
+        self.field = field
+
+    def randrange(self, n: int) -> int:
+        return self.field
+
+    def choice(self, options):
+        return options[0]
+
+
+def test_german_variants():
+    assert {"(ver)brennen", "verbrennen", "brennen"} <= german_variants("(ver)brennen")
+    assert {"sich streiten", "streiten"} <= german_variants("(sich) streiten")
+    assert {"fahren", "reiten"} <= german_variants("fahren; reiten")
+
+
+def test_german_prompt_accepts_any_covering_verb():
+    prompt = make_prompt(TABLE, DRIVE, "german")
+    assert sorted(prompt.candidates) == [DRIVE.index, RIDE.index, GO.index]
+    assert grade(TABLE, prompt, ["ride", "rode", "ridden"]) == ([True, True, True], RIDE)
+    # The infinitive picks the verb the rest is graded against.
+    assert grade(TABLE, prompt, ["ride", "drove", "driven"]) == ([True, False, False], RIDE)
+    assert grade(TABLE, prompt, ["Drive", "drove", "x"]) == ([True, True, False], DRIVE)
+    # "go" only means one of "fahren; reiten".
+    prompt = make_prompt(TABLE, RIDE, "german")
+    assert grade(TABLE, prompt, ["go", "went", "gone"]) == ([False, False, False], RIDE)
+
+
+def test_form_prompt_grades_against_the_best_candidate():
+    prompt = make_prompt(TABLE, LIE_TELL, "form", FirstChoice(0))
+    assert (prompt.label(), prompt.ask) == ("Infinitive: lie", [1, 2])
+    assert grade(TABLE, prompt, ["lay", "lain"]) == ([True, True], LIE)
+    assert grade(TABLE, prompt, ["lied", "lied"]) == ([True, True], LIE_TELL)
+    # Ties go to the prompted card.
+    assert grade(TABLE, prompt, ["x", "y"]) == ([False, False], LIE_TELL)
+    prompt = make_prompt(TABLE, BURN, "form", FirstChoice(1))
+    assert prompt.shown == "burnt" and grade(TABLE, prompt, ["burn", "burned"])[0] == [True, True]
+
+
+def test_english_prompt_takes_any_meaning_of_the_form():
+    prompt = make_prompt(TABLE, LIE, "english")
+    assert prompt.ask == [GERMAN] and prompt.expected == ["liegen"]
+    assert grade(TABLE, prompt, [" Lügen"]) == ([True], LIE_TELL)
+    assert grade(TABLE, prompt, ["legen"]) == ([False], LIE)
+    assert grade(TABLE, make_prompt(TABLE, BURN, "english"), ["brennen"]) == ([True], BURN)
+
+
+def test_field_score():
+    assert field_score(make_prompt(TABLE, DRIVE, "german"), [True, False, True]) == 2
+    assert field_score(make_prompt(TABLE, DRIVE, "form", FirstChoice(2)), [True, True]) == 3
+    assert field_score(make_prompt(TABLE, DRIVE, "english"), [True]) == 3
+    assert field_score(make_prompt(TABLE, DRIVE, "english"), [False]) == 0
+
+
+def test_answered_card_and_unknown_mode():
+    assert drill_modes.answered_card(TABLE, DRIVE, "ride") is RIDE
+    assert drill_modes.answered_card(TABLE, DRIVE, "lie") is DRIVE
+    with pytest.raises(ValueError):
+        make_prompt(TABLE, DRIVE, "spanish")
@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+import history
+import progress_store
+
+VERBS = (("gehen; laufen", "go"), ("sehen", "see"))
+
+
+def _fill(path, days: int = 6, compact_after: int = 3) -> None:
+    progress = progress_store.load_progress(path)
+    for day in range(days):
+        at = datetime(2024, 5, 1 + day, 12).isoformat(timespec="seconds")
+        for german, inf in VERBS:
+            ev = {"type": "verb", "key": f"{german}||{inf}", "german": german, "infinitive": inf}
+            ev.update(at=at, correct=day % 4, time_s=2.0)
+            progress_store.record_event(progress, ev)
+        session = {
+            "timestamp": at,
+            "base_sample_size": 2,
+            "total_questions": 6,
+            "total_correct": 2 * (day % 4),
+            "accuracy_percent": round(2 * (day % 4) / 6 * 100.0, 2),
+            "total_time_s": 4.0,
+        }
+        progress_store.record_session(progress, session)
+        progress_store.save_progress(path, progress)
+        if day + 1 == compact_after and not progress_store.is_sqlite_path(path):
+            progress_store.compact(path)
+
+
+def test_parse_period():
+    assert history.parse_period("2024") == (datetime(2024, 1, 1), datetime(2025, 1, 1))
+    assert history.parse_period("2024-12") == (datetime(2024, 12, 1), datetime(2025, 1, 1))
+    assert history.parse_period("2024-05-31") == (datetime(2024, 5, 31), datetime(2024, 6, 1))
+    assert history.parse_period("2024-05-01T14") == (datetime(2024, 5, 1, 14), datetime(2024, 5, 1, 15))
+    with pytest.raises(ValueError):
+        history.parse_period("May")
+
+
+@pytest.mark.parametrize("name", ["progress.json", "progress.sqlite"])
+def test_range_spans_compacted_and_journal_rows(tmp_path, name):
+    path = tmp_path / name
+    _fill(path)
+    if name == "progress.json":
+        assert progress_store.read_meta(path)["session_rows"] == 3
+    # Days 2..4: day 2 and 3 are in the column files, day 4 only in the journal.
+    sessions, answers = history.query(path, datetime(2024, 5, 2), datetime(2024, 5, 5))
+    assert [s["timestamp"][:10] for s in sessions] == ["2024-05-02", "2024-05-03", "2024-05-04"]
+    assert [s["total_correct"] for s in sessions] == [2, 4, 6]
+    assert len(answers) == 6
+    assert [a[0][:10] for a in answers[::2]] == ["2024-05-02", "2024-05-03", "2024-05-04"]
+
+
+@pytest.mark.parametrize("name", ["progress.json", "progress.sqlite"])
+def test_verb_filter_matches_infinitive_or_meaning(tmp_path, name):
+    path = tmp_path / name
+    _fill(path)
+    _, by_meaning = history.query(path, verb="Laufen")
+    _, by_inf = history.query(path, verb="go")
+    assert by_meaning == by_inf
+    assert [a[1] for a in by_inf] == ["gehen; laufen||go"] * 6
+    _, none = history.query(path, verb="fly")
+    assert none == []
+
+
+def test_verb_summary_lowest_accuracy_first():
+    answers = [
+        ("2024-05-01T12:00:00", "sehen||see", 3, 1.0),
+        ("2024-05-01T12:00:00", "gehen||go", 1, 3.0),
+        ("2024-05-02T12:00:00", "gehen||go", 2, 1.0),
+    ]
+    rows = history.verb_summary(answers)
+    assert [(r["infinitive"], r["asked"], r["accuracy_percent"]) for r in rows] == [("go", 2, 50.0), ("see", 1, 100.0)]
+    assert rows[0]["last_seen"] == "2024-05-02T12:00:00"
+    assert rows[0]["avg_time_s"] == 2.0
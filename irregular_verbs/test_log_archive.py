@@ -0,0 +1,57 @@
+import log_archive
+from log_archive import LogArchive, archive_dir_for
+
+
+def _write_logs(base_dir, stamps):
+    paths = []
+    for stamp in stamps:
+        path = base_dir / f"session_{stamp}.txt"
+        path.write_text(f"log of {stamp}\n" * 20, encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def test_pack_moves_logs_into_the_archive(tmp_path):
+    a, b = _write_logs(tmp_path, ["2024-05-01_14-03-59", "2024-05-02_09-00-00"])
+    archive = LogArchive(archive_dir_for(tmp_path))
+    entries = archive.pack([a, b, tmp_path / "session_gone.txt"])
+
+    assert not a.exists() and not b.exists()
+    assert [e.timestamp for e in entries] == ["2024-05-01T14:03:59", "2024-05-02T09:00:00"]
+    assert [e.name for e in archive.find("2024-05-01")] == [a.name]
+    # A fresh reader sees the same through index.tsv.
+    reread = LogArchive(archive_dir_for(tmp_path))
+    (entry,) = reread.find("2024-05-02T09")
+    assert reread.read(entry) == "log of 2024-05-02_09-00-00\n" * 20
+
+
+def test_migrate_keeps_order_and_segments(tmp_path, monkeypatch):
+    monkeypatch.setattr(log_archive, "SEGMENT_BYTES", 200)
+    stamps = [f"2024-06-{d:02d}_08-00-00" for d in (3, 1, 2)]
+    _write_logs(tmp_path, stamps)
+    (tmp_path / "session_2024-06-01_08-00-00.jsonl").write_text('{"round": 0}\n', encoding="utf-8")
+    (tmp_path / "progress.json").write_text("{}", encoding="utf-8")
+
+    assert log_archive.migrate(tmp_path, batch=2) == 4
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["logs.archive", "progress.json"]
+    archive = LogArchive(archive_dir_for(tmp_path))
+    assert [e.timestamp[:10] for e in archive.find("2024-06")] == ["2024-06-01", "2024-06-01", "2024-06-02", "2024-06-03"]
+    assert len({e.segment for e in archive.entries}) > 1
+    for entry in archive.entries:
+        assert archive.read(entry).startswith(("log of", '{"round"'))
+
+
+def test_torn_index_and_lost_index(tmp_path):
+    paths = _write_logs(tmp_path, ["2024-07-01_10-00-00", "2024-07-02_10-00-00"])
+    archive = LogArchive(archive_dir_for(tmp_path))
+    archive.pack(paths)
+    with open(archive.index_path, "a", encoding="utf-8") as f:
+        f.write("2024-07-03T10:00:00\tsession_2024")  # crash while writing the index
+    assert len(LogArchive(archive.directory).entries) == 2
+
+    # The next pack starts on a fresh line; a lost index is rebuilt from the segments.
+    archive.pack(_write_logs(tmp_path, ["2024-07-03_10-00-00"]))
+    assert len(LogArchive(archive.directory).entries) == 3
+    archive.index_path.unlink()
+    assert archive.rebuild_index() == 3
+    assert [e.name for e in archive.find("2024-07-03")] == ["session_2024-07-03_10-00-00.txt"]
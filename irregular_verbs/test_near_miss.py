@@ -0,0 +1,72 @@
+import random
+
+import pytest
+
+import near_miss
+from near_miss import FormIndex, classify, distance
+from verb_table import builtin_table, compile_table
+
+TABLE = compile_table(
+    [
+        ("bring", "brought", "brought", "bringen"),
+        ("buy", "bought", "bought", "kaufen"),
+        ("think", "thought", "thought", "denken"),
+        ("ring", "rang", "rung", "klingeln"),
+    ]
+)
+BRING, BUY, THINK, RING = TABLE.cards
+
+
+@pytest.mark.parametrize(
+    "a, b, d",
+    [("brougth", "brought", 1), ("kitten", "sitting", 3), ("", "ran", 3), ("went", "went", 0), ("ab", "ba", 1)],
+)
+def test_distance(a, b, d):
+    assert distance(a, b) == d
+
+
+def test_trie_search_matches_a_full_scan():
+    index = FormIndex(builtin_table())
+    forms = list(index.exact)
+    rng = random.Random(1)
+    for _ in range(100):
+        word = list(rng.choice(forms))
+        for _ in range(rng.randint(0, 2)):
+            p = rng.randrange(len(word))
+            op = rng.randrange(3)
+            if op == 0:
+                word.insert(p, rng.choice("abcdefghijklmnopqrstuvwxyz"))
+            elif op == 1 and len(word) > 1:
+                del word[p]
+            else:
+                word[p] = rng.choice("aeiourst")
+        word = "".join(word)
+        for k in (1, 2):
+            assert index.within(word, k) == sorted((distance(word, f), f) for f in forms if distance(word, f) <= k)
+
+
+def test_verdicts():
+    assert classify(TABLE, BRING, 1, " Brought ").kind == "correct"
+    almost = classify(TABLE, BRING, 1, "brougth")
+    assert (almost.kind, almost.distance, almost.form) == ("almost", 1, "brought")
+    other = classify(TABLE, BRING, 1, "bought")
+    assert (other.kind, sorted(other.entries)) == ("other", [(BUY.index, 1), (BUY.index, 2)])
+    assert other.describe(TABLE).startswith("'bought' is the ")
+    near = classify(TABLE, BRING, 1, "thougt")
+    assert (near.kind, near.distance, near.form) == ("near_other", 1, "thought")
+    assert classify(TABLE, BRING, 1, "xyz").kind == "wrong"
+    assert classify(TABLE, BRING, 1, "").kind == "wrong"
+
+
+def test_short_words_get_one_typo():
+    assert classify(TABLE, RING, 1, "ran").kind == "almost"
+    assert classify(TABLE, THINK, 0, "thnk").kind == "almost"
+    assert classify(TABLE, RING, 0, "rnig").kind == "almost"  # one swap
+    # Two edits on a four-letter word are no longer "almost".
+    assert classify(TABLE, RING, 0, "rxnx").kind == "wrong"
+
+
+def test_index_follows_the_table():
+    assert near_miss.form_index(TABLE) is near_miss.form_index(TABLE)
+    other = compile_table([("go", "went", "gone", "gehen")])
+    assert "went" in near_miss.form_index(other).exact
@@ -0,0 +1,78 @@
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+import progress_sqlite
+import progress_store
+
+
+def _session(i: int) -> dict:
+    return {
+        "timestamp": (datetime(2024, 1, 1) + timedelta(days=i)).isoformat(timespec="seconds"),
+        "base_sample_size": 20,
+        "total_questions": 60,
+        "total_correct": 30 + i,
+        "accuracy_percent": round((30 + i) / 60 * 100.0, 1),
+        "total_time_s": 100.0 + i,
+        "total_time_mmss": "01:40",
+    }
+
+
+def _fill(path, sessions: int = 3) -> dict:
+    progress = progress_store.load_progress(path)
+    for i in range(sessions):
+        progress_store.record_verb(progress, "gehen||go", "gehen", "go", 3, 2.0)
+        progress_store.record_verb(progress, "sehen||see", "sehen", "see", i % 3, 4.0)
+        progress_store.record_session(progress, _session(i))
+        progress_store.save_progress(path, progress)
+    return progress
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "progress.sqlite"
+    progress = _fill(path)
+
+    reloaded = progress_store.load_progress(path)
+    assert dict(reloaded["verbs"].items()) == dict(progress["verbs"].items())
+    assert reloaded["verbs"]["sehen||see"]["total_correct_fields"] == 0 + 1 + 2
+    assert reloaded["totals"]["sessions"] == 3
+    assert reloaded["totals"]["correct"] == 30 + 31 + 32
+    # History stays in the database and is read by range.
+    assert reloaded["sessions"] == []
+    stored = progress_sqlite.sessions_between(path, "2024-01-02", "2024-01-04")
+    assert [s["timestamp"] for s in stored] == ["2024-01-02T00:00:00", "2024-01-03T00:00:00"]
+    assert progress_sqlite.accuracy_between(path, "2024-01-01", "2024-01-02") == (1, 60, 50.0)
+    assert len(progress_sqlite.answers_between(path, "2000-01-01", "2100-01-01", ["gehen||go"])) == 3
+
+
+def test_import_from_json(tmp_path):
+    json_path = tmp_path / "progress.json"
+    progress = _fill(json_path, sessions=4)
+    db_path = tmp_path / "progress.db"
+
+    assert progress_sqlite.import_json(json_path, db_path) == (4, 2)
+    imported = progress_sqlite.load_progress(db_path)
+    assert dict(imported["verbs"].items()) == dict(progress["verbs"].items())
+    assert imported["totals"]["sessions"] == 4
+    with pytest.raises(ValueError):
+        progress_sqlite.import_json(json_path, db_path)
+
+
+def test_read_only_leaves_an_old_file_alone(tmp_path):
+    path = tmp_path / "old.sqlite"
+    conn = sqlite3.connect(str(path))
+    # verb_stats as it was before the schedule columns.
+    conn.executescript(
+        progress_sqlite.SCHEMA.replace(",\n    reps INTEGER,\n    interval_days REAL,\n    ease REAL,\n    due TEXT", "")
+    )
+    conn.execute("INSERT INTO verb_stats VALUES ('gehen||go', 'gehen', 'go', 2, 6, 5, 3.0, '2024-01-01T00:00:00')")
+    conn.commit()
+    conn.close()
+    before = path.read_bytes()
+
+    progress = progress_sqlite.load_progress(path, read_only=True)
+    assert progress["verbs"]["gehen||go"]["total_correct_fields"] == 5
+    assert "due" not in progress["verbs"]["gehen||go"]
+    assert path.read_bytes() == before
+    assert not (tmp_path / "old.sqlite-wal").exists()
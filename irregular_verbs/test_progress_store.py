@@ -0,0 +1,98 @@
+import json
+import threading
+from datetime import datetime, timedelta
+
+import progress_store
+
+
+def _session(i: int) -> dict:
+    return {
+        "timestamp": (datetime(2024, 1, 1) + timedelta(minutes=i)).isoformat(timespec="seconds"),
+        "base_sample_size": 20,
+        "total_questions": 60,
+        "total_correct": 45,
+        "accuracy_percent": 75.0,
+        "total_time_s": 120.0,
+        "total_time_mmss": "02:00",
+    }
+
+
+def test_compacted_sessions_survive_reload(tmp_path):
+    path = tmp_path / "progress.json"
+    progress = progress_store.load_progress(path)
+    for i in range(30):
+        progress_store.record_verb(progress, "gehen||go", "gehen", "go", 2, 5.0)
+        progress_store.record_session(progress, _session(i))
+        progress_store.save_progress(path, progress)
+        if i in (9, 19):
+            progress_store.compact(path)
+
+    reloaded = progress_store.load_progress(path)
+    assert len(reloaded["sessions"]) == 30
+    assert reloaded["sessions"][0]["timestamp"] == "2024-01-01T00:00:00"
+    assert reloaded["totals"]["sessions"] == 30
+    assert reloaded["verbs"]["gehen||go"]["times_asked"] == 30
+
+    progress_store.compact(path)
+    reloaded = progress_store.load_progress(path)
+    assert len(reloaded["sessions"]) == 30
+    assert reloaded["verbs"]["gehen||go"]["times_asked"] == 30
+
+
+def test_journal_replay_skips_torn_last_line(tmp_path):
+    path = tmp_path / "progress.json"
+    progress = progress_store.load_progress(path)
+    progress_store.record_verb(progress, "gehen||go", "gehen", "go", 3, 4.0)
+    progress_store.record_session(progress, _session(0))
+    progress_store.save_progress(path, progress)
+    with open(progress_store.journal_path_for(path), "a", encoding="utf-8") as f:
+        f.write('{"type":"verb","key":"geh')  # crash in the middle of an append
+
+    reloaded = progress_store.load_progress(path)
+    assert len(reloaded["sessions"]) == 1
+    assert reloaded["verbs"]["gehen||go"]["total_correct_fields"] == 3
+    assert reloaded["meta"]["journal_seq"] == 2
+
+
+def test_compaction_while_appending_loses_nothing(tmp_path, monkeypatch):
+    # Compaction is started by hand here, while another thread keeps saving.
+    monkeypatch.setattr(progress_store, "COMPACT_BYTES", 1 << 40)
+    path = tmp_path / "progress.json"
+    progress = progress_store.load_progress(path)
+    sessions = 200
+    done = threading.Event()
+
+    def learner() -> None:
+        for i in range(sessions):
+            progress_store.record_verb(progress, f"v{i % 7}||v{i % 7}", f"v{i % 7}", f"v{i % 7}", 2, 1.0)
+            progress_store.record_session(progress, _session(i))
+            progress_store.save_progress(path, progress)
+        done.set()
+
+    t = threading.Thread(target=learner)
+    t.start()
+    while not done.is_set():
+        progress_store.compact(path)
+    t.join()
+
+    reloaded = progress_store.load_progress(path)
+    assert len(reloaded["sessions"]) == sessions
+    assert sum(pv["times_asked"] for _, pv in reloaded["verbs"].items()) == sessions
+    assert reloaded["meta"]["journal_seq"] == 2 * sessions
+
+
+def test_compaction_keeps_an_append_in_flight(tmp_path):
+    path = tmp_path / "progress.json"
+    progress = progress_store.load_progress(path)
+    progress_store.record_session(progress, _session(0))
+    progress_store.save_progress(path, progress)
+    line = json.dumps({"type": "session", "session": _session(1), "n": 2}) + "\n"
+    journal = progress_store.journal_path_for(path)
+    with open(journal, "a", encoding="utf-8") as f:
+        f.write(line[:20])  # another process is halfway through its write
+    progress_store.compact(path)
+    with open(journal, "a", encoding="utf-8") as f:
+        f.write(line[20:])
+
+    reloaded = progress_store.load_progress(path)
+    assert [s["timestamp"] for s in reloaded["sessions"]] == ["2024-01-01T00:00:00", "2024-01-01T00:01:00"]
@@ -0,0 +1,57 @@
+import progress_store
+import scheduler
+from verb_stats import VerbStats
+from verb_table import compile_table
+
+TABLE = compile_table(
+    [
+        ("go", "went", "gone", "gehen"),
+        ("see", "saw", "seen", "sehen"),
+        ("run", "ran", "run", "laufen"),
+        ("eat", "ate", "eaten", "essen"),
+        ("fly", "flew", "flown", "fliegen"),
+    ]
+)
+NOW = "2024-01-10T00:00:00"
+
+
+def _sched(due: str) -> dict:
+    return {"reps": 1, "interval_days": 1.0, "ease": 2.5, "due": due}
+
+
+def _stats() -> VerbStats:
+    stats = VerbStats()
+    stats.record("gehen||go", 3, 1.0, "2024-01-01T00:00:00", _sched("2024-01-03T00:00:00"))
+    stats.record("sehen||see", 3, 1.0, "2024-01-01T00:00:00", _sched("2024-01-01T00:00:00"))
+    stats.record("laufen||run", 3, 1.0, "2024-01-02T00:00:00")  # answered before scheduling existed
+    stats.record("essen||eat", 3, 1.0, "2024-01-01T00:00:00", _sched("2024-02-01T00:00:00"))
+    return stats
+
+
+def test_overdue_then_new_then_soonest():
+    queue = scheduler.DueQueue(_stats(), TABLE)
+    assert [c.inf for c in queue.select(4, NOW)] == ["see", "run", "go", "fly"]
+    assert [c.inf for c in queue.select(5, NOW)] == ["see", "run", "go", "fly", "eat"]
+    # Selecting does not consume the queue.
+    assert [c.inf for c in queue.select(2, NOW)] == ["see", "run"]
+
+
+def test_rescheduled_verb_moves_back():
+    progress = {"verbs": _stats(), "meta": {}}
+    queue = scheduler.due_queue(progress, TABLE)
+    assert scheduler.due_queue(progress, TABLE) is queue
+    sched = _sched("2024-01-20T00:00:00")
+    progress_store.apply_event(
+        progress, {"type": "verb", "key": "sehen||see", "correct": 3, "time_s": 1.0, "at": NOW, "sched": sched, "n": 1}
+    )
+    assert [c.inf for c in queue.select(5, NOW)] == ["run", "go", "fly", "see", "eat"]
+
+
+def test_stale_entries_are_rebuilt_away():
+    stats = _stats()
+    queue = scheduler.DueQueue(stats, TABLE)
+    for k in range(100):
+        i = stats.record("gehen||go", 3, 1.0, NOW, _sched(f"2024-01-{11 + k % 17}T00:00:00"))
+        queue.push(i)
+    assert len(queue.heap) <= 2 * len(stats) + 64
+    assert [c.inf for c in queue.select(5, NOW)] == ["see", "run", "fly", "go", "eat"]
@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta
+
+import session_columns
+from session_columns import AnswerLog, SessionHistory, iso_to_epoch
+
+
+def _session(i: int) -> dict:
+    return {
+        "timestamp": (datetime(2024, 1, 1) + timedelta(hours=i)).isoformat(timespec="seconds"),
+        "base_sample_size": 20,
+        "total_questions": 60,
+        "total_correct": i,
+        "accuracy_percent": round(i / 60 * 100.0, 2),
+        "total_time_s": 10.0 * i,
+    }
+
+
+def _answer(key: str, minute: int, correct: int = 3) -> dict:
+    at = (datetime(2024, 1, 1) + timedelta(minutes=minute)).isoformat(timespec="seconds")
+    return {"type": "verb", "key": key, "at": at, "correct": correct, "time_s": 1.5}
+
+
+def test_appended_sessions_read_back(tmp_path):
+    rows = session_columns.append_rows(tmp_path, 0, [_session(i) for i in range(3)])
+    rows = session_columns.append_rows(tmp_path, rows, [_session(i) for i in range(3, 5)])
+    history = SessionHistory(tmp_path, rows)
+    history.append(_session(5))
+    try:
+        assert list(history) == [_session(i) for i in range(6)]
+        assert history[-2] == _session(4)
+        assert history[1:3] == [_session(1), _session(2)]
+        since, until = iso_to_epoch("2024-01-01T01:00:00"), iso_to_epoch("2024-01-01T03:30:00")
+        assert history.time_range("timestamp", since, until) == (1, 4)
+    finally:
+        history.close()
+
+
+def test_rows_past_the_snapshot_are_ignored_and_overwritten(tmp_path):
+    rows = session_columns.append_rows(tmp_path, 0, [_session(i) for i in range(3)])
+    # A compaction that crashed after writing its columns but before the snapshot.
+    session_columns.append_rows(tmp_path, rows, [_session(90), _session(91)])
+
+    history = SessionHistory(tmp_path, rows)
+    assert list(history) == [_session(i) for i in range(3)]
+    history.close()
+
+    rows = session_columns.append_rows(tmp_path, rows, [_session(3)])
+    assert (tmp_path / "timestamp.q").stat().st_size == 4 * 8
+    history = SessionHistory(tmp_path, rows)
+    assert list(history) == [_session(i) for i in range(4)]
+    history.close()
+
+
+def test_answers_and_verb_ids(tmp_path):
+    rows, keys_bytes = session_columns.append_answers(
+        tmp_path, 0, 0, [_answer("gehen||go", 0), _answer("sehen||see", 1, 1), _answer("gehen||go", 2, 2)]
+    )
+    assert (rows, session_columns.read_keys(tmp_path, keys_bytes)) == (3, ["gehen||go", "sehen||see"])
+    # Leftover keys and rows from an interrupted compaction are dropped; known ids stay.
+    session_columns.append_answers(tmp_path, rows, keys_bytes, [_answer("laufen||run", 3)])
+    rows, keys_bytes = session_columns.append_answers(
+        tmp_path, rows, keys_bytes, [_answer("essen||eat", 4), _answer("sehen||see", 5)]
+    )
+    assert session_columns.read_keys(tmp_path, keys_bytes) == ["gehen||go", "sehen||see", "essen||eat"]
+
+    log = AnswerLog(tmp_path, rows, keys_bytes)
+    try:
+        assert list(log.column("verb")) == [0, 1, 0, 2, 1]
+        since, until = iso_to_epoch("2024-01-01T00:01:00"), iso_to_epoch("2024-01-01T00:05:00")
+        assert [(key, correct) for _, key, correct, _ in log.rows_between(since, until)] == [
+            ("sehen||see", 1),
+            ("gehen||go", 2),
+            ("essen||eat", 3),
+        ]
+    finally:
+        log.close()
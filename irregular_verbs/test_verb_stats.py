@@ -0,0 +1,52 @@
+import random
+
+from verb_stats import VerbStats
+
+
+def _ranked_from_scratch(stats: VerbStats, min_asked: int, limit: int):
+    entries = []
+    for key, pv in stats.items():
+        if pv["times_asked"] >= min_asked:
+            entries.append((pv["total_correct_fields"] / pv["total_fields"], -pv["times_asked"], key))
+    return sorted(entries)[:limit]
+
+
+def test_tough_index_stays_sorted_while_recording():
+    rng = random.Random(7)
+    stats = VerbStats()
+    for _ in range(300):
+        stats.record(f"g{rng.randrange(40)}||v", rng.randint(0, 3), 1.0, "2024-01-01T00:00:00")
+    assert stats.lowest_accuracy(3, 10) == _ranked_from_scratch(stats, 3, 10)
+    # Now maintained per answer instead of rebuilt.
+    for _ in range(300):
+        stats.record(f"g{rng.randrange(60)}||v", rng.randint(0, 3), 1.0, "2024-01-02T00:00:00")
+        assert stats.lowest_accuracy(3, 5) == _ranked_from_scratch(stats, 3, 5)
+
+
+def test_columns_round_trip_in_keys_txt_order():
+    stats = VerbStats()
+    sched = {"reps": 1, "interval_days": 1.0, "ease": 2.5, "due": "2024-01-02T10:00:00"}
+    stats.record("gehen||go", 2, 3.5, "2024-01-01T10:00:00", sched)
+    stats.record("sehen||see", 3, 1.0, "2024-01-01T11:00:00")
+    # keys.txt may know verbs this learner never answered, in another order.
+    order = ["sehen||see", "laufen||run", "gehen||go"]
+    loaded = VerbStats.from_columns(order, stats.column_lists(order))
+    assert dict(loaded.items()) == dict(stats.items())
+    assert len(loaded) == 2 and "laufen||run" not in loaded
+    assert loaded["gehen||go"]["due"] == "2024-01-02T10:00:00"
+    assert "due" not in loaded["sehen||see"]
+
+
+def test_from_dicts_matches_old_per_verb_records():
+    old = {
+        "gehen||go": {
+            "german": "gehen",
+            "infinitive": "go",
+            "times_asked": 4,
+            "total_fields": 12,
+            "total_correct_fields": 9,
+            "total_time_s": 20.0,
+            "last_seen": "2024-03-01T08:00:00",
+        }
+    }
+    assert dict(VerbStats.from_dicts(old).items()) == old
@@ -0,0 +1,67 @@
+import bisect
+import itertools
+import random
+
+import pytest
+
+from weighted_sampler import FenwickSampler
+
+
+class FixedRandom:
+    """Stands in for random.Random: returns the given values in turn."""
+
+    def __init__(self, values):
+        self._values = iter(values)
+
+    def random(self) -> float:
+        return next(self._values)
+
+
+def _expected(weights, u: float) -> int:
+    # The index random.choices() would pick for the uniform draw u.
+    cumulative = list(itertools.accumulate(weights))
+    return bisect.bisect_right(cumulative, u * cumulative[-1])
+
+
+def test_draws_follow_the_cumulative_weights():
+    weights = [1.0, 0.0, 3.0, 0.5, 2.0, 0.0, 1.5]
+    sampler = FenwickSampler(weights)
+    us = [i / 200 for i in range(200)]
+    assert [sampler.sample(FixedRandom([u])) for u in us] == [_expected(weights, u) for u in us]
+
+
+def test_updates_change_what_is_drawn():
+    rng = random.Random(3)
+    weights = [rng.uniform(0.1, 4.0) for _ in range(37)]
+    sampler = FenwickSampler(weights)
+    for _ in range(500):
+        i = rng.randrange(len(weights))
+        weights[i] = rng.choice([0.0, rng.uniform(0.1, 4.0)])
+        sampler.update(i, weights[i])
+        u = rng.random()
+        assert sampler.total() == pytest.approx(sum(weights))
+        assert sampler.sample(FixedRandom([u])) == _expected(weights, u)
+
+
+def test_zero_weights_are_never_drawn():
+    sampler = FenwickSampler([0.0] * 10)
+    sampler.update(6, 2.0)
+    rng = random.Random(0)
+    assert {sampler.sample(rng) for _ in range(200)} == {6}
+    sampler.fill(1.0)
+    assert {sampler.sample(rng) for _ in range(200)} == set(range(10))
+
+
+def test_periodic_rebuild_keeps_the_sums(monkeypatch):
+    monkeypatch.setattr(FenwickSampler, "REBUILD_EVERY", 8)
+    sampler = FenwickSampler([1.0] * 5)
+    for k in range(50):
+        sampler.update(k % 5, 0.1 * (k + 1))
+    weights = [sampler.weight(i) for i in range(5)]
+    assert sampler.total() == pytest.approx(sum(weights))
+    assert sampler.sample(FixedRandom([0.999999])) == 4
+
+
+def test_empty_sampler_cannot_draw():
+    with pytest.raises(IndexError):
+        FenwickSampler([]).sample()
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Multi-learner trainer server (plain-text line protocol over TCP).
+
+    python trainer_server.py --port 7878
+    nc localhost 7878
+
+Every connection logs in with a learner name and then runs the same
+session flow as irregular_verbs.py (first round, repeat rounds, recap).
+The compiled verb table is shared by all connections; each learner has
+their own progress journal and session logs under <data-dir>/learners/<name>/.
+All clients are served by one asyncio event loop.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import io
+import re
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Generator, Optional, Set
+
+import irregular_verbs
+import metrics
+from irregular_verbs import ReadRequest, print_progress_summary, session_steps
+from progress_store import ensure_progress_shape, load_progress, save_progress
+from session_log import SessionLogWriter
+
+LEARNER_RE = re.compile(r"^[A-Za-z0-9_.-]{1,64}$")
+IDLE_TIMEOUT_S = 15 * 60
+MAX_LINE = 1024
+METRICS_INTERVAL_S = 10.0
+
+
+class ClientGone(Exception):
+    pass
+
+
+class Connection:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, idle_timeout: float) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.idle_timeout = idle_timeout
+
+    async def send(self, text: str) -> None:
+        if not text:
+            return
+        self.writer.write(text.replace("\n", "\r\n").encode("utf-8"))
+        try:
+            # Backpressure: a slow client only ever stalls its own coroutine.
+            await self.writer.drain()
+        except ConnectionError as e:
+            raise ClientGone() from e
+
+    async def ask(self, text: str, allow_space: bool = True) -> str:
+        await self.send(text)
+        try:
+            line = await asyncio.wait_for(self.reader.readline(), self.idle_timeout)
+        except (asyncio.TimeoutError, ValueError, ConnectionError) as e:
+            raise ClientGone() from e
+        if not line:
+            raise ClientGone()
+        answer = line.decode("utf-8", errors="replace").rstrip("\r\n")
+        # Same space rule as read_line_no_spaces().
+        if not allow_space:
+            answer = answer.replace(" ", "")
+        return answer.strip()
+
+    async def close(self) -> None:
+        self.writer.close()
+        with contextlib.suppress(Exception):
+            await self.writer.wait_closed()
+
+
+async def drive_async(steps: Generator[ReadRequest, str, object], conn: Connection):
+    """
+    Async counterpart of irregular_verbs.drive(). The generator's prints are
+    captured per step; steps never await, so redirecting stdout is safe on
+    the single event-loop thread.
+    """
+    buf = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(buf):
+            request = next(steps)
+        while True:
+            prompt, allow_space, _ = request
+            text = buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+            answer = await conn.ask(text + prompt, allow_space)
+            with contextlib.redirect_stdout(buf):
+                request = steps.send(answer)
+    except StopIteration as stop:
+        await conn.send(buf.getvalue())
+        return stop.value
+    finally:
+        steps.close()
+
+
+class TrainerServer:
+    def __init__(self, data_dir: Path, sample_size: int = 20, idle_timeout: float = IDLE_TIMEOUT_S) -> None:
+        self.data_dir = data_dir
+        self.sample_size = sample_size
+        self.idle_timeout = idle_timeout
+        self.active: Set[str] = set()
+        self.stats: Dict[str, int] = {"connections": 0, "sessions": 0}
+
+    def learner_dir(self, name: str) -> Path:
+        return self.data_dir / "learners" / name
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        conn = Connection(reader, writer, self.idle_timeout)
+        self.stats["connections"] += 1
+        name: Optional[str] = None
+        try:
+            await conn.send("Irregular Verbs Trainer\n------------------------\n")
+            name = await conn.ask("Learner name: ")
+            if not LEARNER_RE.match(name):
+                await conn.send("Invalid name (letters, digits, '.', '_', '-'; max 64).\n")
+                return
+            if name in self.active:
+                await conn.send("This learner is already connected.\n")
+                return
+            self.active.add(name)
+            await self.serve_learner(conn, name)
+        except ClientGone:
+            pass
+        finally:
+            if name is not None:
+                self.active.discard(name)
+            await conn.close()
+
+    async def serve_learner(self, conn: Connection, name: str) -> None:
+        loop = asyncio.get_running_loop()
+        base_dir = self.learner_dir(name)
+        base_dir.mkdir(parents=True, exist_ok=True)
+        progress_path = base_dir / "progress.json"
+        # Loading can touch a large file: keep it off the event loop.
+        progress = ensure_progress_shape(await loop.run_in_executor(None, load_progress, progress_path))
+        await conn.send(summary_text(progress))
+
+        n = 0
+        while True:
+            n += 1
+            timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+            session_log_path = base_dir / f"session_{timestamp}_{n:03d}.txt"
+            # Periodic fsync is left to the OS here: it would block the event loop.
+            log = SessionLogWriter(session_log_path, fsync_interval_s=None)
+            try:
+                await drive_async(session_steps(progress, progress_path, session_log_path, log, self.sample_size), conn)
+            finally:
+                log.close()
+                # Also keeps the per-verb answers of a session the client abandoned.
+                await loop.run_in_executor(None, save_progress, progress_path, progress)
+            self.stats["sessions"] += 1
+            await conn.send(summary_text(progress))
+
+            again = await conn.ask("\nAnother session? [y/N]: ")
+            if again.lower() not in ("y", "yes"):
+                await conn.send("Goodbye.\n")
+                return
+
+
+def summary_text(progress: Dict) -> str:
+    if not progress["totals"]["sessions"]:
+        return ""
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        print_progress_summary(progress)
+        print()
+    return buf.getvalue()
+
+
+async def write_metrics_every(path: Path, interval_s: float) -> None:
+    # The file is replaced atomically, so a scraper never sees half a snapshot.
+    while True:
+        await asyncio.sleep(interval_s)
+        metrics.write_snapshot(path)
+
+
+async def serve(host: str, port: int, server: TrainerServer, metrics_path: Optional[Path] = None) -> None:
+    srv = await asyncio.start_server(server.handle, host, port, limit=MAX_LINE, backlog=4096)
+    addrs = ", ".join(str(s.getsockname()) for s in srv.sockets)
+    print(f"Serving on {addrs} (data: {server.data_dir})")
+    writer = asyncio.ensure_future(write_metrics_every(metrics_path, METRICS_INTERVAL_S)) if metrics_path else None
+    try:
+        async with srv:
+            await srv.serve_forever()
+    finally:
+        if writer is not None:
+            writer.cancel()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Irregular Verbs Trainer server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7878)
+    parser.add_argument("--data-dir", type=Path, default=Path.home() / "irregular_verbs_server")
+    parser.add_argument("--sample-size", type=int, default=20)
+    parser.add_argument("--idle-timeout", type=float, default=IDLE_TIMEOUT_S, help="Seconds before an idle client is dropped")
+    parser.add_argument("--deck", help="Deck file (.csv/.json) or name of an installed deck instead of the built-in verbs")
+    parser.add_argument("--schedule", choices=("random", "srs"), default="random", help="Verb selection (see irregular_verbs.py)")
+    parser.add_argument(
+        "--drill", choices=("german", "form", "english"), default="german", help="What is shown and asked (see irregular_verbs.py)"
+    )
+    parser.add_argument(
+        "--metrics",
+        type=Path,
+        metavar="PATH",
+        help=f"Write timing histograms every {METRICS_INTERVAL_S:g}s and on shutdown (.prom/.txt: Prometheus text, else JSON)",
+    )
+    args = parser.parse_args(argv)
+    irregular_verbs.SCHEDULE = args.schedule
+    irregular_verbs.DRILL = args.drill
+    if args.metrics:
+        metrics.enable()
+
+    if args.deck:
+        from decks import DeckError, load_deck_arg
+
+        try:
+            irregular_verbs.TABLE = load_deck_arg(args.deck)
+        except DeckError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 2
+
+    server = TrainerServer(args.data_dir, args.sample_size, args.idle_timeout)
+    try:
+        asyncio.run(serve(args.host, args.port, server, args.metrics))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if args.metrics:
+            metrics.write_snapshot(args.metrics)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,184 @@
+import bisect
+from array import array
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from session_columns import epoch_to_iso, iso_to_epoch
+
+# =========================
+# Per-verb stats in typed arrays
+# =========================
+# Verbs are interned to dense integer ids and every counter is one typed array
+# indexed by id, instead of a dict of seven to eleven boxed values per verb.
+# On disk the id of a verb is its line in <progress>.answers/keys.txt (see
+# session_columns.py): that file is only ever appended to, so ids stay the same
+# when verbs are added to, removed from or reordered in a deck.
+#
+# Reading works like the old {key: {...}} dict (stats[key], get, in, items,
+# len), with the per-verb dicts built on demand; answers go through record().
+# The tough-verb ranking is a sorted (accuracy, -times_asked, key) list of the
+# verbs asked often enough, built on first use and kept sorted by record().
+STAT_COLUMNS = (
+    ("times_asked", "q"),
+    ("total_fields", "q"),
+    ("total_correct_fields", "q"),
+    ("total_time_s", "d"),
+    ("last_seen", "q"),  # epoch seconds, 0 = never
+    # Spaced repetition (scheduler.py); due 0 = answered before scheduling existed.
+    ("reps", "q"),
+    ("interval_days", "d"),
+    ("ease", "d"),
+    ("due", "q"),
+)
+_TIME_COLUMNS = ("last_seen", "due")
+
+
+class VerbStats:
+    __slots__ = ("verb_keys", "ids", "_asked_verbs", "_tough", "_tough_min") + tuple(name for name, _ in STAT_COLUMNS)
+
+    def __init__(self) -> None:
+        self.verb_keys: List[str] = []  # id -> "german||infinitive"
+        self.ids: Dict[str, int] = {}
+        self._asked_verbs = 0
+        self._tough: Optional[List[Tuple[float, int, str]]] = None
+        self._tough_min = 0
+        for name, code in STAT_COLUMNS:
+            setattr(self, name, array(code))
+
+    # ---------- building ----------
+    @classmethod
+    def from_dicts(cls, verbs: Dict[str, Dict]) -> "VerbStats":
+        """From the old per-verb dicts (older snapshots, the SQLite store)."""
+        stats = cls()
+        for key, pv in verbs.items():
+            i = stats.intern(key)
+            for name, _ in STAT_COLUMNS:
+                value = pv.get(name)
+                if value is None:
+                    continue
+                getattr(stats, name)[i] = iso_to_epoch(value) if name in _TIME_COLUMNS else value
+            if pv.get("times_asked"):
+                stats._asked_verbs += 1
+        return stats
+
+    @classmethod
+    def from_columns(cls, verb_keys: List[str], columns: Dict[str, list]) -> "VerbStats":
+        """From a snapshot's "verb_columns", indexed like `verb_keys` (keys.txt)."""
+        stats = cls()
+        stats.verb_keys = list(verb_keys)
+        stats.ids = {key: i for i, key in enumerate(stats.verb_keys)}
+        n = len(stats.verb_keys)
+        for name, code in STAT_COLUMNS:
+            col = array(code, columns.get(name, ())[:n])
+            col.extend(array(code, bytes(col.itemsize * (n - len(col)))))
+            setattr(stats, name, col)
+        stats._asked_verbs = sum(1 for a in stats.times_asked if a)
+        return stats
+
+    def intern(self, key: str) -> int:
+        i = self.ids.get(key)
+        if i is None:
+            i = self.ids[key] = len(self.verb_keys)
+            self.verb_keys.append(key)
+            for name, _ in STAT_COLUMNS:
+                getattr(self, name).append(0)
+        return i
+
+    def column_lists(self, order: List[str]) -> Dict[str, list]:
+        """Every column as a list in the order of `order` (keys.txt), zeros for verbs without stats."""
+        ids = self.ids
+        positions = [ids.get(key, -1) for key in order]
+        out = {}
+        for name, _ in STAT_COLUMNS:
+            col = getattr(self, name)
+            out[name] = [col[i] if i >= 0 else 0 for i in positions]
+        return out
+
+    # ---------- updating ----------
+    def record(self, key: str, correct: int, time_s: float, at: str, sched: Optional[Dict] = None) -> int:
+        """One answer to `key` at ISO time `at`; `sched` are scheduler.next_review() fields."""
+        i = self.intern(key)
+        if not self.times_asked[i]:
+            self._asked_verbs += 1
+        tough = self._tough
+        if tough is not None and self.times_asked[i] >= self._tough_min:
+            del tough[bisect.bisect_left(tough, self._tough_entry(i))]
+        self.times_asked[i] += 1
+        self.total_fields[i] += 3
+        self.total_correct_fields[i] += correct
+        self.total_time_s[i] += time_s
+        self.last_seen[i] = iso_to_epoch(at)
+        if sched:
+            self.reps[i] = sched["reps"]
+            self.interval_days[i] = sched["interval_days"]
+            self.ease[i] = sched["ease"]
+            self.due[i] = iso_to_epoch(sched["due"])
+        if tough is not None and self.times_asked[i] >= self._tough_min:
+            bisect.insort(tough, self._tough_entry(i))
+        return i
+
+    # ---------- reading (dict compatible) ----------
+    def verb(self, i: int) -> Dict:
+        """The old per-verb dict of id `i`."""
+        german, _, infinitive = self.verb_keys[i].partition("||")
+        last_seen = self.last_seen[i]
+        pv = {
+            "german": german,
+            "infinitive": infinitive,
+            "times_asked": self.times_asked[i],
+            "total_fields": self.total_fields[i],
+            "total_correct_fields": self.total_correct_fields[i],
+            "total_time_s": self.total_time_s[i],
+            "last_seen": epoch_to_iso(last_seen) if last_seen else None,
+        }
+        if self.due[i]:
+            pv.update(
+                reps=self.reps[i], interval_days=self.interval_days[i], ease=self.ease[i], due=epoch_to_iso(self.due[i])
+            )
+        return pv
+
+    def get(self, key: str, default=None):
+        i = self.ids.get(key)
+        if i is None or not self.times_asked[i]:
+            return default
+        return self.verb(i)
+
+    def __getitem__(self, key: str) -> Dict:
+        pv = self.get(key)
+        if pv is None:
+            raise KeyError(key)
+        return pv
+
+    def __contains__(self, key: str) -> bool:
+        i = self.ids.get(key)
+        return i is not None and self.times_asked[i] > 0
+
+    def __len__(self) -> int:
+        return self._asked_verbs
+
+    def __iter__(self) -> Iterator[str]:
+        asked = self.times_asked
+        return (key for i, key in enumerate(self.verb_keys) if asked[i])
+
+    def keys(self) -> Iterator[str]:
+        return iter(self)
+
+    def items(self) -> Iterator[Tuple[str, Dict]]:
+        asked = self.times_asked
+        return ((key, self.verb(i)) for i, key in enumerate(self.verb_keys) if asked[i])
+
+    # ---------- rankings ----------
+    def _tough_entry(self, i: int) -> Tuple[float, int, str]:
+        fields = self.total_fields[i]
+        return (self.total_correct_fields[i] / fields if fields else 0.0, -self.times_asked[i], self.verb_keys[i])
+
+    def lowest_accuracy(self, min_asked: int, limit: int) -> List[Tuple[float, int, str]]:
+        """
+        (accuracy, -times_asked, key) of the `limit` least accurate verbs asked
+        at least `min_asked` times. The first call sorts once; after that the
+        list is kept sorted per answer (O(log n)) and this is a slice.
+        """
+        if self._tough is None or self._tough_min != min_asked:
+            asked = self.times_asked
+            self._tough_min = min_asked
+            self._tough = sorted(self._tough_entry(i) for i in range(len(self.verb_keys)) if asked[i] >= min_asked)
+        return self._tough[:limit]
@@ -0,0 +1,166 @@
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+# =========================
+# Compiled verb table shared by both trainers
+# =========================
+# Field order of every deck row and of the per-card tuples below.
+FIELD_NAMES: Tuple[str, str, str] = ("Infinitive", "Simple Past", "Past Participle")
+
+
+def normalize(s: str) -> str:
+    return " ".join(s.strip().lower().split())
+
+
+def split_options(allowed: str) -> List[str]:
+    # "burnt/burned" -> ["burnt", "burned"]
+    return [opt.strip() for opt in allowed.split("/")]
+
+
+class Card:
+    """
+    One deck row with everything grading needs precomputed.
+
+    accepted[i] holds the normalized variants of field i (case- and
+    whitespace-folded), exact[i] the variants only stripped, so both
+    trainers can grade with a single set lookup.
+    """
+
+    __slots__ = (
+        "index",
+        "inf",
+        "past",
+        "part",
+        "german",
+        "key",
+        "forms",
+        "options",
+        "accepted",
+        "exact",
+        "allow_space",
+        "display",
+    )
+
+    def __init__(self, index: int, inf: str, past: str, part: str, german: str) -> None:
+        self.index = index
+        self.inf = inf
+        self.past = past
+        self.part = part
+        self.german = german
+        self.key = f"{german}||{inf}"
+        self.forms: Tuple[str, str, str] = (inf, past, part)
+        self.options: Tuple[Tuple[str, ...], ...] = tuple(tuple(split_options(f)) for f in self.forms)
+        self.accepted: Tuple[FrozenSet[str], ...] = tuple(
+            frozenset(normalize(o) for o in opts) for opts in self.options
+        )
+        self.exact: Tuple[FrozenSet[str], ...] = tuple(frozenset(opts) for opts in self.options)
+        # Spaces are allowed ONLY when one of the variants contains a space (e.g. "wake up").
+        self.allow_space: Tuple[bool, ...] = tuple(any(" " in o for o in opts) for opts in self.options)
+        self.display = f"{inf} | {past} | {part}"
+
+    def __repr__(self) -> str:
+        return f"Card({self.index}, {self.display!r}, {self.german!r})"
+
+
+class CardList(Sequence):
+    """
+    Cards of a table, compiled on first access: a session touches a few dozen
+    cards, so a 50,000-row deck costs nothing per card it never shows.
+    """
+
+    __slots__ = ("rows", "_cards")
+
+    def __init__(self, rows: List[Tuple[str, str, str, str]]) -> None:
+        self.rows = rows
+        self._cards: List[Optional[Card]] = [None] * len(rows)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self.rows)))]
+        card = self._cards[index]
+        if card is None:
+            if index < 0:
+                index += len(self.rows)
+            card = self._cards[index] = Card(index, *self.rows[index])
+        return card
+
+
+class VerbTable:
+    __slots__ = ("rows", "cards", "_by_key", "_by_inf")
+
+    def __init__(self, rows: List[Tuple[str, str, str, str]]) -> None:
+        self.rows = rows
+        self.cards = CardList(rows)
+        self._by_key: Optional[Dict[str, int]] = None
+        self._by_inf: Optional[Dict[str, List[int]]] = None
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __iter__(self):
+        return iter(self.cards)
+
+    def card_for_key(self, key: str) -> Optional[Card]:
+        if self._by_key is None:
+            self._by_key = {f"{german}||{inf}": i for i, (inf, _, _, german) in enumerate(self.rows)}
+        i = self._by_key.get(key)
+        return None if i is None else self.cards[i]
+
+    def indexes_for_inf(self, inf: str) -> List[int]:
+        """Every row with infinitive `inf` (decks may repeat one with another meaning)."""
+        if self._by_inf is None:
+            by_inf: Dict[str, List[int]] = {}
+            for i, row in enumerate(self.rows):
+                by_inf.setdefault(row[0], []).append(i)
+            self._by_inf = by_inf
+        return self._by_inf.get(inf, [])
+
+    def card_for_inf(self, inf: str) -> Optional[Card]:
+        # First row wins for duplicate infinitives (teacher.py keys its state by base form).
+        rows = self.indexes_for_inf(inf)
+        return self.cards[rows[0]] if rows else None
+
+
+def compile_table(verbs: Iterable[Tuple[str, str, str, str]]) -> VerbTable:
+    """Build the compiled table for a list of verb tuples (callers keep it at module level)."""
+    return VerbTable([tuple(row) for row in verbs])
+
+
+def form_entries(table: VerbTable) -> Dict[str, List[Tuple[int, int]]]:
+    """Normalized form -> (row index, field) of every row accepting it, one key per "/" variant."""
+    index: Dict[str, List[Tuple[int, int]]] = {}
+    for i, row in enumerate(table.rows):
+        for field in range(3):
+            for opt in split_options(row[field]):
+                index.setdefault(normalize(opt), []).append((i, field))
+    return index
+
+
+def grade_card(card: Card, answers: Sequence[str]) -> Tuple[bool, bool, bool]:
+    """Grade (inf, past, part) answers with the case- and whitespace-folded rule."""
+    acc = card.accepted
+    return (
+        normalize(answers[0]) in acc[0],
+        normalize(answers[1]) in acc[1],
+        normalize(answers[2]) in acc[2],
+    )
+
+
+# =========================
+# Built-in verbs
+# =========================
+# Shipped as deck_files/default.csv (also "--deck default") and loaded through
+# the deck cache like any other deck (see decks.py).
+_builtin: Optional[VerbTable] = None
+
+
+def builtin_table() -> VerbTable:
+    """The built-in verbs, loaded once per process and shared by both trainers."""
+    global _builtin
+    if _builtin is None:
+        from decks import BUILTIN_DECK, load_deck  # decks imports this module
+
+        _builtin = load_deck(BUILTIN_DECK)
+    return _builtin
@@ -0,0 +1,89 @@
+import random
+from typing import List, Optional, Sequence
+
+# =========================
+# Weighted sampling with O(log n) draws and updates
+# =========================
+
+
+class FenwickSampler:
+    """
+    Draws index i with probability weights[i] / sum(weights), like
+    random.choices(range(n), weights), but keeps the prefix sums in a
+    Fenwick (binary indexed) tree so that changing one weight and drawing
+    are both O(log n).
+    """
+
+    __slots__ = ("_n", "_tree", "_weights", "_top", "_updates")
+
+    # Rebuild from the raw weights after this many updates to drop accumulated float error.
+    REBUILD_EVERY = 1 << 16
+
+    def __init__(self, weights: Sequence[float]) -> None:
+        self._n = len(weights)
+        self._top = 1
+        while self._top * 2 <= self._n:
+            self._top *= 2
+        self._weights: List[float] = [float(w) for w in weights]
+        self._rebuild()
+
+    def _rebuild(self) -> None:
+        n = self._n
+        tree = [0.0] * (n + 1)
+        for i, w in enumerate(self._weights, 1):
+            tree[i] += w
+            parent = i + (i & -i)
+            if parent <= n:
+                tree[parent] += tree[i]
+        self._tree = tree
+        self._updates = 0
+
+    def __len__(self) -> int:
+        return self._n
+
+    def weight(self, index: int) -> float:
+        return self._weights[index]
+
+    def total(self) -> float:
+        s = 0.0
+        i = self._n
+        while i > 0:
+            s += self._tree[i]
+            i -= i & -i
+        return s
+
+    def update(self, index: int, weight: float) -> None:
+        delta = float(weight) - self._weights[index]
+        if delta == 0.0:
+            return
+        self._weights[index] = float(weight)
+        self._updates += 1
+        if self._updates >= self.REBUILD_EVERY:
+            self._rebuild()
+            return
+        i = index + 1
+        tree = self._tree
+        while i <= self._n:
+            tree[i] += delta
+            i += i & -i
+
+    def fill(self, weight: float) -> None:
+        self._weights = [float(weight)] * self._n
+        self._rebuild()
+
+    def sample(self, rng: Optional[random.Random] = None) -> int:
+        if not self._n:
+            raise IndexError("cannot sample from an empty sampler")
+        r = (rng or random).random() * self.total()
+        # Walk down the implicit tree: find the largest prefix whose sum is <= r.
+        pos = 0
+        tree = self._tree
+        step = self._top
+        while step:
+            nxt = pos + step
+            if nxt <= self._n and tree[nxt] <= r:
+                pos = nxt
+                r -= tree[nxt]
+            step >>= 1
+        # pos is 0-based index of the chosen item; guard the float edge at the very end.
+        return min(pos, self._n - 1)